@@ -1,18 +1,31 @@
 class AFD:
-    """Classe que representa um Autômato Finito Determinístico (AFD)."""
+    """Classe que representa um Autômato Finito Determinístico (AFD).
 
-    def __init__(self, nome:str, estados: set[str], alfabeto: set[str], transicoes: dict[tuple[str, str], str], estado_inicial: str, estados_aceitacao: set[str], mapeamento: dict[str, str] = None):
+    Os estados são identificados por inteiros (0, 1, 2, ...). Os nomes
+    legíveis (q0, q1, ...) só são produzidos na saída (arquivos e tabelas).
+
+    avaliar_palavra e proximo_estado não alteram o objeto (o estado da
+    varredura fica em variáveis locais), então um mesmo AFD pode ser usado
+    por várias threads ao mesmo tempo. Já resetar, transitar e aceita
+    avançam passo a passo o estado_atual do próprio objeto.
+    """
+
+    __slots__ = ('nome', 'estados', 'alfabeto', 'transicoes', 'estado_inicial',
+                 'estados_aceitacao', 'estado_atual', 'mapeamento', 'prefixo')
+
+    def __init__(self, nome:str, estados: set[int], alfabeto: set[str], transicoes: dict[tuple[int, str], int], estado_inicial: int, estados_aceitacao: set[int], mapeamento: dict[str, set[int]] = None, prefixo: str = 'q'):
         """Inicializa o AFD com os estados, alfabeto, transições, estado inicial
            e estados de aceitação.
         
             Args:
                 nome (str): Nome do AFD (importante para identificação).
-                estados (set[str]): Conjunto de estados do AFD.
+                estados (set[int]): Conjunto de estados do AFD.
                 alfabeto (set[str]): Conjunto de símbolos do alfabeto do AFD.
-                transicoes (dict[tuple[str, str], str]): Dicionário que mapeia tuplas (estado, símbolo) para o próximo estado.
-                estado_inicial (str): Estado inicial do AFD.
-                estados_aceitacao (set[str]): Conjunto de estados de aceitação do AFD.
-                mapeamento (dict[str, str], opcional): Mapeamento de estados de aceitação para identificadores (se None, usa o nome do AFD).
+                transicoes (dict[tuple[int, str], int]): Dicionário que mapeia tuplas (estado, símbolo) para o próximo estado.
+                estado_inicial (int): Estado inicial do AFD.
+                estados_aceitacao (set[int]): Conjunto de estados de aceitação do AFD.
+                mapeamento (dict[str, set[int]], opcional): Mapeamento de estados de aceitação para identificadores (se None, usa o nome do AFD).
+                prefixo (str, opcional): Prefixo usado para nomear os estados na saída (ex: 'q' gera q0, q1, ...).
         """
         self.nome = nome
         self.estados = estados
@@ -22,8 +35,105 @@ class AFD:
         self.estados_aceitacao = estados_aceitacao
         self.estado_atual = estado_inicial
         self.mapeamento = mapeamento if mapeamento is not None else {nome: estados_aceitacao}
-        
+        self.prefixo = prefixo
+
+    @classmethod
+    def uniao_produto(cls, automatos: list["AFD"]) -> "AFD":
+        """Cria o AFD da união de vários AFDs pela construção do produto,
+            sem passar por um AFND (o resultado é o mesmo de AFND.uniao
+            seguido de determinizar, a menos da numeração dos estados).
+
+            Cada estado do produto é uma tupla com um estado de cada AFD (ou
+            morto), guardada como um inteiro: o campo do AFD i, em bits
+            próprios, vale estado + 1 (0 é morto). Só as tuplas alcançáveis a
+            partir das iniciais são exploradas (em largura), e o próximo
+            estado por um símbolo é só o OU das contribuições dos AFDs que
+            têm transição por ele.
+
+            A prioridade entre os padrões é a ordem dos AFDs na lista: o
+            mapeamento do AFD resultante segue essa ordem (ver padrao).
+
+            Args:
+                automatos (list[AFD]): AFDs a serem unidos, do padrão de maior
+                    prioridade para o de menor.
+
+            Returns:
+                O AFD da união (AFD_FINAL).
+        """
+        # Deslocamento do campo de cada AFD no inteiro e suas saídas já como
+        # contribuições: {estado: [(símbolo, (destino + 1) << deslocamento)]}
+        saidas: list[dict[int, list[tuple[str, int]]]] = []
+        alfabeto: set[str] = set()
+        inicial = 0
+        deslocamento = 0
+        for af in automatos:
+            saidas_af: dict[int, list[tuple[str, int]]] = {}
+            for (estado, simbolo), destino in af.transicoes.items():
+                saidas_af.setdefault(estado, []).append((simbolo, (destino + 1) << deslocamento))
+            saidas.append(saidas_af)
+            alfabeto.update(af.alfabeto)
+            inicial |= (af.estado_inicial + 1) << deslocamento
+            deslocamento += (max(af.estados, default=-1) + 1).bit_length()
+
+        # Para cada estado do produto, os AFDs vivos e seus estados: (i, estado)
+        identificadores: dict[int, int] = {inicial: 0}
+        vivos: list[tuple[tuple[int, int], ...]] = [tuple((i, af.estado_inicial) for i, af in enumerate(automatos))]
+        transicoes: dict[tuple[int, str], int] = {}
+
+        atual = 0
+        while atual < len(vivos):
+            movimentos: dict[str, int] = {}
+            for i, estado in vivos[atual]:
+                for simbolo, contribuicao in saidas[i].get(estado, ()):
+                    movimentos[simbolo] = movimentos.get(simbolo, 0) | contribuicao
+            for simbolo, chave in movimentos.items():
+                proximo = identificadores.get(chave)
+                if proximo is None:
+                    proximo = identificadores[chave] = len(vivos)
+                    vivos.append(tuple(
+                        (i, destino) for i, estado in vivos[atual]
+                        if (destino := automatos[i].transicoes.get((estado, simbolo))) is not None))
+                transicoes[(atual, simbolo)] = proximo
+            atual += 1
+
+        # Estados de aceitação e mapeamento para os identificadores de cada AFD (na ordem da lista)
+        estados = set(range(len(vivos)))
+        mapeamento: dict[str, set[int]] = {af.nome: set() for af in automatos}
+        for numero, tupla in enumerate(vivos):
+            for i, estado in tupla:
+                if estado in automatos[i].estados_aceitacao:
+                    mapeamento[automatos[i].nome].add(numero)
+        estados_aceitacao = set().union(*mapeamento.values())
+        return cls("AFD_FINAL", estados, alfabeto, transicoes, 0, estados_aceitacao, mapeamento)
+
+    def nome_estado(self, estado: int) -> str:
+        """Retorna o nome legível de um estado (usado apenas na saída).
+
+            Args:
+                estado (int): O identificador inteiro do estado.
+
+            Returns:
+                str: O nome do estado (ex: 'q3'), ou 'ERRO' se o estado for None.
+        """
+        if estado is None:
+            return "ERRO"
+        return f"{self.prefixo}{estado}"
     
+    def proximo_estado(self, estado: int | None, simbolo: str) -> int | None:
+        """Retorna o estado seguinte pelo símbolo (None se não houver
+            transição), sem alterar o AFD."""
+        return self.transicoes.get((estado, simbolo))
+
+    def padrao(self, estado: int | None) -> str | None:
+        """Retorna o identificador do padrão reconhecido no estado (o
+            primeiro do mapeamento que o contém), ou None se o estado não for
+            de aceitação."""
+        if estado in self.estados_aceitacao:
+            for identificador, estados in self.mapeamento.items():
+                if estado in estados:
+                    return identificador
+        return None
+
     def resetar(self) -> None:
         """Reseta o estado atual do AFD para o estado inicial."""
         self.estado_atual = self.estado_inicial
@@ -56,20 +166,18 @@ class AFD:
         Returns:
             (bool, str): Uma tupla contendo um booleano que indica se a palavra é aceita e o identificador do estado de aceitação (ou None se não for aceita).
         """
-        # Reseta o estado atual para o estado inicial
-        self.resetar()
-
-        # Processa a palavra, símbolo a símbolo
+        # O estado da varredura é local: o AFD não é alterado
+        transicoes = self.transicoes
+        estado = self.estado_inicial
         for simbolo in palavra:
-            self.transitar(simbolo)
-        
-        # Determina a aceitação da palavra
-        if self.aceita():
-            # Procura o identificador do estado de aceitação
-            for identificador, estados in self.mapeamento.items():
-                if self.estado_atual in estados:
-                    return True, identificador
-                
+            estado = transicoes.get((estado, simbolo))
+            if estado is None:
+                return False, None
+
+        # Determina a aceitação da palavra (e o identificador do estado de aceitação)
+        identificador = self.padrao(estado)
+        if identificador is not None:
+            return True, identificador
         return False, None
     
     def escrever_arquivo(self):
@@ -78,14 +186,14 @@ class AFD:
             # Imprime número de estados
             f.write(f"{len(self.estados)}\n")
             # Imprime estado inicial
-            f.write(f"{self.estado_inicial}\n")
+            f.write(f"{self.nome_estado(self.estado_inicial)}\n")
             # Imprime estados de aceitação
-            f.write(f"{','.join(self.estados_aceitacao)}\n")
+            f.write(f"{','.join(self.nome_estado(e) for e in sorted(self.estados_aceitacao))}\n")
             # Imprime alfabeto
             f.write(f"{','.join(self.alfabeto)}\n")
             # Imprime transições
             for (estado, simbolo), novo_estado in self.transicoes.items():
-                f.write(f"{estado},{simbolo},{novo_estado}\n")
+                f.write(f"{self.nome_estado(estado)},{simbolo},{self.nome_estado(novo_estado)}\n")
     
     def gerar_tabela(self) -> str:
         """Gera uma representação em string da tabela de transições do AFD.
@@ -99,10 +207,10 @@ class AFD:
             tabela += f"{simbolo:<10} "
         tabela += "Aceitação\n"
         tabela += "-" * (10 + 11 * len(self.alfabeto)) + "\n"
-        for estado in self.estados:
-            tabela += f"{estado:<10} "
+        for estado in sorted(self.estados):
+            tabela += f"{self.nome_estado(estado):<10} "
             for simbolo in sorted(self.alfabeto):
-                novo_estado = self.transicoes.get((estado, simbolo), "ERRO")
+                novo_estado = self.nome_estado(self.transicoes.get((estado, simbolo)))
                 tabela += f"{novo_estado:<10} "
             tabela += f"{'Sim' if estado in self.estados_aceitacao else 'Não':<10}\n"
         
@@ -112,15 +220,15 @@ class AFD:
 # Exemplo de uso da classe AFD (para rodar: python3 afd.py)
 def main():
     # Definindo os estados, alfabeto, transições, estado inicial e estados de aceitação
-    estados = {'q0', 'q1', 'q2'}
+    estados = {0, 1, 2}
     alfabeto = {'a', 'b'}
     transicoes = {
-        ('q0', 'a'): 'q1',
-        ('q1', 'b'): 'q2',
-        ('q2', 'a'): 'q0'
+        (0, 'a'): 1,
+        (1, 'b'): 2,
+        (2, 'a'): 0
     }
-    estado_inicial = 'q0'
-    estados_aceitacao = {'q2'}
+    estado_inicial = 0
+    estados_aceitacao = {2}
 
     # Criando o AFD
     afd = AFD("meu_afd", estados, alfabeto, transicoes, estado_inicial, estados_aceitacao)
@@ -1,25 +1,68 @@
+from multiprocessing import Pool
 from lexico.afd import AFD
 
+# Saídas de cada estado na determinização paralela, como conjuntos de bits:
+# {estado: [(símbolo, destinos já com seus E-fechos)]} (um por processo)
+_saidas_bits: dict[int, list[tuple[str, int]]] = None
+
+def _inicializar_determinizacao(saidas_bits: dict[int, list[tuple[str, int]]]) -> None:
+    global _saidas_bits
+    _saidas_bits = saidas_bits
+
+def _mover_conjuntos(conjuntos: list[int]) -> list[list[tuple[str, int]]]:
+    """Calcula, para cada conjunto de estados (bits), os conjuntos destino
+        por símbolo, em ordem de símbolo (executado nos processos
+        trabalhadores, ou no principal em níveis pequenos)."""
+    saidas_bits = _saidas_bits
+    resultado = []
+    for conjunto in conjuntos:
+        movimentos: dict[str, int] = {}
+        # Os bits ligados são os estados do conjunto (o bit 0 é o último caractere)
+        bits = bin(conjunto)[:1:-1]
+        estado = bits.find('1')
+        while estado >= 0:
+            for simbolo, destinos in saidas_bits.get(estado, ()):
+                movimentos[simbolo] = movimentos.get(simbolo, 0) | destinos
+            estado = bits.find('1', estado + 1)
+        resultado.append(sorted(movimentos.items()))
+    return resultado
+
 class AFND:
-    def __init__(self, nome: str, estados: set[str], alfabeto: set[str], transicoes: dict[tuple[str, str], str], estado_inicial: str, estados_aceitacao: set[str], mapeamento: dict[str, set[str]] = None):
+    """Classe que representa um Autômato Finito Não-Determinístico (AFND).
+
+    Os estados são identificados por inteiros. As transições levam cada par
+    (estado, símbolo) a uma tupla de estados destino ('&' representa ε).
+
+    avaliar_palavra, mover e padrao não alteram o objeto (os ramos da
+    varredura ficam em variáveis locais), então um mesmo AFND pode ser usado
+    por várias threads ao mesmo tempo. Já resetar, transitar e aceita
+    avançam passo a passo os ramos do próprio objeto.
+    """
+
+    __slots__ = ('nome', 'estados', 'alfabeto', 'transicoes', 'E_transicoes',
+                 'E_fechos', 'estado_inicial', 'estados_aceitacao', 'mapeamento',
+                 'ramos')
+
+    def __init__(self, nome: str, estados: set[int], alfabeto: set[str], transicoes: dict[tuple[int, str], tuple[int, ...]], estado_inicial: int, estados_aceitacao: set[int], mapeamento: dict[str, set[int]] = None):
         """Inicializa o AFD com os estados, alfabeto, transições, estado inicial
         e estados de aceitação.
             
         Args:
             nome (str): Nome do AFND (importante para identificação).
-            estados (set[str]): Conjunto de estados do AFD.
+            estados (set[int]): Conjunto de estados do AFD.
             alfabeto (set[str]): Conjunto de símbolos do alfabeto do AFD.
-            transicoes (dict[tuple[str, str], str]): Dicionário que mapeia tuplas (estado, símbolo) para o próximo estado.
-            estado_inicial (str): Estado inicial do AFD.
-            estados_aceitacao (set[str]): Conjunto de estados de aceitação do AFD.
-            mapeamento (dict[str, str], opcional): Mapeamento de estados de aceitação para identificadores (se None, usa o nome do AFND).
+            transicoes (dict[tuple[int, str], tuple[int, ...]]): Dicionário que mapeia tuplas (estado, símbolo) para os próximos estados.
+            estado_inicial (int): Estado inicial do AFD.
+            estados_aceitacao (set[int]): Conjunto de estados de aceitação do AFD.
+            mapeamento (dict[str, set[int]], opcional): Mapeamento de estados de aceitação para identificadores (se None, usa o nome do AFND).
         """
         self.nome = nome
         self.estados = estados
         self.alfabeto = alfabeto
         self.transicoes = transicoes
         self.E_transicoes = {estado: ramos for (estado, simbolo), ramos in transicoes.items() if simbolo == '&'}
-        self.E_fechos = {estado: self.E_fecho(estado) for estado in estados}
+        # Só guarda os fechos de estados com transições ε (os demais são o próprio estado)
+        self.E_fechos = {estado: frozenset(self.E_fecho(estado)) for estado in self.E_transicoes}
         self.estado_inicial = estado_inicial
         self.estados_aceitacao = estados_aceitacao
         self.mapeamento = mapeamento if mapeamento is not None else {nome: estados_aceitacao}
@@ -28,9 +71,9 @@ class AFND:
     @classmethod
     def uniao(cls, automatos: list[AFD]):
         """Cria um AFND que representa a união de múltiplos (2 ou +) AFDs.
-           Estados são renomeados para evitar conflitos, e um novo estado 
-           inicial é criado que transita por ε para os estados iniciais 
-           de cada AFD.
+           Os estados de cada AFD são deslocados por um valor base para evitar 
+           conflitos, e um novo estado inicial (0) é criado que transita por ε
+           para os estados iniciais de cada AFD.
         
         Args:
             automatos (list[AFD]): Lista de AFDs a serem unidos.
@@ -38,48 +81,53 @@ class AFND:
         Returns:
             Um novo AFND representando a união dos dois AFDs.
         """
-        # União dos estados, alfabeto, transiçõesestados de aceitação (com ajustes no nome dos estados, para evitar conflitos)
-        estados: set[str] = set()
+        # União dos estados, alfabeto, transições e estados de aceitação (com deslocamento dos estados, para evitar conflitos)
+        estados: set[int] = set()
         alfabeto: set[str] = set()
-        estados_aceitacao: set[str] = set()
-        transicoes: dict[tuple[str, str], set[str]] = {}
-        mapeamento: dict[str, str] = {} # Mapeamento de estados de aceitação para identificadores (nome dos AFDs)
-
+        estados_aceitacao: set[int] = set()
+        transicoes: dict[tuple[int, str], tuple[int, ...]] = {}
+        mapeamento: dict[str, set[int]] = {} # Mapeamento de estados de aceitação para identificadores (nome dos AFDs)
 
         # Estado inicial do novo AFND (transita por ε para os estados iniciais de cada AFD)
-        estado_inicial = 'S'
+        estado_inicial = 0
         estados.add(estado_inicial)
-        transicoes[(estado_inicial, '&')] = set()
+        iniciais: list[int] = []
+        base = 1
         for af in automatos:
-            # Cria um prefixo único para cada AFD para evitar conflitos de nomes
-            prefixo = f"{af.nome}_"
-            # Une estados, alfabeto, transições e estados de aceitação de cada AFD
-            estados.update(f"{prefixo}{estado}" for estado in af.estados)
+            # Desloca os estados de cada AFD para uma faixa própria de inteiros
+            estados.update(base + estado for estado in af.estados)
             alfabeto.update(af.alfabeto)
-            estados_aceitacao.update(f"{prefixo}{estado}" for estado in af.estados_aceitacao)
-            transicoes.update({(f"{prefixo}{estado}", simbolo): {f"{prefixo}{proximo_estado}"}
+            aceitacao = {base + estado for estado in af.estados_aceitacao}
+            estados_aceitacao.update(aceitacao)
+            transicoes.update({(base + estado, simbolo): (base + proximo_estado,)
                                for (estado, simbolo), proximo_estado in af.transicoes.items()})
             # Adiciona transições epsilon do estado inicial do novo AFND para o antigo inicial de cada AFD
-            transicoes[(estado_inicial, '&')].add(f"{prefixo}{af.estado_inicial}")
+            iniciais.append(base + af.estado_inicial)
             # Mapeia os estados de aceitação para seus identificadores (AFDs antigos)
-            mapeamento.update({af.nome: {f"{prefixo}{estado}" for estado in af.estados_aceitacao}})
+            mapeamento[af.nome] = aceitacao
+            base += max(af.estados, default=-1) + 1
+        transicoes[(estado_inicial, '&')] = tuple(iniciais)
 
         return cls("união", estados, alfabeto, transicoes, estado_inicial, estados_aceitacao, mapeamento)
 
     def resetar(self) -> None:
         """Reseta os ramos do AFND para o estado inicial (e seu E-fecho)."""
-        self.ramos = set([self.estado_inicial])
-        self.ramos = self.ramos.union(self.E_transicoes.get(self.estado_inicial, set()))
+        self.ramos = self.ramos_iniciais()
+
+    def ramos_iniciais(self) -> set[int]:
+        """Retorna os ramos do início de uma varredura: o estado inicial e
+        seu E-fecho."""
+        return set(self.E_fechos.get(self.estado_inicial, (self.estado_inicial,)))
     
-    def E_fecho(self, estado: str) -> set[str]:
+    def E_fecho(self, estado: int) -> set[int]:
         """Calcula o fecho epsilon de um estado, retornando todos os estados
         alcançáveis a partir do estado dado através de transições epsilon.
         
         Args:
-            estado (str): O estado para o qual calcular o fecho epsilon.
+            estado (int): O estado para o qual calcular o fecho epsilon.
         
         Returns:
-            set[str]: Conjunto de estados alcançáveis através de transições epsilon.
+            set[int]: Conjunto de estados alcançáveis através de transições epsilon.
         """
         fecho = set([estado])
         pilha = [estado]
@@ -87,7 +135,7 @@ class AFND:
         # Utiliza uma pilha para explorar os estados alcançáveis por transições epsilon
         while pilha:
             atual = pilha.pop()
-            for proximo in self.E_transicoes.get(atual, []):
+            for proximo in self.E_transicoes.get(atual, ()):
                 if proximo not in fecho:
                     fecho.add(proximo)
                     pilha.append(proximo)
@@ -101,19 +149,27 @@ class AFND:
         Args:
             simbolo (str): O símbolo a ser processado.
         """
-        
+        self.ramos = self.mover(self.ramos, simbolo)
+
+    def mover(self, ramos: set[int], simbolo: str) -> set[int]:
+        """Retorna os ramos seguintes pelo símbolo (com seus E-fechos), sem
+        alterar o AFND.
+
+        Args:
+            ramos (set[int]): os ramos atuais.
+            simbolo (str): O símbolo a ser processado.
+        """
         novos_ramos = set()
         # Para cada ramo, encontra os novos ramos possíveis com o símbolo atual
-        for ramo in self.ramos:
+        for ramo in ramos:
             if (ramo, simbolo) in self.transicoes:
                 # Se houver transição com o símbolo, adiciona os novos ramos
-                novo = self.transicoes.get((ramo, simbolo), set())
+                novo = self.transicoes[(ramo, simbolo)]
                 novos_ramos.update(novo)
                 # Também adiciona os E-fechos dos novos estados
                 for estado in novo:
-                    novos_ramos.update(self.E_fechos.get(estado, set()))
-
-        self.ramos = novos_ramos
+                    novos_ramos.update(self.E_fechos.get(estado, ()))
+        return novos_ramos
 
     def aceita(self) -> bool:
         """Verifica se algum dos ramos atuais é um estado de aceitação.
@@ -121,8 +177,17 @@ class AFND:
         Returns:
             True se algum ramo atual for um estado de aceitação, False caso contrário.
         """
+        return self.padrao(self.ramos)
+
+    def padrao(self, ramos: set[int]) -> tuple[bool, str]:
+        """Verifica se algum dos ramos dados é um estado de aceitação.
+
+        Returns:
+            (bool, str): se algum é, e o identificador do primeiro padrão
+            (do mapeamento) que contém um deles (ou None).
+        """
         for identificador, estados in self.mapeamento.items():
-            if any(estado in estados for estado in self.ramos):
+            if any(estado in estados for estado in ramos):
                 return True, identificador
         return False, None
     
@@ -135,28 +200,28 @@ class AFND:
         Returns:
             True se a palavra for aceita pelo AFND, False caso contrário.
         """
-        # Reseta os ramos para o estado inicial
-        self.resetar()
-
-        # Processa a palavra, símbolo a símbolo
+        # Os ramos da varredura são locais: o AFND não é alterado
+        ramos = self.ramos_iniciais()
         for simbolo in palavra:
-            self.transitar(simbolo)
+            ramos = self.mover(ramos, simbolo)
+            if not ramos:
+                break
         
         # Determina a aceitação da palavra
-        return self.aceita()
+        return self.padrao(ramos)
 
-    def E_tabela(self) -> dict[frozenset[str], set[tuple[str, frozenset[str]]]]:
+    def E_tabela(self) -> dict[frozenset[int], set[tuple[str, frozenset[int]]]]:
         """Gera uma tabela de transições do AFND, mas com conjuntos de estados 
         (apenas os conjuntos alcançáveis). Essa tabela é útil para determinizar
         o AFND posteriormente.
 
         Returns:
-            dict[str, set[str]]: A tabela de transições epsilon do AFND.
+            dict[frozenset[int], set[tuple[str, frozenset[int]]]]: A tabela de transições epsilon do AFND.
         """
 
         # Cria uma pilha para armazenar os conjuntos de estados a serem processados
         # Inicia com o estado inicial e seus E-fechos
-        pilha = [{self.estado_inicial}.union(self.E_fechos.get(self.estado_inicial, set()))]
+        pilha = [{self.estado_inicial}.union(self.E_fechos.get(self.estado_inicial, ()))]
         tabela = {}
         while len(pilha) > 0:
             # Pega o próximo conjunto de estados da pilha
@@ -173,105 +238,222 @@ class AFND:
                         if (estado, simbolo) in self.transicoes:
                             novo_conjunto.update(self.transicoes[(estado, simbolo)])
                             # Adiciona os E-fechos dos estados alcançados
-                            fechos = [self.E_fechos.get(novo_estado, set()) for novo_estado in self.transicoes[(estado, simbolo)]]
+                            fechos = [self.E_fechos.get(novo_estado, ()) for novo_estado in self.transicoes[(estado, simbolo)]]
                             novo_conjunto.update(estado_do_fecho for fecho in fechos for estado_do_fecho in fecho)
 
                     # Se o novo conjunto não estiver vazio, adiciona à tabela
                     # e à pilha para processamento posterior
                     if novo_conjunto:
-                        tabela[conjunto].add((simbolo, frozenset(novo_conjunto)))
-                        if frozenset(novo_conjunto) not in tabela:
-                            pilha.append(frozenset(novo_conjunto))
+                        novo_conjunto = frozenset(novo_conjunto)
+                        tabela[conjunto].add((simbolo, novo_conjunto))
+                        if novo_conjunto not in tabela:
+                            pilha.append(novo_conjunto)
         
         return tabela
 
-    def determinizar(self) -> AFD:
+    def determinizar(self, processos: int = 1) -> AFD:
         """Determiniza o AFND, convertendo-o em um AFD.
 
+            Os conjuntos de estados recebem identificadores inteiros à medida
+            que são descobertos, de modo que as transições do AFD já são
+            geradas entre inteiros (sem tabela intermediária de conjuntos).
+
+            Args:
+                processos (int): com mais de um, a construção é dividida
+                    entre processos (ver determinizar_paralelo).
+
             Returns:
                 O AFD resultante da determinização.
         """
+        if processos > 1:
+            return self.determinizar_paralelo(processos)
         alfabeto = self.alfabeto
-        # Gera a tabela de transições do AFND
-        tabela = self.E_tabela()
-        # Cria um mapeamento de conjuntos de estados para estados equivalentes
-        equivalentes = {conjunto: f"q{i}" for i, conjunto in enumerate(tabela.keys())}
-        estados = set(equivalentes.values())
-
-        # Define o estado inicial e os estados de aceitação do AFD
-        estado_inicial = equivalentes[frozenset([self.estado_inicial]).union(self.E_fechos.get(self.estado_inicial, set()))]
-        estados_aceitacao = {equivalentes[conjunto] for conjunto in tabela.keys() if any(estado in self.estados_aceitacao for estado in conjunto)}
-        # Cria as transições do AFD a partir da tabela de transições do AFND
-        transicoes = {}
-        for conjunto, novos_conjuntos in tabela.items():
-            estado_atual = equivalentes[conjunto]
-            for simbolo, novo_conjunto in novos_conjuntos:
-                if novo_conjunto:
-                    estado_proximo = equivalentes[novo_conjunto]
-                    transicoes[(estado_atual, simbolo)] = estado_proximo
+        # Para cada estado, lista (símbolo, destinos já com seus E-fechos)
+        saidas: dict[int, list[tuple[str, tuple[int, ...]]]] = {}
+        for (estado, simbolo), destinos in self.transicoes.items():
+            if simbolo == '&':
+                continue
+            fechados = set()
+            for destino in destinos:
+                fechados.update(self.E_fechos.get(destino, (destino,)))
+            saidas.setdefault(estado, []).append((simbolo, tuple(fechados)))
+
+        # Conjunto inicial: o estado inicial e seu E-fecho
+        inicial = frozenset(self.E_fechos.get(self.estado_inicial, (self.estado_inicial,)))
+        identificadores: dict[frozenset[int], int] = {inicial: 0}
+        conjuntos: list[frozenset[int]] = [inicial]
+        transicoes: dict[tuple[int, str], int] = {}
+
+        # Explora os conjuntos alcançáveis em largura, numerando-os na ordem de descoberta
+        atual = 0
+        while atual < len(conjuntos):
+            movimentos: dict[str, set[int]] = {}
+            for estado in conjuntos[atual]:
+                for simbolo, destinos in saidas.get(estado, ()):
+                    movimentos.setdefault(simbolo, set()).update(destinos)
+            for simbolo, destinos in movimentos.items():
+                novo_conjunto = frozenset(destinos)
+                proximo = identificadores.get(novo_conjunto)
+                if proximo is None:
+                    proximo = len(conjuntos)
+                    identificadores[novo_conjunto] = proximo
+                    conjuntos.append(novo_conjunto)
+                transicoes[(atual, simbolo)] = proximo
+            atual += 1
+
+        # Define os estados de aceitação e o mapeamento para os identificadores de cada ER
+        estados = set(range(len(conjuntos)))
+        estados_aceitacao = {i for i, conjunto in enumerate(conjuntos) if not conjunto.isdisjoint(self.estados_aceitacao)}
         mapeamento = {nome: set() for nome in self.mapeamento.keys()}
-        for conjunto, novo_estado in equivalentes.items():
+        for i, conjunto in enumerate(conjuntos):
             for identificador, estados_afd in self.mapeamento.items():
-                if any(estado in conjunto for estado in estados_afd):
-                    mapeamento[identificador].add(novo_estado)
+                if not conjunto.isdisjoint(estados_afd):
+                    mapeamento[identificador].add(i)
         # Retorna o AFD determinizado
-        return AFD("AFD_FINAL", estados, alfabeto, transicoes, estado_inicial, estados_aceitacao, mapeamento)
+        return AFD("AFD_FINAL", estados, alfabeto, transicoes, 0, estados_aceitacao, mapeamento)
+
+    def determinizar_paralelo(self, processos: int, minimo_por_processo: int = 64) -> AFD:
+        """Determiniza o AFND dividindo a construção de subconjuntos entre
+            processos, nível a nível (busca em largura).
+
+            Cada conjunto de estados é um inteiro com um bit por estado (uma
+            chave canônica, barata de comparar e de enviar). A cada nível, a
+            fronteira (os conjuntos descobertos no nível anterior) é dividida
+            em fatias; cada processo calcula os destinos das suas fatias, e
+            o processo principal junta os resultados na ordem da fronteira,
+            descartando os conjuntos já vistos. Como os símbolos de cada
+            conjunto vêm ordenados, a numeração dos estados é a mesma para
+            qualquer número de processos (pode diferir da de determinizar,
+            que segue a ordem dos dicionários; o AFD é o mesmo, a menos dos
+            nomes dos estados).
+
+            Args:
+                processos (int): tamanho do pool.
+                minimo_por_processo (int): níveis com menos de
+                    processos * minimo_por_processo conjuntos são calculados
+                    no próprio processo principal (não compensa enviá-los).
+
+            Returns:
+                O AFD resultante da determinização.
+        """
+        # Para cada estado, lista (símbolo, destinos já com seus E-fechos) como bits
+        saidas_bits: dict[int, list[tuple[str, int]]] = {}
+        for (estado, simbolo), destinos in self.transicoes.items():
+            if simbolo == '&':
+                continue
+            bits = 0
+            for destino in destinos:
+                for fechado in self.E_fechos.get(destino, (destino,)):
+                    bits |= 1 << fechado
+            saidas_bits.setdefault(estado, []).append((simbolo, bits))
+
+        inicial = 0
+        for estado in self.E_fechos.get(self.estado_inicial, (self.estado_inicial,)):
+            inicial |= 1 << estado
+        identificadores: dict[int, int] = {inicial: 0}
+        conjuntos: list[int] = [inicial]
+        transicoes: dict[tuple[int, str], int] = {}
+
+        # O processo principal também calcula (os níveis pequenos); o pool só
+        # é criado no primeiro nível grande o bastante (muitos AFNDs nunca têm um)
+        _inicializar_determinizacao(saidas_bits)
+        pool = None
+        try:
+            inicio = 0
+            while inicio < len(conjuntos):
+                # Fronteira: os conjuntos descobertos no nível anterior
+                fronteira = conjuntos[inicio:]
+                if len(fronteira) < processos * minimo_por_processo:
+                    resultados = _mover_conjuntos(fronteira)
+                else:
+                    if pool is None:
+                        pool = Pool(processos, initializer=_inicializar_determinizacao, initargs=(saidas_bits,))
+                    tamanho = -(-len(fronteira) // (4 * processos))
+                    fatias = [fronteira[i:i + tamanho] for i in range(0, len(fronteira), tamanho)]
+                    resultados = [movimentos for fatia in pool.imap(_mover_conjuntos, fatias) for movimentos in fatia]
+                # Junta os resultados na ordem da fronteira (numeração determinística)
+                for atual, movimentos in enumerate(resultados, inicio):
+                    for simbolo, destino in movimentos:
+                        proximo = identificadores.get(destino)
+                        if proximo is None:
+                            proximo = len(conjuntos)
+                            identificadores[destino] = proximo
+                            conjuntos.append(destino)
+                        transicoes[(atual, simbolo)] = proximo
+                inicio += len(fronteira)
+        finally:
+            if pool is not None:
+                pool.terminate()
+            _inicializar_determinizacao(None)
+
+        # Estados de aceitação e mapeamento, também com máscaras de bits
+        def mascara(estados: set[int]) -> int:
+            bits = 0
+            for estado in estados:
+                bits |= 1 << estado
+            return bits
+        aceitacao = mascara(self.estados_aceitacao)
+        mascaras = {nome: mascara(estados_afd) for nome, estados_afd in self.mapeamento.items()}
+        estados_aceitacao = {i for i, conjunto in enumerate(conjuntos) if conjunto & aceitacao}
+        mapeamento = {nome: {i for i, conjunto in enumerate(conjuntos) if conjunto & bits}
+                      for nome, bits in mascaras.items()}
+        return AFD("AFD_FINAL", set(range(len(conjuntos))), self.alfabeto, transicoes, 0, estados_aceitacao, mapeamento)
 
 
 def main():
     # Definindo AFD que aceita palavras terminadas em 'a'
     afd1 = AFD(
         nome="afd1",
-        estados={"q0", "q1"},
+        estados={0, 1},
         alfabeto={"a", "b", "c", "d"},
         transicoes={
-            ("q0", "a"): "q1",
-            ("q0", "b"): "q0",
-            ("q0", "c"): "q0",
-            ("q0", "d"): "q0",
-            ("q1", "a"): "q1",
-            ("q1", "b"): "q0",
-            ("q1", "c"): "q0",
-            ("q1", "d"): "q0"
+            (0, "a"): 1,
+            (0, "b"): 0,
+            (0, "c"): 0,
+            (0, "d"): 0,
+            (1, "a"): 1,
+            (1, "b"): 0,
+            (1, "c"): 0,
+            (1, "d"): 0
         },
-        estado_inicial="q0",
-        estados_aceitacao={"q1"}
+        estado_inicial=0,
+        estados_aceitacao={1}
     )
     # Definindo AFD que aceita palavras terminadas em 'b'
     afd2 = AFD(
         nome="afd2",
-        estados={"q0", "q1"},
+        estados={0, 1},
         alfabeto={"a", "b", "c", "d"},
         transicoes={
-            ("q0", "a"): "q0",
-            ("q0", "b"): "q1",
-            ("q0", "c"): "q0",
-            ("q0", "d"): "q0",
-            ("q1", "a"): "q0",
-            ("q1", "b"): "q1",
-            ("q1", "c"): "q0",
-            ("q1", "d"): "q0"
+            (0, "a"): 0,
+            (0, "b"): 1,
+            (0, "c"): 0,
+            (0, "d"): 0,
+            (1, "a"): 0,
+            (1, "b"): 1,
+            (1, "c"): 0,
+            (1, "d"): 0
         },
-        estado_inicial="q0",
-        estados_aceitacao={"q1"}
+        estado_inicial=0,
+        estados_aceitacao={1}
     )
     # Definindo AFD que aceita palavras terminadas em 'c'
     afd3 = AFD(
         nome="afd3",
-        estados={"q0", "q1"},
+        estados={0, 1},
         alfabeto={"a", "b", "c", "d"},
         transicoes={
-            ("q0", "a"): "q0",
-            ("q0", "b"): "q0",
-            ("q0", "c"): "q1",
-            ("q0", "d"): "q0",
-            ("q1", "a"): "q0",
-            ("q1", "b"): "q0",
-            ("q1", "c"): "q1",
-            ("q1", "d"): "q0"
+            (0, "a"): 0,
+            (0, "b"): 0,
+            (0, "c"): 1,
+            (0, "d"): 0,
+            (1, "a"): 0,
+            (1, "b"): 0,
+            (1, "c"): 1,
+            (1, "d"): 0
         },
-        estado_inicial="q0",
-        estados_aceitacao={"q1"}
+        estado_inicial=0,
+        estados_aceitacao={1}
     )
     # Criando AFND que aceita a união dos três AFDs
     afnd = AFND.uniao([afd1, afd2, afd3])
@@ -288,7 +470,7 @@ def main():
     # Testando o AFD determinizado com algumas palavras
     print("Mapeamento de estados de aceitação:")
     for identificador, estados in afd_determinizado.mapeamento.items():
-        print(f"{identificador}: {', '.join(estados)}")
+        print(f"{identificador}: {', '.join(afd_determinizado.nome_estado(e) for e in sorted(estados))}")
     palavras = ["a", "b", "c", "ab", "ac", "bc", "abc", "abcd", "aab", "bbd"]
     for palavra in palavras:
         resultado = afd_determinizado.avaliar_palavra(palavra)
@@ -1,13 +1,16 @@
+import re
+from collections.abc import Iterable, Iterator
 from lexico.parser import Parser
 from lexico.afd import AFD
 from lexico.afnd import AFND
-from lexico.tree import Tree, Node, LeafNode
+from lexico.tree import Tree, Node
+from lexico.tokens import BufferTokens
 
 class AnalisadorLexico:
     def __init__(self, arquivo_ers: str, codigo_fonte: str):
         self.arquivo_ers = arquivo_ers
         self.codigo_fonte = codigo_fonte
-        self.tokens = []
+        self.tokens = BufferTokens("")
 
     def gerar_afd(self, tree: Node, nome: str) -> AFD:
         """
@@ -15,25 +18,11 @@ class AnalisadorLexico:
         """
         # Implementação do AFD
         from collections import deque
-        # 1. Mapeia cada posição para seu símbolo
-        pos_to_symbol = {}
-        def mapear_folhas(node):
-            if isinstance(node, LeafNode):
-                #print("leaf_node", node.value)
-                pos_to_symbol[node.position] = node.value
-            elif hasattr(node, 'left'):
-                #print("left")
-                mapear_folhas(node.left)
-                if hasattr(node, 'right'):
-                    mapear_folhas(node.right)
-            elif hasattr(node, 'child'):
-                #print('child')
-                mapear_folhas(node.child)
-
-        mapear_folhas(tree)
-
-        # 2. Obter follow_pos, first_pos, last_pos
-        follow_pos = tree.follow_pos()
+        # 1. Numera as posições: o símbolo (ou conjunto de símbolos, ver
+        # Tree.simplificar) de cada uma e o followpos (ver Tree.posicoes)
+        pos_to_symbol, follow_pos = Tree.posicoes(tree)
+
+        # 2. firstpos da raiz (posições relativas à raiz são as absolutas)
         first_pos = tree.first_pos
 
         # 3. Inicializações
@@ -41,25 +30,32 @@ class AnalisadorLexico:
         estados = {estado_inicial}
         fila = deque([estado_inicial])
         transicoes = {}
-        alfabeto = set(pos_to_symbol.values()) - {'#'}  # remove '#' (fim da palavra)
+        # Símbolos de cada posição, exceto '#' (fim da palavra)
+        simbolos_da_posicao = {
+            pos: (valor if isinstance(valor, frozenset) else () if valor == '#' else (valor,))
+            for pos, valor in enumerate(pos_to_symbol)
+        }
+        alfabeto = set().union(*simbolos_da_posicao.values())
         estados_aceitacao = set()
 
-        # 4. Mapeamento de conjuntos de posições para nomes de estado (opcional: para salvar nomes bonitos)
-        nome_estados = {estado_inicial: "S0"}
+        # 4. Mapeamento de conjuntos de posições para estados inteiros (nomeados S0, S1, ... apenas na saída)
+        nome_estados = {estado_inicial: 0}
         contador_nome = 1
 
         while fila:
             estado = fila.popleft()
-            for simbolo in alfabeto:
-                destinos = set()
-                for pos in estado:
-                    # print("pos:", pos, "simbolo:", simbolo)
-                    if pos_to_symbol[pos] == simbolo:
-                        destinos.update(follow_pos.get(pos, set()))
+            # Une, por símbolo, o followpos das posições do estado que o reconhecem
+            destinos_por_simbolo: dict[str, set[int]] = {}
+            for pos in estado:
+                seguintes = follow_pos.get(pos)
+                if seguintes:
+                    for simbolo in simbolos_da_posicao[pos]:
+                        destinos_por_simbolo.setdefault(simbolo, set()).update(seguintes)
+            for simbolo, destinos in destinos_por_simbolo.items():
                 if destinos:
                     destino_fset = frozenset(destinos)
                     if destino_fset not in nome_estados:
-                        nome_estados[destino_fset] = f"S{contador_nome}"
+                        nome_estados[destino_fset] = contador_nome
                         contador_nome += 1
                         fila.append(destino_fset)
                         estados.add(destino_fset)
@@ -79,55 +75,204 @@ class AnalisadorLexico:
             alfabeto=alfabeto,
             transicoes=transicoes,
             estado_inicial=nome_estados[estado_inicial],
-            estados_aceitacao=estados_aceitacao
+            estados_aceitacao=estados_aceitacao,
+            prefixo="S"
         )
 
         return afd
     
-    def gerar_tokens(self, automato: AFD) -> None:
-        """Gera a lista de tokens a partir do texto fonte usando o AFD fornecido.
-        
-        Args:
-            automato (AFD): O autômato finito determinístico usado para tokenização.
+    @staticmethod
+    def gerar_afd_literais(palavras: list[str], nome: str) -> AFD:
+        """Cria o AFD mínimo que reconhece exatamente as palavras dadas (uma
+            trie com sufixos em comum compartilhados, ou DAWG).
+
+            As palavras são inseridas em ordem; ao inserir uma palavra, os
+            estados do caminho da anterior que não são prefixo da nova já não
+            mudam e são trocados por um estado equivalente já registrado (mesma
+            aceitação e mesmas transições), se houver. O custo é linear no
+            total de caracteres, sem posições, followpos ou subconjuntos.
+
+            Args:
+                palavras (list[str]): as palavras (não vazias) da alternância.
+                nome (str): nome do AFD (padrão que ele reconhece).
+
+            Returns:
+                AFD: o autômato mínimo, com estado inicial 0.
         """
-        with open(self.codigo_fonte, 'r') as arquivo:
-            conteudo = arquivo.read()
+        filhos: list[dict[str, int]] = [{}]
+        finais: list[bool] = [False]
+        registro: dict[tuple, int] = {}
+
+        def registrar(caminho: list[int], anterior: str, ate: int) -> None:
+            # Minimiza o caminho da palavra anterior, do fim até a profundidade `ate`
+            for profundidade in range(len(caminho) - 1, ate, -1):
+                estado = caminho[profundidade]
+                assinatura = (finais[estado], tuple(sorted(filhos[estado].items())))
+                equivalente = registro.setdefault(assinatura, estado)
+                if equivalente != estado:
+                    filhos[caminho[profundidade - 1]][anterior[profundidade - 1]] = equivalente
 
-        for linha in conteudo.splitlines():
+        anterior = ""
+        caminho = [0]
+        for palavra in sorted(set(palavras)):
+            prefixo = 0
+            while prefixo < min(len(palavra), len(anterior)) and palavra[prefixo] == anterior[prefixo]:
+                prefixo += 1
+            registrar(caminho, anterior, prefixo)
+            del caminho[prefixo + 1:]
+            for simbolo in palavra[prefixo:]:
+                novo = len(filhos)
+                filhos.append({})
+                finais.append(False)
+                filhos[caminho[-1]][simbolo] = novo
+                caminho.append(novo)
+            finais[caminho[-1]] = True
+            anterior = palavra
+        registrar(caminho, anterior, 0)
+
+        # Renumera os estados alcançáveis (os substituídos ficam de fora)
+        numeros = {0: 0}
+        fila = [0]
+        transicoes = {}
+        for estado in fila:
+            for simbolo, destino in filhos[estado].items():
+                if destino not in numeros:
+                    numeros[destino] = len(numeros)
+                    fila.append(destino)
+                transicoes[(numeros[estado], simbolo)] = numeros[destino]
+
+        return AFD(
+            nome=nome,
+            estados=set(numeros.values()),
+            alfabeto={simbolo for _, simbolo in transicoes},
+            transicoes=transicoes,
+            estado_inicial=0,
+            estados_aceitacao={numeros[estado] for estado in fila if finais[estado]},
+            prefixo="S"
+        )
+
+    @staticmethod
+    def tokenizar(automato: AFD, linhas: Iterable[str]) -> Iterator[tuple[str, str]]:
+        """Gera os tokens (lexema, padrão) de um texto, um de cada vez.
+
+            Como é um gerador, só lê a próxima linha quando o consumidor pede
+            o próximo token: o texto nunca precisa estar inteiro na memória.
+
+            Args:
+                automato (AFD): O autômato finito determinístico usado para
+                    tokenização (ou um lexico.cache.TabelaAFD).
+                linhas (Iterable[str]): As linhas do texto (ex: um arquivo aberto).
+
+            Yields:
+                tuple[str, str]: o lexema e seu padrão ("erro!" se nenhum aceitar).
+        """
+        for linha in linhas:
             for palavra in linha.split():
-                palavra = palavra.strip()
                 resultado = automato.avaliar_palavra(palavra)
                 if resultado[0]:
-                    identificador = resultado[1]
-                    self.tokens.append((palavra, identificador))
+                    yield (palavra, resultado[1])
                 else:
-                    self.tokens.append((palavra, "erro!"))  # E para erro
+                    yield (palavra, "erro!")  # E para erro
+
+    @staticmethod
+    def tokenizar_buffer(automato: AFD, texto: str) -> BufferTokens:
+        """Tokeniza um texto inteiro num BufferTokens: para cada token só
+            são guardados o id do padrão e as posições no texto, sem copiar
+            o lexema (mesmos tokens que tokenizar).
+
+            Args:
+                automato (AFD): O autômato finito determinístico usado para
+                    tokenização (ou um lexico.cache.TabelaAFD).
+                texto (str): o texto fonte.
+
+            Returns:
+                BufferTokens: os tokens, com o padrão "erro!" nos que nenhum
+                padrão aceita.
+        """
+        buffer = BufferTokens(texto)
+        adicionar_tipo = buffer.tipo.append
+        adicionar_inicio = buffer.inicio.append
+        adicionar_fim = buffer.fim.append
+        avaliar_palavra = automato.avaliar_palavra
+        # Tipo de cada lexema já visto: lexemas repetidos não passam pelo AFD
+        vistos: dict[str, int] = {}
+        for palavra in re.finditer(r'\S+', texto):
+            lexema = palavra.group()
+            id_tipo = vistos.get(lexema)
+            if id_tipo is None:
+                aceito, padrao = avaliar_palavra(lexema)
+                id_tipo = vistos[lexema] = buffer.id_tipo(padrao if aceito else "erro!")
+            adicionar_tipo(id_tipo)
+            inicio, fim = palavra.span()
+            adicionar_inicio(inicio)
+            adicionar_fim(fim)
+        return buffer
+
+    def gerar_tokens(self, automato: AFD) -> None:
+        """Gera os tokens do texto fonte (em self.tokens, um BufferTokens)
+        usando o AFD fornecido.
+        
+        Args:
+            automato (AFD): O autômato finito determinístico usado para tokenização.
+        """
+        with open(self.codigo_fonte, 'r') as arquivo:
+            self.tokens = AnalisadorLexico.tokenizar_buffer(automato, arquivo.read())
         
     def imprimir_tokens(self) -> None:
         """Imprime a lista de tokens gerados."""
         with open("tokens.txt", 'w') as arquivo:
-            for token, identificador in self.tokens:
-                arquivo.write(f"<{token}, {identificador}>\n")
+            arquivo.write(self.tokens.formatar())
 
-    def analisar(self):
-        expressoes = Parser.process_er_file(self.arquivo_ers)
+    def compilar(self, salvar_arquivos: bool = True, texto_ers: str | None = None, processos: int = 1) -> AFD:
+        """Compila as ERs do arquivo em um único AFD (AFD_FINAL).
+
+            Args:
+                salvar_arquivos (bool): se True, escreve os autômatos e tabelas
+                    de cada ER (pastas automatos/ e tabelas/) e mostra o progresso.
+                texto_ers (str | None): se informado, as ERs são lidas deste
+                    texto em vez do arquivo arquivo_ers.
+                processos (int): com 1, os AFDs das ERs são unidos direto
+                    pela construção do produto (AFD.uniao_produto); com mais,
+                    pela união em AFND e determinização dividida entre os
+                    processos (ver AFND.determinizar_paralelo).
+
+            Returns:
+                AFD: o autômato final, que reconhece todos os padrões.
+        """
+        if texto_ers is None:
+            expressoes = Parser.process_er_file(self.arquivo_ers)
+        else:
+            expressoes = Parser.process_er_text(texto_ers)
         afds = []
-        print("Iniciando análise léxica...")
-        print()
         for nome, expressao in expressoes.items():
-            print(f"Processando ER: {nome}...")
-            tree = Tree.create_tree(expressao)
-            automato = self.gerar_afd(tree, nome)
+            if salvar_arquivos:
+                print(f"Processando ER: {nome}...")
+            palavras = Tree.literais(expressao)
+            if palavras is not None:
+                automato = AnalisadorLexico.gerar_afd_literais(palavras, nome)
+            else:
+                tree = Tree.create_tree(expressao)
+                automato = self.gerar_afd(tree, nome)
             afds.append(automato)
-            automato.escrever_arquivo()
-            automato.gerar_tabela()
-            print(f"AFD '{nome}' criado e salvo em '{automato.nome}.txt' e {automato.nome}_tabela.txt.")
-            print()
-        afnd = AFND.uniao(afds)
-        automato_final = afnd.determinizar()
-        automato_final.escrever_arquivo()
-        automato_final.gerar_tabela()
-        print(f"AFD final criado e salvo em '{automato_final.nome}.txt' e {automato_final.nome}_tabela.txt.")
+            if salvar_arquivos:
+                automato.escrever_arquivo()
+                automato.gerar_tabela()
+                print(f"AFD '{nome}' criado e salvo em '{automato.nome}.txt' e {automato.nome}_tabela.txt.")
+                print()
+        if processos > 1:
+            automato_final = AFND.uniao(afds).determinizar(processos)
+        else:
+            automato_final = AFD.uniao_produto(afds)
+        if salvar_arquivos:
+            automato_final.escrever_arquivo()
+            automato_final.gerar_tabela()
+            print(f"AFD final criado e salvo em '{automato_final.nome}.txt' e {automato_final.nome}_tabela.txt.")
+        return automato_final
+
+    def analisar(self):
+        print("Iniciando análise léxica...")
+        print()
+        automato_final = self.compilar()
         self.gerar_tokens(automato_final)
         self.imprimir_tokens()
         print("Tokens gerados e salvos em 'tokens.txt'.")
@@ -0,0 +1,199 @@
+"""
+Busca (como o grep -o) de todos os trechos de um texto reconhecidos pelos
+padrões das ERs, em qualquer posição (não só em palavras separadas por
+espaços, como na análise léxica).
+
+O AFD_FINAL só roda perto de posições candidatas. Na compilação, cada ER dá
+os literais com que toda palavra dela começa (Tree.prefixos): "ERRO[0-9]+"
+dá "ERRO" e [a-z]x dá as 26 letras. A busca salta direto para a próxima
+ocorrência de um deles com str.find (um literal), com uma classe de
+caracteres (só literais de um caractere) ou com uma alternância de literais
+(re, em C). Nas ERs sem literais obrigatórios, usam-se os caracteres com que
+elas podem começar.
+
+Os casamentos são os mais à esquerda e, entre eles, os mais longos (o
+padrão é o de maior prioridade, como no AFD_FINAL), sem sobreposição.
+"""
+
+import re
+from argparse import ArgumentParser
+from collections.abc import Iterable, Iterator
+from lexico.analisador_lexico import AnalisadorLexico
+from lexico.cache import CacheAutomatos, TabelaAFD
+from lexico.parser import Parser
+from lexico.tree import Tree
+
+class Buscador:
+    """Busca os padrões das ERs em textos arbitrários, com pré-filtro de
+    literais e o AFD_FINAL compilado (do cache em disco, ver lexico/cache.py)."""
+
+    # Máximo de literais (de mais de um caractere) de cada ER no pré-filtro
+    MAX_LITERAIS = 16
+
+    def __init__(self, texto_ers: str, pasta_cache: str = "tabelas"):
+        compilar = lambda: AnalisadorLexico(None, None).compilar(salvar_arquivos=False, texto_ers=texto_ers)
+        self.automato, _ = CacheAutomatos.obter(texto_ers, compilar, pasta_cache)
+        self.literais = Buscador.extrair_literais(texto_ers)
+        self.maior_literal = max(map(len, self.literais), default=1)
+        self.candidatos = Buscador.filtro(self.literais)
+
+    @classmethod
+    def de_arquivo(cls, arquivo_ers: str, pasta_cache: str = "tabelas") -> "Buscador":
+        with open(arquivo_ers, 'r') as f:
+            return cls(f.read(), pasta_cache)
+
+    @staticmethod
+    def extrair_literais(texto_ers: str) -> set[str]:
+        """Une os literais de início de todas as ERs: todo trecho que algum
+            padrão reconhece começa com um deles."""
+        literais = set()
+        for expressao in Parser.process_er_text(texto_ers).values():
+            palavras = Tree.literais(expressao)
+            if palavras is not None:
+                literais.update(palavras)
+                continue
+            tree = Tree.create_tree(expressao)
+            prefixos = Tree.prefixos(tree)
+            if prefixos is None:
+                # Sem literais obrigatórios: os caracteres com que a ER pode começar
+                simbolos, _ = Tree.posicoes(tree)
+                prefixos = set()
+                for posicao in tree.first_pos:
+                    valor = simbolos[posicao]
+                    if valor != '#':
+                        prefixos.update(valor if isinstance(valor, frozenset) else (valor,))
+            # Muitos literais deixam a alternância lenta: encurta-os até sobrarem poucos
+            tamanho = max(map(len, prefixos))
+            while tamanho > 1 and len({prefixo[:tamanho] for prefixo in prefixos}) > Buscador.MAX_LITERAIS:
+                tamanho -= 1
+            literais.update(prefixo[:tamanho] for prefixo in prefixos)
+        # Um literal que começa com outro é redundante (o mais curto já o encontra)
+        minimos = set()
+        for literal in sorted(literais, key=len):
+            if not any(literal[:i] in minimos for i in range(1, len(literal))):
+                minimos.add(literal)
+        return minimos
+
+    @staticmethod
+    def filtro(literais: set[str]):
+        """Cria a função que encontra a próxima posição candidata: (texto,
+            início, fim) -> posição, ou -1 se não houver."""
+        if len(literais) == 1:
+            literal = next(iter(literais))
+            return lambda texto, inicio, fim: texto.find(literal, inicio, fim)
+        if all(len(literal) == 1 for literal in literais):
+            padrao = re.compile('[' + ''.join(re.escape(c) for c in sorted(literais)) + ']')
+        else:
+            padrao = re.compile('|'.join(re.escape(literal) for literal in sorted(literais, key=len, reverse=True)))
+
+        def proximo(texto: str, inicio: int, fim: int) -> int:
+            encontrado = padrao.search(texto, inicio, fim)
+            return -1 if encontrado is None else encontrado.start()
+        return proximo
+
+    def _buscar(self, texto: str, final: bool) -> Iterator[tuple[int, int, int]]:
+        """Busca num trecho do texto. Se não for o trecho final, para antes
+            dos casamentos que podem continuar depois do fim do trecho e
+            retorna (via StopIteration) a posição de onde retomar."""
+        automato: TabelaAFD = self.automato
+        candidatos = self.candidatos
+        n = len(texto)
+        # Um literal que começa depois de `limite` pode estar cortado no fim do trecho
+        limite = n if final else max(0, n - self.maior_literal + 1)
+        posicao = 0
+        while posicao < limite:
+            inicio = candidatos(texto, posicao, n)
+            if inicio < 0 or inicio >= limite:
+                break
+            fim, indice, aberto = automato.maior_casamento(texto, inicio)
+            if aberto and not final:
+                return inicio
+            if indice < 0:
+                posicao = inicio + 1
+                continue
+            yield inicio, fim, indice
+            posicao = fim
+        return max(posicao, limite)
+
+    def buscar(self, texto: str) -> Iterator[tuple[int, int, str]]:
+        """Busca os padrões num texto inteiro.
+
+            Yields:
+                (int, int, str): início e fim do trecho e o padrão.
+        """
+        padroes = self.automato.padroes
+        for inicio, fim, indice in self._buscar(texto, True):
+            yield inicio, fim, padroes[indice]
+
+    def buscar_blocos(self, blocos: Iterable[str]) -> Iterator[tuple[int, int, int, int, str, str]]:
+        """Busca os padrões num texto lido em blocos (ex: um arquivo grande),
+            sem ter o texto inteiro na memória. Um casamento pode atravessar
+            blocos: o trecho pendente é levado ao bloco seguinte.
+
+            Yields:
+                (int, int, int, int, str, str): início e fim do trecho no
+                texto, sua linha e coluna (a partir de 1), o trecho e o padrão.
+        """
+        padroes = self.automato.padroes
+        resto = ""
+        base = 0           # posição de `resto` no texto todo
+        linha = 1          # linha e início da linha em `contado`
+        inicio_linha = 0
+        contado = 0        # quebras de linha contadas até aqui (posição no texto todo)
+
+        def trecho(texto: str, final: bool):
+            nonlocal linha, inicio_linha, contado
+            busca = self._buscar(texto, final)
+            while True:
+                try:
+                    inicio, fim, indice = next(busca)
+                except StopIteration as parada:
+                    return parada.value
+                quebras = texto.count('\n', contado - base, inicio)
+                if quebras:
+                    linha += quebras
+                    inicio_linha = base + texto.rfind('\n', contado - base, inicio) + 1
+                contado = base + inicio
+                yield base + inicio, base + fim, linha, base + inicio - inicio_linha + 1, texto[inicio:fim], padroes[indice]
+
+        for bloco in blocos:
+            texto = resto + bloco
+            retomar = yield from trecho(texto, False)
+            # Conta as quebras de linha do que será descartado
+            quebras = texto.count('\n', contado - base, retomar)
+            if quebras:
+                linha += quebras
+                inicio_linha = base + texto.rfind('\n', contado - base, retomar) + 1
+            contado = base + retomar
+            resto = texto[retomar:]
+            base += retomar
+        yield from trecho(resto, True)
+
+    def buscar_arquivo(self, caminho: str, tamanho_bloco: int = 1 << 20) -> Iterator[tuple[int, int, int, int, str, str]]:
+        """Busca os padrões num arquivo, lido em blocos (ver buscar_blocos)."""
+        with open(caminho, 'r') as arquivo:
+            yield from self.buscar_blocos(iter(lambda: arquivo.read(tamanho_bloco), ""))
+
+def main(argumentos: list[str] | None = None):
+    parser = ArgumentParser(prog="main.py --busca", description="Busca os padrões das ERs em arquivos (como o grep -o).")
+    parser.add_argument("ers", help="arquivo com as expressões regulares")
+    parser.add_argument("arquivos", nargs="+", help="arquivos onde buscar")
+    parser.add_argument("--padrao", action="append", help="mostra só os trechos deste padrão (pode repetir)")
+    parser.add_argument("--contar", action="store_true", help="mostra só o número de trechos por padrão")
+    args = parser.parse_args(argumentos)
+
+    buscador = Buscador.de_arquivo(args.ers)
+    for arquivo in args.arquivos:
+        contagem: dict[str, int] = {}
+        for _, _, linha, coluna, trecho, padrao in buscador.buscar_arquivo(arquivo):
+            if args.padrao and padrao not in args.padrao:
+                continue
+            if args.contar:
+                contagem[padrao] = contagem.get(padrao, 0) + 1
+            else:
+                print(f"{arquivo}:{linha}:{coluna}: {trecho} <{padrao}>")
+        for padrao, total in contagem.items():
+            print(f"{arquivo}: {padrao}: {total}")
+
+if __name__ == "__main__":
+    main()
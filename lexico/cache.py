@@ -0,0 +1,428 @@
+"""
+Cache em disco do AFD_FINAL compilado, para uso compartilhado entre processos.
+
+O autômato é gravado como uma tabela de transições (estados x classes de
+símbolos, com linhas densas e, depois de reorganizada por um perfil de uso,
+linhas esparsas para os estados pouco visitados; ver TabelaAFD) num arquivo
+binário versionado, cujo nome é o hash (SHA-256) do texto das ERs e da
+versão do compilador (CacheAutomatos.COMPILADOR). Na leitura, o arquivo é
+mapeado em memória (mmap, somente leitura) e os vetores são usados
+diretamente como memoryviews de inteiros: cada processo de um pool que
+carrega o mesmo arquivo usa as mesmas páginas do sistema, então a memória
+não cresce com o número de processos.
+
+Formato (little-endian):
+    cabeçalho: 'AFDT', versão (u16), reservado (u16), hash (32 bytes),
+               n_estados, n_classes, estado_inicial, tamanho dos nomes em
+               bytes, n_densos e número de transições esparsas (6 x u32)
+    vetores:   transicoes (n_densos * n_classes), padrao (n_estados),
+               esparso_inicio (n_estados - n_densos + 1), esparso_classe e
+               esparso_destino (transições esparsas), int32
+    nomes:     JSON (UTF-8) com o nome, os símbolos (na ordem das classes) e
+               os padrões
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from abc import ABC
+from array import array
+from collections.abc import Iterator
+from pathlib import Path
+from lexico.afd import AFD
+
+class TabelaAFD:
+    """AFD em vetores de inteiros, pronto para ser usado direto de um mmap.
+
+    Os estados 0..n_densos-1 têm linhas densas: transicoes[estado *
+    n_classes + classe] é o próximo estado (-1 se não houver transição). Os
+    demais têm linhas esparsas: as transições do estado e (s = e - n_densos)
+    são os pares (esparso_classe[i], esparso_destino[i]) com i de
+    esparso_inicio[s] até esparso_inicio[s + 1]. padrao[estado] é o índice
+    do padrão reconhecido em `padroes` (-1 se o estado não for de aceitação).
+
+    de_afd gera só linhas densas; reorganizar renumera os estados (ex: pelos
+    mais visitados num corpus, ver lexico/perfil.py) e deixa esparsas as
+    linhas pouco usadas.
+
+    É imutável: os atributos não podem ser trocados e os vetores são
+    somente leitura (memoryviews do mmap, ou de vetores próprios em
+    de_afd). As funções de varredura (casar, avaliar_palavra, varrer)
+    guardam o estado em variáveis locais e só retornam resultados, então
+    uma mesma tabela pode ser usada por várias threads sem travas nem
+    cópias.
+    """
+
+    __slots__ = ('nome', 'simbolos', 'padroes', 'classe', 'n_estados', 'n_classes',
+                 'estado_inicial', 'transicoes', 'padrao', 'n_densos',
+                 'esparso_inicio', 'esparso_classe', 'esparso_destino')
+
+    def __init__(self, nome: str, simbolos: list[str], padroes: list[str], n_estados: int, estado_inicial: int, transicoes, padrao,
+                 n_densos: int | None = None, esparso_inicio=None, esparso_classe=None, esparso_destino=None):
+        if n_densos is None:
+            n_densos = n_estados
+        vazio = memoryview(array('i')).toreadonly()
+        atributos = {
+            'nome': nome,
+            'simbolos': tuple(simbolos),
+            'padroes': tuple(padroes),
+            # Classe (coluna da tabela) de cada símbolo do alfabeto (só lido)
+            'classe': {simbolo: i for i, simbolo in enumerate(simbolos)},
+            'n_estados': n_estados,
+            'n_classes': len(simbolos),
+            'estado_inicial': estado_inicial,
+            'transicoes': transicoes,
+            'padrao': padrao,
+            'n_densos': n_densos,
+            'esparso_inicio': esparso_inicio if esparso_inicio is not None else memoryview(array('i', [0])).toreadonly(),
+            'esparso_classe': esparso_classe if esparso_classe is not None else vazio,
+            'esparso_destino': esparso_destino if esparso_destino is not None else vazio,
+        }
+        for nome_atributo, valor in atributos.items():
+            object.__setattr__(self, nome_atributo, valor)
+
+    def __setattr__(self, nome: str, valor) -> None:
+        raise AttributeError(f"TabelaAFD é imutável (atributo '{nome}')")
+
+    def __delattr__(self, nome: str) -> None:
+        raise AttributeError(f"TabelaAFD é imutável (atributo '{nome}')")
+
+    @classmethod
+    def de_afd(cls, afd: AFD) -> "TabelaAFD":
+        """Converte um AFD (estados 0..n-1) para a forma em vetores. Um
+            estado de aceitação recebe o primeiro padrão do mapeamento que o
+            contém, como em AFD.avaliar_palavra."""
+        simbolos = sorted(afd.alfabeto)
+        classe = {simbolo: i for i, simbolo in enumerate(simbolos)}
+        n_estados = max(afd.estados, default=-1) + 1
+        transicoes = array('i', [-1]) * (n_estados * len(simbolos))
+        for (estado, simbolo), destino in afd.transicoes.items():
+            transicoes[estado * len(simbolos) + classe[simbolo]] = destino
+        padroes = list(afd.mapeamento)
+        padrao = array('i', [-1]) * n_estados
+        for indice in reversed(range(len(padroes))):
+            for estado in afd.mapeamento[padroes[indice]]:
+                padrao[estado] = indice
+        return cls(afd.nome, simbolos, padroes, n_estados, afd.estado_inicial,
+                   memoryview(transicoes).toreadonly(), memoryview(padrao).toreadonly())
+
+    def destino(self, estado: int, coluna: int) -> int:
+        """Próximo estado a partir de `estado` pela classe `coluna` (-1 se
+            não houver transição), em linhas densas ou esparsas."""
+        if estado < self.n_densos:
+            return self.transicoes[estado * self.n_classes + coluna]
+        linha = estado - self.n_densos
+        esparso_classe = self.esparso_classe
+        for i in range(self.esparso_inicio[linha], self.esparso_inicio[linha + 1]):
+            if esparso_classe[i] == coluna:
+                return self.esparso_destino[i]
+        return -1
+
+    def casar(self, palavra: str) -> int:
+        """Retorna o índice (em `padroes`) do padrão que reconhece a palavra
+            inteira, ou -1 se nenhum reconhecer. É o laço da análise léxica,
+            então repete aqui o acesso de destino (sem uma chamada por símbolo)."""
+        transicoes = self.transicoes
+        classe = self.classe
+        n_classes = self.n_classes
+        n_densos = self.n_densos
+        esparso_inicio = self.esparso_inicio
+        esparso_classe = self.esparso_classe
+        esparso_destino = self.esparso_destino
+        estado = self.estado_inicial
+        for simbolo in palavra:
+            coluna = classe.get(simbolo)
+            if coluna is None:
+                return -1
+            if estado < n_densos:
+                estado = transicoes[estado * n_classes + coluna]
+            else:
+                linha = estado - n_densos
+                for i in range(esparso_inicio[linha], esparso_inicio[linha + 1]):
+                    if esparso_classe[i] == coluna:
+                        estado = esparso_destino[i]
+                        break
+                else:
+                    estado = -1
+            if estado < 0:
+                return -1
+        return self.padrao[estado]
+
+    def avaliar_palavra(self, palavra: str) -> tuple[bool, str]:
+        """Avalia uma palavra, com o mesmo retorno de AFD.avaliar_palavra."""
+        indice = self.casar(palavra)
+        if indice < 0:
+            return False, None
+        return True, self.padroes[indice]
+
+    def maior_casamento(self, texto: str, inicio: int) -> tuple[int, int, bool]:
+        """Casa o maior trecho de texto que começa em `inicio` (como o
+            analisador léxico, o mais longo vence).
+
+            Returns:
+                (int, int, bool): o fim do maior trecho reconhecido e o
+                índice do padrão (-1 e -1 se nenhum trecho for reconhecido) e
+                se o texto acabou com o autômato ainda vivo (um trecho maior
+                poderia continuar depois do fim do texto).
+        """
+        destino = self.destino
+        padrao = self.padrao
+        classe = self.classe
+        estado = self.estado_inicial
+        fim, indice = -1, -1
+        posicao = inicio
+        for posicao in range(inicio, len(texto)):
+            coluna = classe.get(texto[posicao])
+            if coluna is None:
+                return fim, indice, False
+            estado = destino(estado, coluna)
+            if estado < 0:
+                return fim, indice, False
+            if padrao[estado] >= 0:
+                fim, indice = posicao + 1, padrao[estado]
+        return fim, indice, True
+
+    def varrer(self, texto: str) -> Iterator[tuple[int, int, int]]:
+        """Varre as palavras (separadas por espaços) de um texto.
+
+            Yields:
+                (int, int, int): início e fim da palavra no texto e o índice
+                do padrão que a reconhece (-1 se nenhum).
+        """
+        casar = self.casar
+        for palavra in re.finditer(r'\S+', texto):
+            inicio, fim = palavra.span()
+            yield inicio, fim, casar(palavra.group())
+
+    def reorganizar(self, ordem: list[int], n_densos: int, frequencia=None) -> "TabelaAFD":
+        """Cria uma tabela equivalente com os estados renumerados.
+
+            Args:
+                ordem (list[int]): os estados atuais na nova ordem (o estado
+                    ordem[i] passa a ser o estado i).
+                n_densos (int): quantos estados (os primeiros da nova ordem)
+                    ficam com linhas densas; os demais ficam esparsos.
+                frequencia (opcional): uso de cada transição, indexado por
+                    estado atual * n_classes + classe; numa linha esparsa, as
+                    transições mais usadas ficam primeiro (são encontradas
+                    antes). Sem ela, ficam na ordem das classes.
+
+            Returns:
+                TabelaAFD: a tabela reorganizada (os mesmos padrões reconhecem
+                as mesmas palavras).
+        """
+        n_classes = self.n_classes
+        novo = array('i', [-1]) * self.n_estados
+        for numero, estado in enumerate(ordem):
+            novo[estado] = numero
+        if len(ordem) != self.n_estados or -1 in novo:
+            raise ValueError("a ordem deve conter cada estado exatamente uma vez")
+        destino = self.destino
+
+        transicoes = array('i', [-1]) * (n_densos * n_classes)
+        for numero in range(n_densos):
+            estado = ordem[numero]
+            for coluna in range(n_classes):
+                alvo = destino(estado, coluna)
+                if alvo >= 0:
+                    transicoes[numero * n_classes + coluna] = novo[alvo]
+
+        esparso_inicio = array('i', [0])
+        esparso_classe = array('i')
+        esparso_destino = array('i')
+        for estado in ordem[n_densos:]:
+            linha = [(coluna, alvo) for coluna in range(n_classes) if (alvo := destino(estado, coluna)) >= 0]
+            if frequencia is not None:
+                linha.sort(key=lambda entrada: -frequencia[estado * n_classes + entrada[0]])
+            for coluna, alvo in linha:
+                esparso_classe.append(coluna)
+                esparso_destino.append(novo[alvo])
+            esparso_inicio.append(len(esparso_classe))
+
+        padrao = array('i', (self.padrao[estado] for estado in ordem))
+        vetores = (transicoes, padrao, esparso_inicio, esparso_classe, esparso_destino)
+        transicoes, padrao, esparso_inicio, esparso_classe, esparso_destino = (
+            memoryview(vetor).toreadonly() for vetor in vetores)
+        return TabelaAFD(self.nome, self.simbolos, self.padroes, self.n_estados, novo[self.estado_inicial],
+                         transicoes, padrao, n_densos, esparso_inicio, esparso_classe, esparso_destino)
+
+class CacheAutomatos(ABC):
+    """Classe utilitária abstrata (não instanciável) para salvar e carregar
+    o AFD_FINAL do cache em disco."""
+
+    MAGICO = b'AFDT'
+    VERSAO = 2
+    CABECALHO = struct.Struct('<4sHH32s6I')
+    # Ordem dos vetores no arquivo
+    VETORES = ('transicoes', 'padrao', 'esparso_inicio', 'esparso_classe', 'esparso_destino')
+
+    # Versão da compilação das ERs: entra na chave, então arquivos gerados
+    # por uma compilação anterior deixam de ser encontrados. Incremente a
+    # cada mudança na construção da árvore (lexico/tree.py) ou dos AFDs
+    # (gerar_afd, união e determinização) que altere o autômato gerado.
+    COMPILADOR = 1
+
+    @staticmethod
+    def chave(texto_ers: str) -> bytes:
+        """Calcula a chave do cache: SHA-256 da versão do compilador e do
+        texto das ERs."""
+        return hashlib.sha256(f"{CacheAutomatos.COMPILADOR}\0{texto_ers}".encode('utf-8')).digest()
+
+    @staticmethod
+    def caminho(chave: bytes, pasta: str = "tabelas") -> Path:
+        """Retorna o caminho do arquivo de cache de uma chave."""
+        return Path(pasta) / f"{chave.hex()}.afdt"
+
+    @staticmethod
+    def salvar(tabela: TabelaAFD, chave: bytes, caminho: Path) -> None:
+        """Grava a tabela no arquivo de cache (de forma atômica, como em
+        sintatico.cache.CacheTabelas.salvar)."""
+        nomes = json.dumps({
+            "nome": tabela.nome,
+            "simbolos": tabela.simbolos,
+            "padroes": tabela.padroes,
+        }).encode('utf-8')
+        vetores = [array('i', getattr(tabela, nome)) for nome in CacheAutomatos.VETORES]
+        if sys.byteorder == 'big':
+            for vetor in vetores:
+                vetor.byteswap()
+
+        cabecalho = CacheAutomatos.CABECALHO.pack(
+            CacheAutomatos.MAGICO, CacheAutomatos.VERSAO, 0, chave,
+            tabela.n_estados, tabela.n_classes, tabela.estado_inicial, len(nomes),
+            tabela.n_densos, len(tabela.esparso_classe))
+
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        temporario = caminho.with_suffix(f".{os.getpid()}.tmp")
+        with open(temporario, 'wb') as f:
+            f.write(cabecalho)
+            for vetor in vetores:
+                vetor.tofile(f)
+            f.write(nomes)
+        os.replace(temporario, caminho)
+
+    @staticmethod
+    def carregar(caminho: Path, chave: bytes = None) -> TabelaAFD | None:
+        """Carrega um AFD do cache, mapeando o arquivo em memória.
+
+            Args:
+                caminho (Path): arquivo de cache.
+                chave (bytes, opcional): se dada, o hash gravado deve ser igual.
+
+            Returns:
+                A tabela, ou None se o arquivo não existir, for de outra versão
+                ou de outras ERs, ou estiver truncado ou corrompido.
+        """
+        try:
+            with open(caminho, 'rb') as f:
+                mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+        # Valida o arquivo inteiro antes de criar as visões dos vetores (com
+        # visões exportadas o mapa não pode mais ser fechado)
+        nomes = CacheAutomatos._validar(mapa, chave)
+        if nomes is None:
+            mapa.close()
+            return None
+        (_, _, _, _, n_estados, n_classes, estado_inicial,
+         _, n_densos, n_esparsos) = CacheAutomatos.CABECALHO.unpack_from(mapa)
+
+        visao = memoryview(mapa)
+        inicio = CacheAutomatos.CABECALHO.size
+        vetores = []
+        for tamanho in CacheAutomatos._tamanhos(n_estados, n_classes, n_densos, n_esparsos):
+            fim = inicio + 4 * tamanho
+            if sys.byteorder == 'big':
+                vetor = array('i', visao[inicio:fim])
+                vetor.byteswap()
+            else:
+                vetor = visao[inicio:fim].cast('i')
+            vetores.append(vetor)
+            inicio = fim
+        if not CacheAutomatos._conferir_vetores(vetores, n_estados, n_classes, len(nomes["padroes"])):
+            # Índices fora dos limites: libera as visões para poder fechar o mapa
+            for vetor in vetores:
+                if isinstance(vetor, memoryview):
+                    vetor.release()
+            visao.release()
+            mapa.close()
+            return None
+        transicoes, padrao, *esparsos = vetores
+        return TabelaAFD(nomes["nome"], nomes["simbolos"], nomes["padroes"], n_estados, estado_inicial,
+                         transicoes, padrao, n_densos, *esparsos)
+
+    @staticmethod
+    def _tamanhos(n_estados: int, n_classes: int, n_densos: int, n_esparsos: int) -> list[int]:
+        """Os tamanhos (em inteiros) dos vetores de VETORES, nessa ordem."""
+        return [n_densos * n_classes, n_estados, n_estados - n_densos + 1, n_esparsos, n_esparsos]
+
+    @staticmethod
+    def _conferir_vetores(vetores: list, n_estados: int, n_classes: int, n_padroes: int) -> bool:
+        """Confere, uma vez na carga, que todo índice guardado nos vetores
+            está nos limites (destinos, padrões, classes e o início de cada
+            linha esparsa), para a varredura nunca ler fora deles."""
+        transicoes, padrao, esparso_inicio, esparso_classe, esparso_destino = vetores
+        if min(transicoes, default=-1) < -1 or max(transicoes, default=-1) >= n_estados:
+            return False
+        if min(padrao, default=-1) < -1 or max(padrao, default=-1) >= n_padroes:
+            return False
+        if min(esparso_destino, default=-1) < -1 or max(esparso_destino, default=-1) >= n_estados:
+            return False
+        if min(esparso_classe, default=0) < 0 or max(esparso_classe, default=0) >= n_classes:
+            return False
+        # esparso_inicio vai de 0 a n_esparsos sem nunca diminuir
+        if esparso_inicio[0] != 0 or esparso_inicio[-1] != len(esparso_classe):
+            return False
+        return all(anterior <= proximo for anterior, proximo in zip(esparso_inicio, esparso_inicio[1:]))
+
+    @staticmethod
+    def _validar(mapa: mmap.mmap, chave: bytes | None) -> dict | None:
+        """Confere o cabeçalho e o tamanho do arquivo e decodifica os nomes.
+
+            Returns:
+                Os nomes (nome, símbolos e padrões), ou None se o arquivo for
+                de outra versão ou de outras ERs, estiver truncado ou
+                corrompido (tratado como ausência no cache).
+        """
+        if len(mapa) < CacheAutomatos.CABECALHO.size:
+            return None
+        (magico, versao, _, chave_gravada, n_estados, n_classes, estado_inicial,
+         tamanho_nomes, n_densos, n_esparsos) = CacheAutomatos.CABECALHO.unpack_from(mapa)
+        if magico != CacheAutomatos.MAGICO or versao != CacheAutomatos.VERSAO:
+            return None
+        if chave is not None and chave_gravada != chave:
+            return None
+        if n_densos > n_estados or (n_estados and estado_inicial >= n_estados):
+            return None
+        inicio = CacheAutomatos.CABECALHO.size + 4 * sum(CacheAutomatos._tamanhos(n_estados, n_classes, n_densos, n_esparsos))
+        if len(mapa) != inicio + tamanho_nomes:
+            return None
+        try:
+            nomes = json.loads(mapa[inicio:].decode('utf-8'))
+            if not isinstance(nomes.get("nome"), str) or len(nomes.get("simbolos", ())) != n_classes \
+                    or not isinstance(nomes.get("padroes"), list):
+                return None
+        except (UnicodeDecodeError, ValueError, AttributeError, TypeError):
+            return None
+        return nomes
+
+    @staticmethod
+    def obter(texto_ers: str, compilar, pasta: str = "tabelas") -> tuple[TabelaAFD, Path]:
+        """Carrega o AFD das ERs do cache ou, se não houver, compila-o (com
+            compilar(), que retorna um AFD) e o grava.
+
+            Returns:
+                (TabelaAFD, Path): a tabela (mapeada do arquivo) e o arquivo,
+                que outros processos podem carregar com carregar().
+        """
+        chave = CacheAutomatos.chave(texto_ers)
+        caminho = CacheAutomatos.caminho(chave, pasta)
+        tabela = CacheAutomatos.carregar(caminho, chave)
+        if tabela is None:
+            CacheAutomatos.salvar(TabelaAFD.de_afd(compilar()), chave, caminho)
+            tabela = CacheAutomatos.carregar(caminho, chave)
+        return tabela, caminho
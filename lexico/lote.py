@@ -0,0 +1,163 @@
+import glob
+import os
+import time
+from argparse import ArgumentParser
+from multiprocessing import Pool
+from lexico.analisador_lexico import AnalisadorLexico
+from lexico.cache import CacheAutomatos, TabelaAFD
+
+# AFD_FINAL de cada processo trabalhador, mapeado do arquivo de cache (sem cópia)
+_automato: TabelaAFD = None
+
+def _inicializar(caminho_tabela: str, texto_ers: str) -> None:
+    global _automato
+    _automato = CacheAutomatos.carregar(caminho_tabela)
+    if _automato is None:
+        # O arquivo sumiu (ou foi trocado) depois de aberto pelo processo
+        # principal: compila de novo aqui, sem pool (o trabalhador é daemon)
+        compilar = lambda: AnalisadorLexico(None, None).compilar(salvar_arquivos=False, texto_ers=texto_ers)
+        _automato, _ = CacheAutomatos.obter(texto_ers, compilar, os.path.dirname(caminho_tabela) or ".")
+
+def _tokenizar_arquivo(tarefa: tuple[str, str | None]) -> tuple[str, int, int, str | None, str | None]:
+    """Tokeniza um arquivo (executado nos processos trabalhadores).
+
+        Args:
+            tarefa (tuple[str, str | None]): o arquivo de entrada e o arquivo
+                de saída (None: devolve os tokens formatados).
+
+        Returns:
+            (arquivo, tokens, bytes, texto, erro): texto só é preenchido sem
+            arquivo de saída; erro é a mensagem se o arquivo não pôde ser lido.
+    """
+    arquivo, saida = tarefa
+    try:
+        with open(arquivo, 'r') as entrada:
+            tokens = AnalisadorLexico.tokenizar_buffer(_automato, entrada.read())
+        texto = tokens.formatar()
+        if saida is not None:
+            os.makedirs(os.path.dirname(saida) or ".", exist_ok=True)
+            with open(saida, 'w') as arquivo_saida:
+                arquivo_saida.write(texto)
+            texto = None
+        return arquivo, len(tokens), os.path.getsize(arquivo), texto, None
+    except (OSError, UnicodeDecodeError) as erro:
+        return arquivo, 0, 0, None, str(erro)
+
+class ProcessadorLote:
+    """Tokeniza muitos arquivos com um único AFD_FINAL, compilado uma vez e
+    compartilhado por um pool de processos.
+
+    O autômato fica no cache em disco (ver lexico/cache.py) e cada processo
+    o mapeia em memória: todos usam as mesmas páginas, e ERs já compiladas
+    em execuções anteriores nem são recompiladas.
+    """
+
+    def __init__(self, arquivo_ers: str, processos: int | None = None, pasta_cache: str = "tabelas"):
+        with open(arquivo_ers, 'r') as f:
+            texto_ers = f.read()
+        # Na falta do cache, a determinização só é dividida entre processos se
+        # eles forem pedidos explicitamente; sem isso, a união pelo produto
+        # (AFD.uniao_produto) é mais rápida que a determinização com um por CPU
+        compilar = lambda: AnalisadorLexico(arquivo_ers, None).compilar(
+            salvar_arquivos=False, texto_ers=texto_ers, processos=processos or 1)
+        self.automato, self.caminho_tabela = CacheAutomatos.obter(texto_ers, compilar, pasta_cache)
+        self.texto_ers = texto_ers
+        self.processos = processos
+
+    @staticmethod
+    def expandir(padroes: list[str], lista: str | None = None) -> list[str]:
+        """Expande globs (com ** recursivo) e a lista de arquivos (um por
+            linha), sem repetir arquivos e mantendo a ordem."""
+        arquivos = []
+        for padrao in padroes:
+            encontrados = sorted(glob.glob(padrao, recursive=True))
+            arquivos.extend(encontrados if encontrados else [padrao])
+        if lista is not None:
+            with open(lista, 'r') as f:
+                arquivos.extend(linha.strip() for linha in f if linha.strip())
+        return [a for a in dict.fromkeys(arquivos) if not os.path.isdir(a)]
+
+    @staticmethod
+    def caminhos_saida(arquivos: list[str], pasta: str) -> list[str]:
+        """Um arquivo de saída por entrada: a estrutura de pastas relativa à
+            pasta comum das entradas é reproduzida dentro de `pasta`."""
+        absolutos = [os.path.abspath(a) for a in arquivos]
+        base = os.path.commonpath(absolutos) if absolutos else ""
+        if len(absolutos) == 1 or os.path.isfile(base):
+            base = os.path.dirname(base)
+        return [os.path.join(pasta, os.path.relpath(a, base) + ".tokens.txt") for a in absolutos]
+
+    def processar(self, arquivos: list[str], pasta_saida: str | None = "tokens", saida_unica: str | None = None) -> dict:
+        """Tokeniza os arquivos no pool de processos.
+
+            Args:
+                arquivos (list[str]): arquivos de entrada.
+                pasta_saida (str | None): pasta dos arquivos de saída (um por
+                    entrada), usada quando saida_unica não é informada.
+                saida_unica (str | None): arquivo único que recebe os tokens de
+                    todas as entradas, na ordem das entradas, cada uma
+                    precedida de "# <arquivo>".
+
+            Returns:
+                dict: totais de arquivos, tokens, bytes, erros e o tempo.
+        """
+        if saida_unica is None:
+            tarefas = list(zip(arquivos, ProcessadorLote.caminhos_saida(arquivos, pasta_saida)))
+        else:
+            tarefas = [(arquivo, None) for arquivo in arquivos]
+
+        totais = {"arquivos": 0, "tokens": 0, "bytes": 0, "erros": []}
+        inicio = time.perf_counter()
+        destino = open(saida_unica, 'w') if saida_unica is not None else None
+        try:
+            processos = self.processos or os.cpu_count() or 1
+            with Pool(processos, initializer=_inicializar, initargs=(str(self.caminho_tabela), self.texto_ers)) as pool:
+                # Vários arquivos por envio, para não pagar a comunicação por arquivo
+                tamanho = max(1, min(256, len(tarefas) // (4 * processos)))
+                for arquivo, tokens, n_bytes, texto, erro in pool.imap(_tokenizar_arquivo, tarefas, chunksize=tamanho):
+                    if erro is not None:
+                        totais["erros"].append((arquivo, erro))
+                        continue
+                    totais["arquivos"] += 1
+                    totais["tokens"] += tokens
+                    totais["bytes"] += n_bytes
+                    if destino is not None:
+                        destino.write(f"# {arquivo}\n")
+                        destino.write(texto)
+        finally:
+            if destino is not None:
+                destino.close()
+        totais["tempo"] = time.perf_counter() - inicio
+        return totais
+
+    @staticmethod
+    def resumo(totais: dict) -> str:
+        """Texto com os totais e a vazão do lote."""
+        tempo = totais["tempo"] or 1e-9
+        linhas = [
+            f"{totais['arquivos']} arquivos, {totais['tokens']} tokens, {totais['bytes'] / 1e6:.2f} MB em {tempo:.2f}s",
+            f"{totais['arquivos'] / tempo:.0f} arquivos/s, {totais['tokens'] / tempo:.0f} tokens/s, {totais['bytes'] / 1e6 / tempo:.2f} MB/s",
+        ]
+        for arquivo, erro in totais["erros"]:
+            linhas.append(f"Erro em '{arquivo}': {erro}")
+        return "\n".join(linhas)
+
+def main(argumentos: list[str] | None = None):
+    parser = ArgumentParser(prog="main.py --lote", description="Tokeniza vários arquivos com um único AFD compilado.")
+    parser.add_argument("ers", help="arquivo com as expressões regulares")
+    parser.add_argument("entradas", nargs="*", help="arquivos ou globs (ex: 'codigos/**/*.txt')")
+    parser.add_argument("--lista", help="arquivo com um caminho de entrada por linha")
+    parser.add_argument("--saida", default="tokens", help="pasta dos arquivos de saída (padrão: tokens)")
+    parser.add_argument("--unico", help="escreve todos os tokens neste único arquivo")
+    parser.add_argument("--processos", type=int, help="tamanho do pool (padrão: um por CPU)")
+    args = parser.parse_args(argumentos)
+
+    arquivos = ProcessadorLote.expandir(args.entradas, args.lista)
+    if not arquivos:
+        parser.error("nenhum arquivo de entrada")
+    processador = ProcessadorLote(args.ers, args.processos)
+    totais = processador.processar(arquivos, args.saida, args.unico)
+    print(ProcessadorLote.resumo(totais))
+
+if __name__ == "__main__":
+    main()
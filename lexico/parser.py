@@ -102,17 +102,27 @@ class Parser(ABC):
     
     @staticmethod
     def process_er_file(filename):
-        result = {}
         with open(filename, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if not line or ':' not in line:
-                    continue
-                name, expr = line.split(':', 1)
-                name = name.strip()
-                expr = expr.strip()
-                expanded_expr = Parser.expand_regex_expression(expr)
-                result[name] = expanded_expr.replace(" ", "")
+            return Parser.process_er_text(f)
+
+    @staticmethod
+    def process_er_text(lines):
+        """
+        Processa as definições de ERs a partir de um texto (ou de qualquer
+        iterável de linhas, como um arquivo aberto).
+        """
+        if isinstance(lines, str):
+            lines = lines.splitlines()
+        result = {}
+        for line in lines:
+            line = line.strip()
+            if not line or ':' not in line:
+                continue
+            name, expr = line.split(':', 1)
+            name = name.strip()
+            expr = expr.strip()
+            expanded_expr = Parser.expand_regex_expression(expr)
+            result[name] = expanded_expr.replace(" ", "")
         return result
 
 # teste
@@ -0,0 +1,135 @@
+"""
+Reorganização do AFD_FINAL compilado guiada por um perfil de uso.
+
+A numeração dos estados vem da determinização e não tem relação com o uso:
+os estados mais visitados ficam espalhados pela tabela. Uma varredura
+instrumentada de um corpus representativo (as palavras separadas por
+espaços, como na análise léxica) conta quantas vezes cada linha (estado) e
+cada transição são lidas. Com o perfil, os estados são renumerados do mais
+para o menos visitado: as linhas quentes ficam contíguas no início da tabela,
+em forma densa, e as linhas raramente usadas (fora da cobertura pedida)
+ficam esparsas quando isso as deixa menores, com as transições mais usadas
+primeiro (ver TabelaAFD.reorganizar).
+
+A tabela reorganizada é gravada no lugar da original no cache em disco
+(lexico/cache.py), então o lote, o servidor e a busca passam a usá-la sem
+nenhuma mudança.
+
+Uso: python3 -m lexico.perfil <entrada.txt> <corpus...> [--cobertura C] [--pasta PASTA]
+"""
+
+import re
+from argparse import ArgumentParser
+from array import array
+from lexico.analisador_lexico import AnalisadorLexico
+from lexico.cache import CacheAutomatos, TabelaAFD
+
+class PerfilAFD:
+    """Contagens de uso de uma TabelaAFD numa varredura instrumentada.
+
+    visitas[estado] é o número de vezes que a linha do estado foi lida (uma
+    por símbolo consumido a partir dele) e transicoes[estado * n_classes +
+    classe] o número de vezes que cada transição foi consultada.
+    """
+
+    __slots__ = ('tabela', 'visitas', 'transicoes', 'palavras')
+
+    def __init__(self, tabela: TabelaAFD):
+        self.tabela = tabela
+        self.visitas = array('q', bytes(8 * tabela.n_estados))
+        self.transicoes = array('q', bytes(8 * tabela.n_estados * tabela.n_classes))
+        self.palavras = 0
+
+    def registrar(self, texto: str) -> None:
+        """Varre as palavras do texto (como TabelaAFD.casar), contando as
+            linhas e transições lidas."""
+        tabela = self.tabela
+        destino = tabela.destino
+        classe = tabela.classe
+        n_classes = tabela.n_classes
+        visitas = self.visitas
+        transicoes = self.transicoes
+        for palavra in re.finditer(r'\S+', texto):
+            self.palavras += 1
+            estado = tabela.estado_inicial
+            for simbolo in palavra.group():
+                coluna = classe.get(simbolo)
+                if coluna is None:
+                    break
+                visitas[estado] += 1
+                transicoes[estado * n_classes + coluna] += 1
+                estado = destino(estado, coluna)
+                if estado < 0:
+                    break
+
+    def registrar_arquivo(self, caminho: str) -> None:
+        with open(caminho, 'r') as arquivo:
+            self.registrar(arquivo.read())
+
+    def ordem(self) -> list[int]:
+        """Os estados do mais para o menos visitado (os empates, incluindo
+            os nunca visitados, ficam na ordem atual)."""
+        visitas = self.visitas
+        return sorted(range(self.tabela.n_estados), key=lambda estado: -visitas[estado])
+
+    def densos(self, ordem: list[int], cobertura: float = 0.999) -> int:
+        """Quantos estados do início da ordem bastam para cobrir a fração
+            `cobertura` das linhas lidas (todos, se o perfil estiver vazio)."""
+        total = sum(self.visitas)
+        if total == 0:
+            return len(ordem)
+        acumulado = 0
+        for numero, estado in enumerate(ordem):
+            if acumulado >= cobertura * total:
+                return numero
+            acumulado += self.visitas[estado]
+        return len(ordem)
+
+    def reorganizar(self, cobertura: float = 0.999) -> TabelaAFD:
+        """Renumera os estados pelo perfil: as linhas que cobrem a fração
+            `cobertura` das leituras ficam densas e contíguas no início da
+            tabela. Das demais, ficam esparsas as que ocupam menos assim
+            (cada transição esparsa ocupa dois inteiros; a linha densa, um
+            por classe); as outras vêm logo depois das quentes, ainda densas."""
+        tabela = self.tabela
+        ordem = self.ordem()
+        n_quentes = self.densos(ordem, cobertura)
+        densas, esparsas = [], []
+        for estado in ordem[n_quentes:]:
+            n_transicoes = sum(1 for coluna in range(tabela.n_classes) if tabela.destino(estado, coluna) >= 0)
+            (esparsas if 2 * n_transicoes + 1 < tabela.n_classes else densas).append(estado)
+        ordem = ordem[:n_quentes] + densas + esparsas
+        return tabela.reorganizar(ordem, n_quentes + len(densas), self.transicoes)
+
+    @staticmethod
+    def tamanho(tabela: TabelaAFD) -> int:
+        """Tamanho dos vetores da tabela, em bytes."""
+        return sum(4 * len(getattr(tabela, nome)) for nome in CacheAutomatos.VETORES)
+
+def main(argumentos: list[str] | None = None):
+    parser = ArgumentParser(prog="python3 -m lexico.perfil", description="Reorganiza o AFD_FINAL em cache pelo uso dos estados num corpus.")
+    parser.add_argument("ers", help="arquivo com as expressões regulares")
+    parser.add_argument("corpus", nargs="+", help="arquivos representativos da entrada")
+    parser.add_argument("--cobertura", type=float, default=0.999, help="fração das leituras coberta pelas linhas quentes (padrão: 0.999)")
+    parser.add_argument("--pasta", default="tabelas", help="pasta do cache (padrão: tabelas)")
+    args = parser.parse_args(argumentos)
+
+    with open(args.ers, 'r') as f:
+        texto_ers = f.read()
+    compilar = lambda: AnalisadorLexico(None, None).compilar(salvar_arquivos=False, texto_ers=texto_ers)
+    tabela, caminho = CacheAutomatos.obter(texto_ers, compilar, args.pasta)
+
+    perfil = PerfilAFD(tabela)
+    for arquivo in args.corpus:
+        perfil.registrar_arquivo(arquivo)
+    reorganizada = perfil.reorganizar(args.cobertura)
+    CacheAutomatos.salvar(reorganizada, CacheAutomatos.chave(texto_ers), caminho)
+
+    visitados = sum(1 for visitas in perfil.visitas if visitas)
+    print(f"Palavras no corpus: {perfil.palavras}")
+    print(f"Estados: {tabela.n_estados} ({visitados} visitados), linhas densas: {reorganizada.n_densos}")
+    print(f"Tamanho da tabela: {PerfilAFD.tamanho(tabela)} -> {PerfilAFD.tamanho(reorganizada)} bytes")
+    print(f"Tabela gravada em {caminho}")
+
+if __name__ == "__main__":
+    main()
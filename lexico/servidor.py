@@ -0,0 +1,207 @@
+"""
+Servidor de análise léxica: mantém os AFD_FINAL compilados em memória entre
+requisições, para que cada arquivo não pague a compilação das ERs.
+
+Protocolo (texto UTF-8, várias requisições por conexão):
+    cliente:  TOKENIZAR <n>\\n  seguido de <n> bytes com as definições das ERs
+              <m>\\n  seguido de <m> bytes do texto fonte   (repetido)
+              0\\n                                          (fim do texto)
+    servidor: <lexema, padrão>\\n                           (um por token)
+              FIM\\n
+Em caso de erro, o servidor responde ERRO <mensagem>\\n e fecha a conexão.
+"""
+
+import asyncio
+import multiprocessing
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from sys import argv
+from lexico.analisador_lexico import AnalisadorLexico
+from lexico.cache import CacheAutomatos, TabelaAFD
+
+# Cache de autômatos de cada processo trabalhador {hash das ERs: AFD_FINAL}.
+# As tabelas são mapeadas do cache em disco, compartilhado entre os processos.
+_automatos: OrderedDict[str, TabelaAFD] = OrderedDict()
+MAX_AUTOMATOS = 32
+PASTA_CACHE = "tabelas"
+# Separadores de palavras (ASCII: nunca aparecem dentro de um caractere UTF-8)
+ESPACOS = (b" ", b"\n", b"\t", b"\r", b"\x0b", b"\x0c")
+
+def _automato(chave: str, texto_ers: str | None) -> TabelaAFD | None:
+    """Retorna o AFD_FINAL das ERs (LRU). Na falta dele na memória, mapeia-o
+        do cache em disco pela chave; se também não estiver lá, compila-o a
+        partir de texto_ers ou, sem o texto, retorna None."""
+    automato = _automatos.get(chave)
+    if automato is not None:
+        _automatos.move_to_end(chave)
+        return automato
+    if texto_ers is None:
+        hash_ers = bytes.fromhex(chave)
+        automato = CacheAutomatos.carregar(CacheAutomatos.caminho(hash_ers, PASTA_CACHE), hash_ers)
+        if automato is None:
+            return None
+    else:
+        compilar = lambda: AnalisadorLexico(None, None).compilar(salvar_arquivos=False, texto_ers=texto_ers)
+        automato, _ = CacheAutomatos.obter(texto_ers, compilar, PASTA_CACHE)
+    _automatos[chave] = automato
+    if len(_automatos) > MAX_AUTOMATOS:
+        _automatos.popitem(last=False)
+    return automato
+
+def _tokenizar_lote(chave: str, texto_ers: str | None, texto: str) -> str | None:
+    """Tokeniza um lote de palavras completas e devolve a resposta já
+        formatada (executado nos processos trabalhadores), ou None se o
+        autômato não estiver disponível sem o texto das ERs (ver _automato)."""
+    automato = _automato(chave, texto_ers)
+    if automato is None:
+        return None
+    return AnalisadorLexico.tokenizar_buffer(automato, texto).formatar()
+
+class ServidorLexico:
+    """Servidor asyncio (socket Unix ou TCP) que tokeniza textos com ERs
+    enviadas pelo cliente, despachando as varreduras para um pool de
+    processos."""
+
+    def __init__(self, processos: int | None = None, tamanho_lote: int = 1 << 16, max_lotes: int = 4, max_palavra: int = 1 << 20):
+        """
+        Args:
+            processos (int | None): tamanho do pool (None: um por CPU).
+            tamanho_lote (int): bytes de texto fonte por tarefa do pool.
+            max_lotes (int): lotes em andamento por conexão (backpressure).
+            max_palavra (int): bytes acumulados sem nenhum espaço a partir
+                dos quais a requisição é recusada (limita o buffer).
+        """
+        # "spawn": os trabalhadores são criados sob demanda e, com fork,
+        # herdariam os sockets das conexões abertas (o cliente não veria o EOF)
+        self.executor = ProcessPoolExecutor(processos, mp_context=multiprocessing.get_context("spawn"))
+        self.tamanho_lote = tamanho_lote
+        self.max_lotes = max_lotes
+        self.max_palavra = max_palavra
+
+    @staticmethod
+    def chave(texto_ers: str) -> str:
+        """Hash do conjunto de ERs, que identifica o autômato no cache."""
+        return CacheAutomatos.chave(texto_ers).hex()
+
+    async def iniciar(self, caminho: str | None = None, host: str = "127.0.0.1", porta: int = 5421) -> asyncio.AbstractServer:
+        """Começa a escutar em um socket Unix (se caminho for dado) ou TCP."""
+        if caminho is not None:
+            return await asyncio.start_unix_server(self.atender, path=caminho)
+        return await asyncio.start_server(self.atender, host, porta)
+
+    async def atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        """Atende as requisições de uma conexão até o cliente fechá-la."""
+        try:
+            while True:
+                cabecalho = await leitor.readline()
+                if not cabecalho:
+                    break
+                partes = cabecalho.split()
+                if len(partes) != 2 or partes[0] != b"TOKENIZAR":
+                    raise ValueError(f"Requisição inválida: {cabecalho!r}")
+                texto_ers = (await leitor.readexactly(int(partes[1]))).decode()
+                await self.tokenizar(texto_ers, leitor, escritor)
+                escritor.write(b"FIM\n")
+                await escritor.drain()
+        except Exception as erro:
+            escritor.write(f"ERRO {erro}\n".encode())
+        finally:
+            try:
+                await escritor.drain()
+            except ConnectionError:
+                pass
+            escritor.close()
+
+    async def tokenizar(self, texto_ers: str, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        """Lê o texto fonte em blocos, envia lotes de palavras completas ao pool
+            e escreve os tokens na ordem do texto, com no máximo max_lotes
+            lotes em andamento."""
+        laco = asyncio.get_running_loop()
+        chave = ServidorLexico.chave(texto_ers)
+        pendentes = deque()
+        buffer = b""
+        while True:
+            tamanho = int(await leitor.readline())
+            fim = tamanho == 0
+            if not fim:
+                buffer += await leitor.readexactly(tamanho)
+            if len(buffer) < self.tamanho_lote and not fim:
+                continue
+            # Só envia palavras completas (os tokens são separados por
+            # espaços): corta no último espaço e o resto espera o próximo bloco
+            corte = len(buffer) if fim else max(buffer.rfind(espaco) for espaco in ESPACOS) + 1
+            if corte == 0 and len(buffer) > self.max_palavra:
+                raise ValueError(f"Palavra com mais de {self.max_palavra} bytes")
+            if corte > 0:
+                texto = buffer[:corte].decode()
+                buffer = buffer[corte:]
+                # Só a chave vai para o trabalhador; o texto das ERs é
+                # reenviado apenas se ele não tiver o autômato
+                pendentes.append((texto, laco.run_in_executor(self.executor, _tokenizar_lote, chave, None, texto)))
+            while pendentes and (fim or len(pendentes) >= self.max_lotes or pendentes[0][1].done()):
+                texto, tarefa = pendentes.popleft()
+                resposta = await tarefa
+                if resposta is None:
+                    resposta = await laco.run_in_executor(self.executor, _tokenizar_lote, chave, texto_ers, texto)
+                escritor.write(resposta.encode())
+                await escritor.drain()
+            if fim:
+                return
+
+    def fechar(self) -> None:
+        """Encerra o pool de processos."""
+        self.executor.shutdown()
+
+async def tokenizar_remoto(texto_ers: str, linhas, caminho: str | None = None, host: str = "127.0.0.1", porta: int = 5421):
+    """Cliente simples: envia as ERs e as linhas do texto ao servidor e gera
+        os tokens (lexema, padrão) recebidos."""
+    if caminho is not None:
+        leitor, escritor = await asyncio.open_unix_connection(caminho)
+    else:
+        leitor, escritor = await asyncio.open_connection(host, porta)
+
+    async def enviar():
+        ers = texto_ers.encode()
+        escritor.write(b"TOKENIZAR %d\n" % len(ers) + ers)
+        for linha in linhas:
+            dados = linha.encode()
+            escritor.write(b"%d\n" % len(dados) + dados)
+            await escritor.drain()
+        escritor.write(b"0\n")
+        await escritor.drain()
+
+    envio = asyncio.create_task(enviar())
+    try:
+        while True:
+            linha = (await leitor.readline()).decode()
+            if linha == "FIM\n":
+                break
+            if not linha or linha.startswith("ERRO "):
+                raise RuntimeError(linha.strip() or "Conexão encerrada pelo servidor")
+            palavra, padrao = linha[1:-2].split(", ", 1)
+            yield palavra, padrao
+        await envio
+    finally:
+        envio.cancel()
+        escritor.close()
+
+async def servir(endereco: str) -> None:
+    servidor = ServidorLexico()
+    if endereco.isdigit():
+        socket = await servidor.iniciar(porta=int(endereco))
+    else:
+        socket = await servidor.iniciar(caminho=endereco)
+    print(f"Servidor léxico escutando em {endereco}")
+    try:
+        async with socket:
+            await socket.serve_forever()
+    finally:
+        servidor.fechar()
+
+def main():
+    # python -m lexico.servidor [porta | caminho/do/socket]
+    endereco = argv[1] if len(argv) > 1 else "5421"
+    asyncio.run(servir(endereco))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterator
+
+class BufferTokens:
+    """Tokens de um texto em colunas: vetores paralelos de inteiros.
+
+    O token i é descrito por três inteiros:
+    - tipo[i]: o id do tipo (padrão) do token, índice em `tipos`; os nomes
+      são guardados uma só vez e cada tipo novo recebe o próximo id;
+    - inicio[i] e fim[i]: o lexema é texto[inicio[i]:fim[i]] (inteiros de
+      64 bits, para textos maiores que 2 GiB).
+
+    Nenhum lexema é copiado: são fatiados do texto só quando pedidos (ver
+    lexema e __iter__). Linha e coluna também não são guardadas; saem de uma
+    busca binária nas posições das quebras de linha, indexadas na primeira
+    consulta. Os vetores não têm objetos Python, então o buffer ocupa 20
+    bytes por token (mais o texto) e é serializado (pickle) como um bloco
+    de bytes por vetor, barato de passar entre processos.
+    """
+
+    __slots__ = ('texto', 'tipos', 'ids', 'tipo', 'inicio', 'fim', '_quebras')
+
+    def __init__(self, texto: str, tipos: list[str] | None = None):
+        self.texto = texto
+        self.tipos: list[str] = []
+        self.ids: dict[str, int] = {}
+        for nome in tipos or ():
+            self.id_tipo(nome)
+        self.tipo = array('i')
+        self.inicio = array('q')
+        self.fim = array('q')
+        self._quebras: array | None = None
+
+    def __len__(self) -> int:
+        return len(self.tipo)
+
+    def id_tipo(self, nome: str) -> int:
+        """Retorna o id do tipo, registrando-o se for novo."""
+        id_tipo = self.ids.get(nome)
+        if id_tipo is None:
+            id_tipo = self.ids[nome] = len(self.tipos)
+            self.tipos.append(nome)
+        return id_tipo
+
+    def lexema(self, indice: int) -> str:
+        """O lexema do token (fatiado do texto)."""
+        return self.texto[self.inicio[indice]:self.fim[indice]]
+
+    def nome_tipo(self, indice: int) -> str:
+        """O nome do tipo (padrão) do token."""
+        return self.tipos[self.tipo[indice]]
+
+    def __getitem__(self, indice: int) -> tuple[str, str]:
+        return self.lexema(indice), self.nome_tipo(indice)
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        """Os tokens como pares (lexema, padrão), criados sob demanda: o
+            buffer pode ser passado a quem espera a saída de
+            AnalisadorLexico.tokenizar (ex: o analisador sintático)."""
+        texto = self.texto
+        tipos = self.tipos
+        for tipo, inicio, fim in zip(self.tipo, self.inicio, self.fim):
+            yield texto[inicio:fim], tipos[tipo]
+
+    def linha_coluna(self, indice: int) -> tuple[int, int]:
+        """Linha e coluna (a partir de 1) do início do token."""
+        if self._quebras is None:
+            quebras = array('q')
+            texto = self.texto
+            posicao = texto.find('\n')
+            while posicao >= 0:
+                quebras.append(posicao)
+                posicao = texto.find('\n', posicao + 1)
+            self._quebras = quebras
+        inicio = self.inicio[indice]
+        linha = bisect_right(self._quebras, inicio)
+        inicio_linha = self._quebras[linha - 1] + 1 if linha else 0
+        return linha + 1, inicio - inicio_linha + 1
+
+    def formatar(self) -> str:
+        """Os tokens no formato de tokens.txt, um "<lexema, padrão>" por linha."""
+        texto = self.texto
+        tipos = self.tipos
+        return "".join(f"<{texto[inicio:fim]}, {tipos[tipo]}>\n"
+                       for tipo, inicio, fim in zip(self.tipo, self.inicio, self.fim))
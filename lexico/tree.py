@@ -2,7 +2,6 @@
 Funcões para transformar expressões regulares em autômatos finitos determinísticos (AFDs)
 '''
 
-from typing import Set, Dict
 from abc import ABC
 # Passo 1: transformar a expressão regular em uma árvore binária
 
@@ -10,7 +9,20 @@ from abc import ABC
 class Node:
     """
     Classe base para os nodos da árvore binária.
+
+    Os nodos são imutáveis e compartilhados (ver Tree.unico): a "árvore" é
+    um DAG em que subexpressões iguais são um único nodo. Por isso as folhas
+    não guardam posição; cada nodo guarda, calculados uma só vez:
+    - tamanho e nullable: o número de posições (ocorrências de folhas) da
+      subexpressão e se ela é anulável, na criação;
+    - first e last: firstpos e lastpos, com as posições relativas ao nodo
+      (0..tamanho-1), só quando pedidos (ver Tree.conjuntos): os nodos que a
+      simplificação descarta nunca os calculam. Numa ocorrência que começa
+      na posição p, a posição relativa i é a posição p + i.
     """
+    # __slots__ evita o dicionário por instância (árvores grandes têm muitos nodos)
+    __slots__ = ('left', 'right', 'value', 'question_mark', 'nullable', 'first', 'last', 'tamanho')
+
     def __init__(self, value):
         self.left = None
         self.right = None
@@ -21,31 +33,65 @@ class Node:
         """
         Verifica se o nodo é nulo.
         """
-        pass
+        return self.nullable
     
     @property
     def last_pos(self):
         """
         Retorna o conjunto lastpos do nodo.
         """
-        pass
+        if self.last is None:
+            Tree.conjuntos(self)
+        return self.last
 
     @property
     def first_pos(self):
         """
         Retorna o conjunto firstpos do nodo.
         """
-        pass
+        if self.first is None:
+            Tree.conjuntos(self)
+        return self.first
 
     def follow_pos(self):
         """
         Retorna o conjunto followpos do nodo.
         """
+        return Tree.posicoes(self)[1]
+
+    def calcular_conjuntos(self):
+        """
+        Calcula first e last a partir dos filhos (já calculados).
+        """
         pass
 
 class Tree(ABC):
     """Classe utilitária abstrata (não instanciável) para métodos estáticos relacionados a árvores."""
 
+    @staticmethod
+    def unico(nos: dict, classe: type, *argumentos, question_mark: bool = False) -> Node:
+        """Retorna o nodo único com essa estrutura em `nos`, criando-o se
+        necessário (hash-consing). A chave é (classe, filhos ou valor,
+        opcional); os filhos já são únicos, então a identidade deles basta.
+        Nodos iguais são o mesmo objeto, então nullable, firstpos e lastpos
+        são calculados uma vez por subexpressão distinta."""
+        chave = (classe, argumentos, question_mark)
+        node = nos.get(chave)
+        if node is None:
+            node = nos[chave] = classe(*argumentos, question_mark=question_mark)
+        return node
+
+    @staticmethod
+    def opcional(nos: dict, node: Node, question_mark: bool = True) -> Node:
+        """Retorna o nodo igual a `node`, mas opcional (ou não)."""
+        if node.question_mark == question_mark:
+            return node
+        if isinstance(node, LeafNode):
+            return Tree.unico(nos, LeafNode, node.value, question_mark=question_mark)
+        if isinstance(node, (StarNode, PlusNode)):
+            return Tree.unico(nos, type(node), node.child, question_mark=question_mark)
+        return Tree.unico(nos, type(node), node.left, node.right, question_mark=question_mark)
+
     @staticmethod
     def create_tree(er: str) -> Node:
         '''
@@ -68,48 +114,348 @@ class Tree(ABC):
         er = '(' + er + ')' + '#'  # Adiciona o símbolo de fim de palavra
         er = Tree.inserir_concatenacao(er)
         postfix = Tree.to_postfix(er)
-        print("postfix =", postfix)
         stack = []
-        pos = 1
+        nos = {}  # Nodos já criados (ver Tree.unico)
         operadores = set('*+.|?')  # Conjunto de operadores válidos
         for c in postfix:
             if c not in operadores:
-                stack.append(LeafNode(c, pos))
-                pos += 1
+                stack.append(Tree.unico(nos, LeafNode, c))
             elif c == '*':
                 child = stack.pop()
-                stack.append(StarNode(child))
+                stack.append(Tree.unico(nos, StarNode, child))
             elif c == '+':
                 child = stack.pop()
-                stack.append(PlusNode(child))
+                stack.append(Tree.unico(nos, PlusNode, child))
             elif c == '.':
                 right = stack.pop()
                 left = stack.pop()
-                stack.append(ConcatenationNode(left, right))
+                stack.append(Tree.unico(nos, ConcatenationNode, left, right))
             elif c == '|':
                 right = stack.pop()
                 left = stack.pop()
-                stack.append(OrNode(left, right))
+                stack.append(Tree.unico(nos, OrNode, left, right))
             elif c == '?':
                 child = stack.pop()
-                child.question_mark = True  # Marca o nodo como opcional
-                stack.append(child)
-        return stack[0]
+                stack.append(Tree.opcional(nos, child))  # Marca o nodo como opcional
+        return Tree.simplificar(stack[0], nos)
+
+    @staticmethod
+    def simplificar(node: Node, nos: dict | None = None, feitos: dict | None = None) -> Node:
+        """
+        Reescreve a árvore da ER em uma equivalente com menos posições:
+        - fechos aninhados viram um só: ((a|b)*)*, (x?)*, (x*)+ -> (..)*;
+          (x+)+ -> x+; e (x?)+ -> x*;
+        - alternativas repetidas são removidas;
+        - alternativas com prefixo comum são fatoradas à esquerda:
+          (while|where|when) -> wh(ile|e(re|n));
+        - alternativas de um só caractere viram uma única folha com o
+          conjunto de caracteres: (a|b|c) -> [abc] (uma posição).
+        Os nodos novos vêm de `nos` (ver Tree.unico), e cada nodo
+        compartilhado é simplificado uma só vez (`feitos`).
+        """
+        if nos is None:
+            nos = {}
+        if feitos is None:
+            feitos = {}
+        pronto = feitos.get(node)
+        if pronto is None:
+            pronto = feitos[node] = Tree._simplificar(node, nos, feitos)
+        return pronto
 
+    @staticmethod
+    def _simplificar(node: Node, nos: dict, feitos: dict) -> Node:
+        if isinstance(node, LeafNode):
+            return node
+        if isinstance(node, (StarNode, PlusNode)):
+            child = Tree.simplificar(node.child, nos, feitos)
+            star = isinstance(node, StarNode) or node.question_mark
+            while True:
+                if child.question_mark:
+                    star = True
+                    child = Tree.opcional(nos, child, False)
+                if isinstance(child, StarNode):
+                    star = True
+                    child = child.child
+                elif isinstance(child, PlusNode):
+                    child = child.child
+                else:
+                    break
+            if star or child.is_nullable:
+                return Tree.unico(nos, StarNode, child)
+            return Tree.unico(nos, PlusNode, child)
+        if isinstance(node, ConcatenationNode):
+            return Tree.unico(nos, ConcatenationNode, Tree.simplificar(node.left, nos, feitos),
+                              Tree.simplificar(node.right, nos, feitos), question_mark=node.question_mark)
+
+        # Alternância: junta as alternativas de OrNodes encadeados
+        alternativas = []
+        pilha = [node.left, node.right]
+        while pilha:
+            filho = pilha.pop()
+            if isinstance(filho, OrNode) and not filho.question_mark:
+                pilha.append(filho.right)
+                pilha.append(filho.left)
+            else:
+                alternativas.append(Tree.simplificar(filho, nos, feitos))
+        novo = Tree._alternar(nos, alternativas)
+        if node.question_mark:
+            novo = Tree.opcional(nos, novo)
+        return novo
+
+    @staticmethod
+    def _alternar(nos: dict, alternativas: list[Node]) -> Node:
+        """Monta a alternância simplificada de nodos já simplificados."""
+        # 1. Remove repetidas
+        unicas = {}
+        for alternativa in alternativas:
+            unicas.setdefault(Tree._chave(alternativa), alternativa)
+
+        # 2. Fatora prefixos comuns (as alternativas como sequências de concatenação)
+        grupos: dict[tuple, list[list[Node]]] = {}
+        for alternativa in unicas.values():
+            sequencia = Tree._sequencia(alternativa)
+            grupos.setdefault(Tree._chave(sequencia[0]), []).append(sequencia)
+        fatoradas = []
+        for grupo in grupos.values():
+            if len(grupo) == 1:
+                fatoradas.append(Tree._concatenar(nos, grupo[0]))
+                continue
+            tamanho = 1
+            while all(len(s) > tamanho for s in grupo) and \
+                    len({Tree._chave(s[tamanho]) for s in grupo}) == 1:
+                tamanho += 1
+            restos = [s[tamanho:] for s in grupo]
+            opcional = any(not resto for resto in restos)
+            sufixo = Tree._alternar(nos, [Tree._concatenar(nos, resto) for resto in restos if resto])
+            if opcional:
+                sufixo = Tree.opcional(nos, sufixo)
+            fatoradas.append(Tree._concatenar(nos, grupo[0][:tamanho] + [sufixo]))
+
+        # 3. Junta as alternativas de um só caractere num conjunto
+        caracteres = []
+        resultado = []
+        for alternativa in fatoradas:
+            if isinstance(alternativa, LeafNode) and not alternativa.question_mark and alternativa.value != '#':
+                valor = alternativa.value
+                caracteres.extend(valor if isinstance(valor, frozenset) else (valor,))
+            else:
+                resultado.append(alternativa)
+        if caracteres:
+            conjunto = frozenset(caracteres)
+            valor = next(iter(conjunto)) if len(conjunto) == 1 else conjunto
+            resultado.insert(0, Tree.unico(nos, LeafNode, valor))
+
+        novo = resultado[0]
+        for alternativa in resultado[1:]:
+            novo = Tree.unico(nos, OrNode, novo, alternativa)
+        return novo
+
+    @staticmethod
+    def _sequencia(node: Node) -> list[Node]:
+        """Lista os fatores de uma concatenação (sem opcionais) em ordem."""
+        sequencia = []
+        pilha = [node]
+        while pilha:
+            atual = pilha.pop()
+            if isinstance(atual, ConcatenationNode) and not atual.question_mark:
+                pilha.append(atual.right)
+                pilha.append(atual.left)
+            else:
+                sequencia.append(atual)
+        return sequencia
+
+    @staticmethod
+    def _concatenar(nos: dict, sequencia: list[Node]) -> Node:
+        """Concatena uma lista (não vazia) de nodos."""
+        novo = sequencia[0]
+        for node in sequencia[1:]:
+            novo = Tree.unico(nos, ConcatenationNode, novo, node)
+        return novo
+
+    @staticmethod
+    def _chave(node) -> tuple:
+        """Chave estrutural de um nodo (ou de uma sequência de nodos): nodos
+        com a mesma chave reconhecem a mesma linguagem."""
+        if isinstance(node, list):
+            return ('.',) + tuple(Tree._chave(n) for n in node)
+        if isinstance(node, LeafNode):
+            return ('L', node.value, node.question_mark)
+        if isinstance(node, (StarNode, PlusNode)):
+            return (type(node).__name__, Tree._chave(node.child), node.question_mark)
+        if isinstance(node, ConcatenationNode):
+            fatores = Tree._sequencia(node.left) + Tree._sequencia(node.right)
+            return ('.', Tree._chave(fatores), node.question_mark)
+        return ('|', frozenset(Tree._chave(n) for n in (node.left, node.right)), node.question_mark)
 
     @staticmethod
-    def merge_follow(f1: Dict[int, Set[int]], f2: Dict[int, Set[int]]) -> Dict[int, Set[int]]:
+    def posicoes(node: Node) -> tuple[list, dict[int, set[int]]]:
         """
-        Função auxiliar para unir dois dicionários de follow_pos.
+        Numera as posições (0, 1, ...) da esquerda para a direita, uma por
+        ocorrência de folha, e calcula o followpos de todas elas numa só
+        passada iterativa. É só aqui que as posições existem: um nodo
+        compartilhado é percorrido uma vez por ocorrência, com o deslocamento
+        da ocorrência, mas seus first/last são calculados uma só vez.
+
+        Returns:
+            (list, dict[int, set[int]]): o símbolo (ou conjunto de símbolos)
+            de cada posição e o followpos de cada posição que tem seguintes.
         """
-        merged = dict(f1)  # cópia
-        for k, v in f2.items():
-            if k in merged:
-                merged[k] |= v
+        Tree.conjuntos(node)
+        simbolos = [None] * node.tamanho
+        follow: dict[int, set[int]] = {}
+        pilha = [(node, 0)]
+        while pilha:
+            atual, base = pilha.pop()
+            if isinstance(atual, LeafNode):
+                simbolos[base] = atual.value
+            elif isinstance(atual, (StarNode, PlusNode)):
+                # lastpos(filho) -> firstpos(filho)
+                child = atual.child
+                primeiros = [base + p for p in child.first]
+                for p in child.last:
+                    follow.setdefault(base + p, set()).update(primeiros)
+                pilha.append((child, base))
             else:
-                merged[k] = set(v)
-        return merged
-    
+                meio = base + atual.left.tamanho
+                if isinstance(atual, ConcatenationNode):
+                    # lastpos(esquerda) -> firstpos(direita)
+                    primeiros = [meio + p for p in atual.right.first]
+                    for p in atual.left.last:
+                        follow.setdefault(base + p, set()).update(primeiros)
+                pilha.append((atual.right, meio))
+                pilha.append((atual.left, base))
+        return simbolos, follow
+
+    @staticmethod
+    def conjuntos(node: Node) -> None:
+        """Calcula first e last dos nodos do DAG que ainda não os têm, dos
+        filhos para os pais (iterativo, cada nodo único uma vez)."""
+        pilha = [node]
+        while pilha:
+            atual = pilha[-1]
+            if atual.first is not None:
+                pilha.pop()
+                continue
+            if isinstance(atual, (StarNode, PlusNode)):
+                pendentes = [atual.child] if atual.child.first is None else []
+            else:
+                pendentes = [filho for filho in (atual.left, atual.right) if filho.first is None]
+            if pendentes:
+                pilha.extend(pendentes)
+            else:
+                pilha.pop()
+                atual.calcular_conjuntos()
+
+    @staticmethod
+    def prefixos(node: Node, limite: int = 64, tamanho: int = 8) -> set[str] | None:
+        """
+        Extrai literais obrigatórios do início da ER: um conjunto de textos
+        tal que toda palavra (não vazia) da ER começa com um deles. Serve de
+        pré-filtro na busca (ver lexico/busca.py): o AFD só precisa rodar
+        onde um desses textos aparece.
+
+        Cada nodo dá pares (texto, exato): exato se o texto é uma palavra
+        inteira do nodo (numa concatenação, é estendido pelos prefixos do
+        nodo seguinte); senão, é só o começo de palavras. Os textos são
+        cortados em `tamanho` caracteres.
+
+        Returns:
+            set[str] | None: os prefixos, ou None se não houver um conjunto
+            útil (ER anulável, início que pode ser vazio ou mais de `limite`
+            prefixos).
+        """
+        feitos: dict[Node, frozenset | None] = {}
+
+        def extrair(atual: Node) -> frozenset | None:
+            if atual in feitos:
+                return feitos[atual]
+            if isinstance(atual, LeafNode):
+                if atual.value == '#':
+                    pares = {('', True)}
+                elif isinstance(atual.value, frozenset):
+                    pares = {(c, True) for c in atual.value}
+                else:
+                    pares = {(atual.value, True)}
+            elif isinstance(atual, (StarNode, PlusNode)):
+                filho = extrair(atual.child)
+                # Depois de uma repetição pode vir outra: os textos deixam de ser exatos
+                pares = None if filho is None else {(texto, False) for texto, _ in filho}
+                if pares is not None and isinstance(atual, StarNode):
+                    pares.add(('', True))
+            elif isinstance(atual, OrNode):
+                esquerda, direita = extrair(atual.left), extrair(atual.right)
+                pares = None if esquerda is None or direita is None else set(esquerda) | set(direita)
+            else:
+                esquerda = extrair(atual.left)
+                direita = extrair(atual.right) if esquerda is not None else None
+                pares = set()
+                if esquerda is not None:
+                    for texto, exato in esquerda:
+                        if not exato:
+                            pares.add((texto, False))
+                        elif direita is None:
+                            # Não se sabe o que vem depois: só o início vale
+                            pares.add((texto, False))
+                        else:
+                            for continuacao, continuacao_exata in direita:
+                                pares.add((texto + continuacao, continuacao_exata))
+                else:
+                    pares = None
+            if pares is not None:
+                if atual.question_mark:
+                    pares.add(('', True))
+                cortados = set()
+                for texto, exato in pares:
+                    if len(texto) > tamanho:
+                        texto, exato = texto[:tamanho], False
+                    if texto == '' and not exato:
+                        # Começo sem nenhum literal: nada a filtrar
+                        cortados = None
+                        break
+                    cortados.add((texto, exato))
+                pares = None if cortados is None or len(cortados) > limite else frozenset(cortados)
+            feitos[atual] = pares
+            return pares
+
+        pares = extrair(node)
+        if pares is None or any(texto == '' for texto, _ in pares):
+            return None
+        return {texto for texto, _ in pares}
+
+    @staticmethod
+    def _deslocar(posicoes: frozenset, deslocamento: int) -> frozenset:
+        """Soma o deslocamento a cada posição relativa do conjunto."""
+        return frozenset([p + deslocamento for p in posicoes])
+
+    @staticmethod
+    def literais(er: str) -> list[str] | None:
+        """
+        Se a ER (já expandida) for apenas uma alternância de palavras literais,
+        como "(while|for|if)", retorna a lista de palavras; caso contrário,
+        retorna None. Essas ERs não precisam da árvore: viram direto um AFD
+        mínimo (ver AnalisadorLexico.gerar_afd_literais).
+        """
+        # Remove parênteses externos que envolvem a expressão inteira
+        while er.startswith('(') and er.endswith(')'):
+            profundidade = 0
+            for i, c in enumerate(er):
+                if c == '(':
+                    profundidade += 1
+                elif c == ')':
+                    profundidade -= 1
+                    if profundidade == 0 and i < len(er) - 1:
+                        break
+            else:
+                er = er[1:-1]
+                continue
+            break
+        palavras = er.split('|')
+        especiais = set('*+.|?()#')
+        for palavra in palavras:
+            if not palavra or any(c in especiais for c in palavra):
+                return None
+        return palavras
+
     @staticmethod
     def inserir_concatenacao(er: str) -> str:
         """
@@ -160,189 +506,96 @@ class ConcatenationNode(Node):
     """
     Nodo de concatenação.
     """
-    def __init__(self, left: Node, right: Node, nullable: bool = False):
-        # super().__init__('concat') ?
+    __slots__ = ()
+
+    def __init__(self, left: Node, right: Node, question_mark: bool = False):
         self.left = left
         self.right = right
-        self.null = nullable
-        self.question_mark = False  # Para indicar se é opcional (usado em ERs como a? ou b?)
-    
-    @property
-    def is_nullable(self):
-        return (self.left.is_nullable and self.right.is_nullable) or self.question_mark
-    
-    @property
-    def last_pos(self):
-        # Conferir
-        if self.right.is_nullable:
-            return self.left.last_pos.union(self.right.last_pos)
-        return self.right.last_pos
-    
-
-    @property
-    def first_pos(self):
-        # Conferir
-        if self.left.is_nullable:
-            return self.left.first_pos.union(self.right.first_pos)
-        return self.left.first_pos
+        self.question_mark = question_mark  # Para indicar se é opcional (usado em ERs como a? ou b?)
+        self.tamanho = left.tamanho + right.tamanho
+        self.nullable = (left.nullable and right.nullable) or question_mark
+        self.first = self.last = None
 
-    def follow_pos(self):
-        """
-        Retorna o conjunto followpos do nodo de concatenação.
-        Regra: Para cada posição i em lastpos(left), adicionamos firstpos(right) ao followpos(i)
-        Além disso, unimos com os followpos dos filhos.
-        """
-        follow = {}
-        
-        # 1. Unir os followpos dos filhos
-        left_follow = self.left.follow_pos()
-        right_follow = self.right.follow_pos()
-        follow = Tree.merge_follow(left_follow, right_follow)
-        
-        # 2. Adicionar as regras específicas de concatenação
-        # Para cada posição em lastpos do filho esquerdo, adicionamos firstpos do filho direito
-        for pos in self.left.last_pos:
-            if pos in follow:
-                follow[pos].update(self.right.first_pos)
-            else:
-                follow[pos] = set(self.right.first_pos)
-        
-        return follow
+    def calcular_conjuntos(self):
+        left, right = self.left, self.right
+        first = left.first
+        if left.nullable:
+            first = first | Tree._deslocar(right.first, left.tamanho)
+        last = Tree._deslocar(right.last, left.tamanho)
+        if right.nullable:
+            last = left.last | last
+        self.first = first
+        self.last = last
 
 class OrNode(Node):
     """
     Nodo de alternância (ou) (|)
     """
-    def __init__(self, left: Node, right: Node):
-        # super().__init__('or') ?
+    __slots__ = ()
+
+    def __init__(self, left: Node, right: Node, question_mark: bool = False):
         self.left = left
         self.right = right
-        self.question_mark = False  # Para indicar se é opcional (usado em ERs como a? ou b?)
-    
-    @property
-    def is_nullable(self):
-        return self.left.is_nullable or self.right.is_nullable or self.question_mark
-    
-    @property
-    def last_pos(self):
-        # Conferir
-        return self.left.last_pos.union(self.right.last_pos)
-
-    @property
-    def first_pos(self):
-        # Conferir
-        return self.left.first_pos.union(self.right.first_pos)
-    
-    def follow_pos(self):
-        """
-        Retorna o conjunto followpos do nodo de alternância.
-        """
-        return Tree.merge_follow(self.left.follow_pos(), self.right.follow_pos())
+        self.question_mark = question_mark  # Para indicar se é opcional (usado em ERs como a? ou b?)
+        self.tamanho = left.tamanho + right.tamanho
+        self.nullable = left.nullable or right.nullable or question_mark
+        self.first = self.last = None
 
+    def calcular_conjuntos(self):
+        left, right = self.left, self.right
+        self.first = left.first | Tree._deslocar(right.first, left.tamanho)
+        self.last = left.last | Tree._deslocar(right.last, left.tamanho)
 
 class StarNode(Node):
     """
     Nodo de estrela (zero ou mais). (*)
     """
-    def __init__(self, child: Node):
-        # super().__init__('star') ?
+    __slots__ = ('child',)
+
+    def __init__(self, child: Node, question_mark: bool = False):
         self.child = child
-        self.question_mark = False  # Para indicar se é opcional (usado em ERs como a? ou b?)
-    
-    @property
-    def is_nullable(self):
-        return True # Conferir
-    
-    @property
-    def last_pos(self):
-        # Conferir
-        return self.child.last_pos
-    @property
-    def first_pos(self):
-        # Conferir
-        return self.child.first_pos
+        self.question_mark = question_mark  # Para indicar se é opcional (usado em ERs como a? ou b?)
+        self.tamanho = child.tamanho
+        self.nullable = True
+        self.first = self.last = None
 
-    def follow_pos(self):
-        """
-        Retorna o conjunto followpos do nodo de estrela.
-        Regra: Para cada posição i em lastpos(child), adicionamos firstpos(child) ao followpos(i).
-        Além disso, herdamos os followpos do nó filho.
-        """
-        follow = self.child.follow_pos()  # Herda os followpos do filho
-        
-        # Adiciona a regra do operador *: lastpos(child) -> firstpos(child)
-        for pos in self.child.last_pos:
-            if pos in follow:
-                follow[pos].update(self.child.first_pos)  # Adiciona firstpos(child) ao followpos(pos)
-            else:
-                follow[pos] = set(self.child.first_pos)  # Cria novo mapeamento
-        
-        return follow
+    def calcular_conjuntos(self):
+        self.first = self.child.first
+        self.last = self.child.last
 
 class PlusNode(Node):
     """
     Nodo de mais (um ou mais). (+)
     """
-    def __init__(self, child: Node):
-        # super().__init__('plus') ?
-        self.child = child
-        self.question_mark = False  # Para indicar se é opcional (usado em ERs como a? ou b?)
-    
-    @property
-    def is_nullable(self):
-        return self.question_mark # Conferir
-    
-    @property
-    def last_pos(self):
-        # Implementar
-        return self.child.last_pos
+    __slots__ = ('child',)
 
-    @property
-    def first_pos(self):
-        # Implementar
-        return self.child.first_pos
+    def __init__(self, child: Node, question_mark: bool = False):
+        self.child = child
+        self.question_mark = question_mark  # Para indicar se é opcional (usado em ERs como a? ou b?)
+        self.tamanho = child.tamanho
+        # x+ é anulável se x for (ex: (a*)+ aceita a palavra vazia)
+        self.nullable = child.nullable or question_mark
+        self.first = self.last = None
 
-    def follow_pos(self):
-        """
-        Retorna o conjunto followpos do nodo de estrela.
-        Regra: Para cada posição i em lastpos(child), adicionamos firstpos(child) ao followpos(i).
-        Além disso, herdamos os followpos do nó filho.
-        """
-        follow = self.child.follow_pos()  # Herda os followpos do filho
-        
-        # Adiciona a regra do operador *: lastpos(child) -> firstpos(child)
-        for pos in self.child.last_pos:
-            if pos in follow:
-                follow[pos].update(self.child.first_pos)  # Adiciona firstpos(child) ao followpos(pos)
-            else:
-                follow[pos] = set(self.child.first_pos)  # Cria novo mapeamento
-        
-        return follow
+    def calcular_conjuntos(self):
+        self.first = self.child.first
+        self.last = self.child.last
 
 class LeafNode(Node):
     """
-    Nodo folha (caractere).
+    Nodo folha (caractere, ou conjunto de caracteres).
     """
-    def __init__(self, value, position, nullable=False):
-        # super().__init__(value) ?
-        self.value = value
-        self.null = nullable
-        self.position = position
-        self.question_mark = False
-
-    @property
-    def is_nullable(self):
-        return self.question_mark
-    
-    @property
-    def last_pos(self):
-        return {self.position}
+    __slots__ = ()
 
-    @property
-    def first_pos(self):
-        return {self.position}
+    # Toda folha ocupa uma só posição (a relativa 0)
+    _POSICAO = frozenset((0,))
 
-    def follow_pos(self):
-        return {}   
+    def __init__(self, value, question_mark: bool = False):
+        self.value = value
+        self.question_mark = question_mark
+        self.tamanho = 1
+        self.nullable = question_mark
+        self.first = LeafNode._POSICAO
+        self.last = LeafNode._POSICAO
 
 # Passo 2: transformar a árvore binária em um autômato finito determinístico (AFD)
@@ -1,18 +1,37 @@
 from sys import argv
 from lexico.analisador_lexico import AnalisadorLexico
+from lexico import busca, lote
+from pipeline import Pipeline
 
 def main():
-    if len(argv) != 3:
-        print("Uso: python main.py <entrada.txt> <saida.txt>")
+    if len(argv) > 1 and argv[1] == "--lote":
+        # Vários arquivos fonte com um único AFD compilado (ver lexico/lote.py)
+        lote.main(argv[2:])
+        return
+    if len(argv) > 1 and argv[1] == "--busca":
+        # Busca dos padrões em qualquer posição dos arquivos (ver lexico/busca.py)
+        busca.main(argv[2:])
+        return
+
+    if len(argv) not in (3, 4):
+        print("Uso: python main.py <entrada.txt> <saida.txt> [gramatica.txt]")
+        print("     python main.py --lote <entrada.txt> <arquivos ou globs...> [--lista L] [--saida PASTA | --unico ARQUIVO] [--processos N]")
+        print("     python main.py --busca <entrada.txt> <arquivos...> [--padrao P] [--contar]")
         return
     
-    if not argv[1].endswith('.txt') or not argv[2].endswith('.txt'):
+    if not all(arquivo.endswith('.txt') for arquivo in argv[1:]):
         print("Os arquivos de entrada e saída devem ter a extensão .txt")
         return
     
     entrada = argv[1]
     saida = argv[2]
 
+    if len(argv) == 4:
+        # Análise léxica e sintática em fluxo, sem gerar tokens.txt
+        aceito, posicao = Pipeline(entrada, argv[3]).executar(saida)
+        print(f"Entrada aceita? {'Sim' if aceito else f'Não (erro no token {posicao})'}")
+        return
+
     analisador = AnalisadorLexico(entrada, saida)
     analisador.analisar()
 
@@ -0,0 +1,135 @@
+import multiprocessing
+import queue
+import threading
+from collections.abc import Iterator
+from lexico.afd import AFD
+from lexico.analisador_lexico import AnalisadorLexico
+from sintatico.analisador_sintatico import AnalisadorSintatico
+from sintatico.ll1 import AnalisadorLL1
+
+MODOS = ("direto", "thread", "processo")
+
+def _produzir(automato: AFD, codigo_fonte: str, fila, tamanho_lote: int, parar) -> None:
+    """Produtor: tokeniza o arquivo e envia os tokens em lotes para a fila.
+
+        A fila é limitada, então o produtor fica bloqueado enquanto o
+        consumidor não liberar espaço (backpressure). Se `parar` for
+        sinalizado (o analisador sintático terminou antes do fim da entrada),
+        a leitura é interrompida. Ao final, sempre envia None; um erro é
+        enviado como a própria exceção.
+    """
+    try:
+        with open(codigo_fonte, 'r') as arquivo:
+            lote = []
+            for token in AnalisadorLexico.tokenizar(automato, arquivo):
+                lote.append(token)
+                if len(lote) == tamanho_lote:
+                    if parar.is_set():
+                        break
+                    fila.put(lote)
+                    lote = []
+            else:
+                if lote:
+                    fila.put(lote)
+    except Exception as erro:
+        fila.put(erro)
+        return
+    fila.put(None)
+
+class Pipeline:
+    """Análise léxica e sintática em fluxo, sem armazenamento intermediário.
+
+    O scanner (AnalisadorLexico.tokenizar) é um gerador que alimenta
+    diretamente o analisador LR, um token de cada vez. Opcionalmente, o
+    scanner roda em outra thread ou outro processo, ligado ao analisador
+    por uma fila limitada de lotes de tokens.
+    """
+
+    def __init__(self, arquivo_ers: str, arquivo_gramatica: str, metodo: str = "lalr", pasta_cache: str = "tabelas"):
+        self.arquivo_ers = arquivo_ers
+        self.arquivo_gramatica = arquivo_gramatica
+        self.metodo = metodo
+        self.pasta_cache = pasta_cache
+        self.automato: AFD = None
+        # "ll1" usa o analisador preditivo (sem coleção canônica LR)
+        self.analisador = AnalisadorLL1() if metodo == "ll1" else AnalisadorSintatico()
+
+    def preparar(self) -> None:
+        """Compila o AFD das ERs e carrega (ou gera) as tabelas LR (ou LL(1))."""
+        self.automato = AnalisadorLexico(self.arquivo_ers, None).compilar(salvar_arquivos=False)
+        if self.metodo == "ll1":
+            self.analisador.gerar_tabela(self.arquivo_gramatica)
+        else:
+            self.analisador.carregar_tabela(self.arquivo_gramatica, self.metodo, self.pasta_cache)
+
+    def executar(self, codigo_fonte: str, modo: str = "direto", tamanho_lote: int = 512, max_lotes: int = 8) -> tuple[bool, int]:
+        """Analisa o arquivo fonte em fluxo.
+
+            Args:
+                codigo_fonte (str): arquivo com o texto a ser analisado.
+                modo (str): "direto" (mesma thread), "thread" ou "processo".
+                tamanho_lote (int): tokens por lote enviado pela fila.
+                max_lotes (int): capacidade da fila, em lotes.
+
+            Returns:
+                (bool, int): o mesmo retorno de AnalisadorSintatico.analisar.
+        """
+        if modo not in MODOS:
+            raise ValueError(f"Modo inválido: {modo} (esperado um de {MODOS})")
+        if self.automato is None:
+            self.preparar()
+
+        if modo == "direto":
+            with open(codigo_fonte, 'r') as arquivo:
+                return self.analisador.analisar(AnalisadorLexico.tokenizar(self.automato, arquivo))
+
+        if modo == "thread":
+            fila = queue.Queue(maxsize=max_lotes)
+            parar = threading.Event()
+            produtor = threading.Thread(target=_produzir, args=(self.automato, codigo_fonte, fila, tamanho_lote, parar), daemon=True)
+        else:
+            fila = multiprocessing.Queue(maxsize=max_lotes)
+            parar = multiprocessing.Event()
+            produtor = multiprocessing.Process(target=_produzir, args=(self.automato, codigo_fonte, fila, tamanho_lote, parar), daemon=True)
+
+        fim = [False]
+        produtor.start()
+        try:
+            return self.analisador.analisar(Pipeline._consumir(fila, fim))
+        finally:
+            if not fim[0]:
+                # O analisador parou antes do fim: avisa o produtor e esvazia
+                # a fila até o None final, para que ele não fique bloqueado.
+                parar.set()
+                while True:
+                    lote = fila.get()
+                    if lote is None or isinstance(lote, BaseException):
+                        break
+            produtor.join()
+
+    @staticmethod
+    def _consumir(fila, fim: list) -> Iterator[tuple[str, str]]:
+        """Gera os tokens dos lotes recebidos pela fila, até o None final.
+
+            Marca fim[0] ao receber o último item (None ou uma exceção do
+            produtor, que é relançada aqui).
+        """
+        while True:
+            lote = fila.get()
+            if lote is None:
+                fim[0] = True
+                return
+            if isinstance(lote, BaseException):
+                fim[0] = True
+                raise lote
+            yield from lote
+
+def main():
+    pipeline = Pipeline("entradas/ers/ers.txt", "entradas/gramaticas/exemplo.txt")
+    pipeline.preparar()
+    for modo in MODOS:
+        aceito, posicao = pipeline.executar("entradas/codigos/expressao.txt", modo)
+        print(f"[{modo}] aceita? {'Sim' if aceito else f'Não (erro no token {posicao})'}")
+
+if __name__ == "__main__":
+    main()
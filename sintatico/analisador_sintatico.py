@@ -1,13 +1,197 @@
+from array import array
+from collections.abc import Iterable
 from sintatico.gramatica import Gramatica
 from sintatico.canonico import Canonico
+from sintatico.tabela import TabelaLR, TabelaComprimida
+from sintatico.cache import CacheTabelas
+from sintatico.arvore import ArvoreSintatica
 
 class AnalisadorSintatico:
+    """Analisador sintático LR dirigido por tabela (SLR ou LALR(1)).
+
+    Consome os tokens (lexema, padrão) gerados pelo AnalisadorLexico. O
+    padrão do token é usado como terminal quando é um terminal da gramática
+    (ex: 'id', 'num'); caso contrário, usa-se o próprio lexema (ex: '+', '(').
+    """
 
     def __init__(self):
-        pass
+        self.tabela: TabelaComprimida = None
+        # Pilha de estados pré-alocada (cresce dobrando, se necessário)
+        self.pilha = array('i', bytes(4 * 1024))
     
-    def gerar_tabela(self, caminho_gramatica):
+    def gerar_tabela(self, caminho_gramatica, metodo: str = "slr") -> TabelaLR:
+        """Gera as tabelas ACTION/GOTO da gramática e prepara o analisador.
+
+            Args:
+                caminho_gramatica (str): arquivo da gramática.
+                metodo (str): "slr" ou "lalr".
+
+            Returns:
+                TabelaLR: as tabelas geradas (com eventuais conflitos).
+        """
         g = Gramatica.de_arquivo(caminho_gramatica)
         colecao = Canonico.colecao_canonica(g)
-        tabela = colecao.gerar_tabela()
-        return tabela
\ No newline at end of file
+        if metodo == "lalr":
+            tabela = colecao.gerar_tabela_lalr()
+        else:
+            tabela = colecao.gerar_tabela()
+        self.tabela = tabela.achatar().comprimir()
+        return tabela
+
+    def carregar_tabela(self, caminho_gramatica, metodo: str = "slr", pasta_cache: str = "tabelas") -> TabelaComprimida:
+        """Prepara o analisador usando o cache em disco: se já houver tabelas
+            geradas para este conteúdo de gramática (e método), elas são
+            mapeadas do arquivo; caso contrário, são geradas e gravadas.
+
+            Args:
+                caminho_gramatica (str): arquivo da gramática.
+                metodo (str): "slr" ou "lalr".
+                pasta_cache (str): pasta dos arquivos de cache.
+
+            Returns:
+                TabelaComprimida: as tabelas em uso.
+        """
+        chave = CacheTabelas.chave(caminho_gramatica, metodo)
+        caminho = CacheTabelas.caminho(chave, pasta_cache)
+        tabela = CacheTabelas.carregar(caminho, chave)
+        if tabela is None:
+            self.gerar_tabela(caminho_gramatica, metodo)
+            CacheTabelas.salvar(self.tabela, chave, caminho)
+        else:
+            self.tabela = tabela
+        return self.tabela
+
+    def analisar(self, tokens: Iterable[tuple[str, str]]) -> tuple[bool, int]:
+        """Analisa uma sequência de tokens com as tabelas geradas.
+
+            Args:
+                tokens (Iterable[tuple[str, str]]): tokens (lexema, padrão).
+
+            Returns:
+                (bool, int): se a entrada foi aceita e, se não foi, o índice do
+                token onde o erro foi detectado (o número de tokens, se o erro
+                for no fim da entrada).
+        """
+        return self._conduzir(tokens, None)
+
+    def analisar_arvore(self, tokens: Iterable[tuple[str, str]]) -> tuple[bool, int, ArvoreSintatica]:
+        """Analisa a sequência de tokens como analisar(), construindo também
+            a árvore sintática (ver ArvoreSintatica): cada shift acrescenta uma
+            folha e cada redução, um nó com os nós do topo da pilha como filhos.
+
+            Returns:
+                (bool, int, ArvoreSintatica): o retorno de analisar() e a
+                árvore (com raiz definida apenas se a entrada foi aceita).
+        """
+        tabela = self.tabela
+        arvore = ArvoreSintatica(tabela.terminais, tabela.nao_terminais, tabela.producoes)
+        aceito, posicao = self._conduzir(tokens, arvore)
+        return aceito, posicao, arvore
+
+    def _conduzir(self, tokens: Iterable[tuple[str, str]], arvore: ArvoreSintatica | None) -> tuple[bool, int]:
+        """Laço de análise de analisar() e analisar_arvore(): se arvore não
+            for None, também acrescenta a ela uma folha a cada shift e um nó a
+            cada redução (e define a raiz se a entrada for aceita)."""
+        tabela = self.tabela
+        base_acao = tabela.base_acao
+        padrao_acao = tabela.padrao_acao
+        valor_acao = tabela.valor_acao
+        verif_acao = tabela.verif_acao
+        base_desvio = tabela.base_desvio
+        padrao_desvio = tabela.padrao_desvio
+        valor_desvio = tabela.valor_desvio
+        verif_desvio = tabela.verif_desvio
+        cabecas = tabela.cabecas
+        tamanhos = tabela.tamanhos
+        indice_terminal = tabela.indice_terminal
+        fim = indice_terminal['$']
+
+        pilha = self.pilha
+        topo = 0
+        pilha[0] = 0
+        estado = 0
+
+        construir = arvore is not None
+        if construir:
+            folha = arvore.folha
+            reduzir = arvore.reduzir
+            # Nó da árvore de cada posição da pilha de estados
+            nos = array('i', bytes(4 * len(pilha)))
+
+        fluxo = iter(tokens)
+        posicao = 0
+        token = next(fluxo, None)
+        if token is None:
+            terminal = fim
+        else:
+            terminal = indice_terminal.get(token[1])
+            if terminal is None:
+                terminal = indice_terminal.get(token[0], -1)
+
+        while True:
+            if terminal < 0:
+                return False, posicao
+            base = base_acao[estado]
+            i = base + terminal
+            codigo = valor_acao[i] if verif_acao[i] == base else padrao_acao[estado]
+            if codigo > 0:
+                # Shift: o novo estado vai para a pilha e lê o próximo token
+                estado = codigo - 1
+                if construir:
+                    no = folha(terminal, posicao)
+                posicao += 1
+                token = next(fluxo, None)
+                if token is None:
+                    terminal = fim
+                else:
+                    terminal = indice_terminal.get(token[1])
+                    if terminal is None:
+                        terminal = indice_terminal.get(token[0], -1)
+            elif codigo < 0:
+                producao = -codigo - 1
+                if producao == 0:
+                    if construir:
+                        arvore.raiz = nos[topo]
+                    return True, None
+                # Reduce: desempilha o corpo e segue o desvio da cabeça
+                tamanho = tamanhos[producao]
+                cabeca = cabecas[producao]
+                if construir:
+                    # Filhos: os nós do topo da pilha
+                    no = reduzir(producao, cabeca, nos[topo - tamanho + 1:topo + 1], posicao)
+                topo -= tamanho
+                base = base_desvio[cabeca]
+                i = base + pilha[topo]
+                estado = valor_desvio[i] if verif_desvio[i] == base else padrao_desvio[cabeca]
+            else:
+                return False, posicao
+            # Empilha o estado (do shift ou do desvio), crescendo a pilha se
+            # estiver cheia (uma redução vazia também a faz crescer)
+            topo += 1
+            if topo == len(pilha):
+                pilha.extend(pilha)
+                if construir:
+                    nos.extend(nos)
+            pilha[topo] = estado
+            if construir:
+                nos[topo] = no
+
+def main():
+    analisador = AnalisadorSintatico()
+    analisador.gerar_tabela("entradas/gramaticas/exemplo.txt")
+    entradas = [
+        [('x', 'id'), ('+', 'operador'), ('y', 'id'), ('*', 'operador'), ('z', 'id')],
+        [('(', 'abre'), ('x', 'id'), ('+', 'operador'), ('y', 'id'), (')', 'fecha')],
+        [('x', 'id'), ('+', 'operador'), ('*', 'operador')],
+    ]
+    for tokens in entradas:
+        aceito, posicao = analisador.analisar(tokens)
+        texto = ' '.join(lexema for lexema, _ in tokens)
+        print(f"'{texto}' é aceita? {'Sim' if aceito else f'Não (erro no token {posicao})'}")
+
+    tokens = entradas[0]
+    _, _, arvore = analisador.analisar_arvore(tokens)
+    print(arvore.formatar([lexema for lexema, _ in tokens]))
+
+if __name__ == "__main__":
+    main()
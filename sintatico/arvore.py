@@ -0,0 +1,145 @@
+from array import array
+from collections.abc import Iterator
+
+class ArvoreSintatica:
+    """Árvore sintática guardada em vetores paralelos de inteiros (arena).
+
+    Cada nó é um índice nos vetores:
+    - simbolo[n]: o terminal (0..n_terminais-1) ou n_terminais + índice do
+      não terminal;
+    - producao[n]: a produção reduzida (-1 nas folhas);
+    - primeiro_filho[n] e proximo_irmao[n]: os filhos formam uma lista
+      ligada (-1 quando não há);
+    - inicio[n] e fim[n]: os tokens cobertos pelo nó, [inicio, fim).
+
+    São seis inteiros por nó e nenhum objeto Python: vetores de inteiros
+    não são acompanhados pelo coletor de lixo. Os nós são acrescentados
+    durante a análise (folhas nos shifts, nós internos nas reduções), então
+    os filhos sempre têm índices menores que o pai. Para percorrer a árvore,
+    No é uma visão leve criada sob demanda.
+    """
+
+    __slots__ = ('terminais', 'nao_terminais', 'producoes', 'simbolo', 'producao',
+                 'primeiro_filho', 'proximo_irmao', 'inicio', 'fim', 'raiz')
+
+    def __init__(self, terminais: list[str], nao_terminais: list[str], producoes: list[tuple[str, tuple[str, ...]]]):
+        self.terminais = terminais
+        self.nao_terminais = nao_terminais
+        self.producoes = producoes
+        self.simbolo = array('i')
+        self.producao = array('i')
+        self.primeiro_filho = array('i')
+        self.proximo_irmao = array('i')
+        self.inicio = array('i')
+        self.fim = array('i')
+        self.raiz = -1
+
+    def __len__(self) -> int:
+        return len(self.simbolo)
+
+    def folha(self, terminal: int, posicao: int) -> int:
+        """Acrescenta a folha do token na posição dada e retorna seu índice."""
+        self.simbolo.append(terminal)
+        self.producao.append(-1)
+        self.primeiro_filho.append(-1)
+        self.proximo_irmao.append(-1)
+        self.inicio.append(posicao)
+        self.fim.append(posicao + 1)
+        return len(self.simbolo) - 1
+
+    def reduzir(self, producao: int, nao_terminal: int, filhos, posicao: int) -> int:
+        """Acrescenta o nó de uma redução, ligando os filhos (em ordem) como
+            irmãos, e retorna seu índice. Sem filhos (produção vazia), o nó
+            cobre o intervalo vazio na posição atual."""
+        proximo_irmao = self.proximo_irmao
+        anterior = -1
+        for filho in filhos:
+            if anterior >= 0:
+                proximo_irmao[anterior] = filho
+            anterior = filho
+        self.simbolo.append(len(self.terminais) + nao_terminal)
+        self.producao.append(producao)
+        self.proximo_irmao.append(-1)
+        if filhos:
+            self.primeiro_filho.append(filhos[0])
+            self.inicio.append(self.inicio[filhos[0]])
+            self.fim.append(self.fim[filhos[-1]])
+        else:
+            self.primeiro_filho.append(-1)
+            self.inicio.append(posicao)
+            self.fim.append(posicao)
+        return len(self.simbolo) - 1
+
+    def no(self, indice: int | None = None) -> "No":
+        """Visão do nó de índice dado (a raiz, se não for dado)."""
+        return No(self, self.raiz if indice is None else indice)
+
+    def formatar(self, lexemas: list[str] | None = None) -> str:
+        """Representação em texto da árvore, um nó por linha, indentada pela
+            profundidade (iterativa, para árvores profundas)."""
+        linhas = []
+        if self.raiz < 0:
+            return ""
+        pilha = [(self.raiz, 0)]
+        while pilha:
+            indice, nivel = pilha.pop()
+            no = No(self, indice)
+            texto = no.nome
+            if no.folha and lexemas is not None:
+                texto += f" '{lexemas[no.inicio]}'"
+            linhas.append("  " * nivel + texto)
+            filhos = list(no.filhos_indices())
+            pilha.extend((filho, nivel + 1) for filho in reversed(filhos))
+        return "\n".join(linhas)
+
+class No:
+    """Visão de um nó de uma ArvoreSintatica (não guarda dados próprios)."""
+
+    __slots__ = ('arvore', 'indice')
+
+    def __init__(self, arvore: ArvoreSintatica, indice: int):
+        self.arvore = arvore
+        self.indice = indice
+
+    @property
+    def folha(self) -> bool:
+        return self.arvore.producao[self.indice] < 0
+
+    @property
+    def nome(self) -> str:
+        """O terminal ou não terminal do nó."""
+        simbolo = self.arvore.simbolo[self.indice]
+        terminais = self.arvore.terminais
+        if simbolo < len(terminais):
+            return terminais[simbolo]
+        return self.arvore.nao_terminais[simbolo - len(terminais)]
+
+    @property
+    def producao(self) -> tuple[str, tuple[str, ...]] | None:
+        """A produção reduzida no nó (None nas folhas)."""
+        producao = self.arvore.producao[self.indice]
+        return None if producao < 0 else self.arvore.producoes[producao]
+
+    @property
+    def inicio(self) -> int:
+        return self.arvore.inicio[self.indice]
+
+    @property
+    def fim(self) -> int:
+        return self.arvore.fim[self.indice]
+
+    def filhos_indices(self) -> Iterator[int]:
+        """Índices dos filhos, em ordem."""
+        proximo_irmao = self.arvore.proximo_irmao
+        filho = self.arvore.primeiro_filho[self.indice]
+        while filho >= 0:
+            yield filho
+            filho = proximo_irmao[filho]
+
+    @property
+    def filhos(self) -> Iterator["No"]:
+        """Visões dos filhos, em ordem."""
+        return (No(self.arvore, filho) for filho in self.filhos_indices())
+
+    def __repr__(self) -> str:
+        return f"No({self.nome}, [{self.inicio}, {self.fim}))"
@@ -0,0 +1,209 @@
+import math
+import time
+import tracemalloc
+from pathlib import Path
+from sys import argv
+from sintatico.gramatica import Gramatica
+from sintatico.canonico import Canonico
+
+class Benchmark:
+    """Mede como a construção da coleção canônica e das tabelas escala.
+
+    Gera gramáticas sintéticas parametrizadas por um tamanho n (escadas de
+    precedência, listas recursivas à direita e alternativas largas), uma
+    gramática realista de uma mini linguagem e usa também as gramáticas de
+    entradas/gramaticas. Para cada uma, informa estados, itens, conflitos,
+    tempos de construção e pico de memória.
+    """
+
+    COLUNAS = ("gramatica", "n", "prods", "estados", "itens", "confl_slr", "confl_lalr",
+               "first/follow", "colecao", "goto", "slr", "lalr", "total", "pico_kb")
+
+    @staticmethod
+    def escada(n: int) -> Gramatica:
+        """Escada de precedência com n níveis de operadores binários
+            (E0 -> E0 o0 E1 | E1, ..., P -> ( E0 ) | id)."""
+        producoes = {}
+        for i in range(n):
+            proximo = f"E{i + 1}" if i + 1 < n else "P"
+            producoes[f"E{i}"] = [[f"E{i}", f"o{i}", proximo], [proximo]]
+        producoes["P"] = [["(", "E0", ")"], ["id"]]
+        terminais = [f"o{i}" for i in range(n)] + ["(", ")", "id"]
+        return Gramatica(list(producoes), terminais, producoes, "E0")
+
+    @staticmethod
+    def lista_direita(n: int) -> Gramatica:
+        """n listas recursivas à direita encadeadas, cada uma com seu
+            separador (L0 -> x0 s0 L0 | x0 L1, ..., Ln -> fim)."""
+        producoes = {}
+        for i in range(n):
+            proximo = f"L{i + 1}"
+            producoes[f"L{i}"] = [[f"x{i}", f"s{i}", f"L{i}"], [f"x{i}", proximo]]
+        producoes[f"L{n}"] = [["fim"]]
+        terminais = [f"x{i}" for i in range(n)] + [f"s{i}" for i in range(n)] + ["fim"]
+        return Gramatica(list(producoes), terminais, producoes, "L0")
+
+    @staticmethod
+    def alternativa(n: int) -> Gramatica:
+        """Alternativa larga: S -> A S | A, com A escolhendo entre n
+            terminais e n formas entre parênteses."""
+        producoes = {
+            "S": [["A", "S"], ["A"]],
+            "A": [[f"t{i}"] for i in range(n)] + [["(", f"t{i}", "S", ")"] for i in range(n)],
+        }
+        terminais = [f"t{i}" for i in range(n)] + ["(", ")"]
+        return Gramatica(list(producoes), terminais, producoes, "S")
+
+    @staticmethod
+    def mini_linguagem() -> Gramatica:
+        """Gramática de uma pequena linguagem imperativa (blocos, if/else,
+            while, atribuições, chamadas e expressões com precedência)."""
+        texto = "\n".join([
+            "P B C L S D X A O M U F G",
+            "id num ; = { } if else while return ( ) , || && == < + - * / !",
+            "P",
+            "P->L",
+            "B->{ L }|{ }",
+            "L->L C|C",
+            "C->S|if ( X ) C|if ( X ) S else C|while ( X ) C",
+            "S->id = X ;|return X ;|G ;|B|;",
+            "X->X || A|A",
+            "A->A && O|O",
+            "O->M == M|M < M|M",
+            "M->M + U|M - U|U",
+            "U->U * F|U / F|F",
+            "F->! F|- F|( X )|id|num|G",
+            "G->id ( D )|id ( )",
+            "D->D , X|X",
+        ])
+        return Gramatica.de_texto(texto)
+
+    @staticmethod
+    def _construir(gerar) -> dict:
+        """Executa todas as etapas uma vez, medindo o tempo de cada uma."""
+        medidas = {}
+        inicio = time.perf_counter()
+        g = gerar()
+        for simbolo in g.nao_terminais:
+            g.first(simbolo)
+            g.follow(simbolo)
+        medidas["first/follow"] = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        colecao = Canonico.colecao_canonica(g)
+        medidas["colecao"] = time.perf_counter() - inicio
+
+        # GOTO(I, X) completo (com CLOSURE) de cada estado para cada símbolo
+        g_ext = colecao.gramatica
+        itens = [colecao.itens(estado) for estado in range(len(colecao.nucleos))]
+        inicio = time.perf_counter()
+        for (estado, simbolo) in colecao.desvios:
+            Canonico.go_to(itens[estado], g_ext, simbolo)
+        medidas["goto"] = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        slr = colecao.gerar_tabela()
+        medidas["slr"] = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        lalr = colecao.gerar_tabela_lalr()
+        medidas["lalr"] = time.perf_counter() - inicio
+
+        medidas["total"] = sum(medidas.values())
+        medidas["prods"] = len(g.tabela_producoes)
+        medidas["estados"] = len(colecao.nucleos)
+        medidas["itens"] = sum(len(i) for i in itens)
+        medidas["confl_slr"] = len(slr.conflitos)
+        medidas["confl_lalr"] = len(lalr.conflitos)
+        return medidas
+
+    @staticmethod
+    def medir(nome: str, gerar, n: int | str = "-", repeticoes: int = 3) -> dict:
+        """Mede uma gramática: o melhor tempo de cada etapa em algumas
+            repetições e, numa execução separada com tracemalloc (que deixa
+            tudo mais lento), o pico de memória.
+
+            Args:
+                nome (str): nome exibido no relatório.
+                gerar (Callable[[], Gramatica]): cria a gramática (a criação
+                    entra no tempo de first/follow).
+                n (int | str): tamanho do parâmetro, para o relatório.
+                repeticoes (int): quantas vezes repetir a medição de tempo.
+
+            Returns:
+                dict: uma linha do relatório (chaves em COLUNAS).
+        """
+        melhores = None
+        for _ in range(repeticoes):
+            medidas = Benchmark._construir(gerar)
+            if melhores is None:
+                melhores = medidas
+            else:
+                for chave in ("first/follow", "colecao", "goto", "slr", "lalr", "total"):
+                    melhores[chave] = min(melhores[chave], medidas[chave])
+
+        tracemalloc.start()
+        Benchmark._construir(gerar)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        melhores["gramatica"] = nome
+        melhores["n"] = n
+        melhores["pico_kb"] = pico // 1024
+        return melhores
+
+    @staticmethod
+    def expoente(linhas: list[dict], chave: str = "total") -> float | None:
+        """Estima k em tempo ~ itens^k entre a primeira e a última linha de
+            uma série (k perto de 1 é linear; bem acima disso indica uma
+            regressão super-linear)."""
+        primeira, ultima = linhas[0], linhas[-1]
+        if primeira[chave] <= 0 or ultima["itens"] == primeira["itens"]:
+            return None
+        return math.log(ultima[chave] / primeira[chave]) / math.log(ultima["itens"] / primeira["itens"])
+
+    @staticmethod
+    def formatar(linhas: list[dict]) -> str:
+        """Formata as linhas do relatório como uma tabela de texto."""
+        def celula(valor):
+            return f"{valor * 1000:.1f}ms" if isinstance(valor, float) else str(valor)
+        tabela = [list(Benchmark.COLUNAS)] + [[celula(linha[c]) for c in Benchmark.COLUNAS] for linha in linhas]
+        larguras = [max(len(l[i]) for l in tabela) for i in range(len(Benchmark.COLUNAS))]
+        return "\n".join("  ".join(c.rjust(w) for c, w in zip(l, larguras)) for l in tabela)
+
+    @staticmethod
+    def executar(tamanhos: list[int], repeticoes: int = 3, pasta: str = "entradas/gramaticas") -> list[dict]:
+        """Roda o conjunto completo e imprime o relatório.
+
+            Args:
+                tamanhos (list[int]): valores de n das gramáticas sintéticas.
+                repeticoes (int): repetições de cada medição de tempo.
+                pasta (str): pasta das gramáticas de entrada.
+
+            Returns:
+                list[dict]: todas as linhas do relatório.
+        """
+        todas = []
+        linhas = [Benchmark.medir(arquivo.stem, lambda a=arquivo: Gramatica.de_arquivo(a), repeticoes=repeticoes)
+                  for arquivo in sorted(Path(pasta).glob("*.txt"))]
+        linhas.append(Benchmark.medir("mini_linguagem", Benchmark.mini_linguagem, repeticoes=repeticoes))
+        print(Benchmark.formatar(linhas))
+        print()
+        todas.extend(linhas)
+
+        for gerador in (Benchmark.escada, Benchmark.lista_direita, Benchmark.alternativa):
+            serie = [Benchmark.medir(gerador.__name__, lambda n=n: gerador(n), n, repeticoes) for n in tamanhos]
+            print(Benchmark.formatar(serie))
+            k = Benchmark.expoente(serie)
+            if k is not None:
+                print(f"{gerador.__name__}: tempo total ~ itens^{k:.2f}")
+            print()
+            todas.extend(serie)
+        return todas
+
+def main():
+    tamanhos = [int(x) for x in argv[1:]] or [10, 50, 100, 200]
+    Benchmark.executar(tamanhos)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Cache em disco das tabelas LR geradas (ver TabelaComprimida).
+
+As tabelas são gravadas num arquivo binário versionado, cujo nome é o hash
+(SHA-256) do conteúdo do arquivo da gramática e do método (slr/lalr). Na
+leitura, o arquivo é mapeado em memória (mmap) e os vetores são usados
+diretamente como memoryviews de inteiros: nada é copiado, e processos que
+carregam o mesmo arquivo compartilham as mesmas páginas do sistema.
+
+Formato (little-endian):
+    cabeçalho: 'LRTB', versão (u16), reservado (u16), hash (32 bytes),
+               n_estados, n_terminais, n_nao_terminais, n_producoes,
+               tamanho de valor_acao, tamanho de valor_desvio, tamanho dos
+               nomes em bytes (7 x u32) e 1 x u32 reservado
+    vetores:   os vetores de TabelaComprimida.VETORES, nessa ordem (int32)
+    nomes:     JSON (UTF-8) com terminais, não terminais e produções
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from abc import ABC
+from array import array
+from pathlib import Path
+from sintatico.tabela import TabelaComprimida
+
+class CacheTabelas(ABC):
+    """Classe utilitária abstrata (não instanciável) para salvar e carregar
+    tabelas LR do cache em disco."""
+
+    MAGICO = b'LRTB'
+    VERSAO = 2
+    CABECALHO = struct.Struct('<4sHH32s8I')
+
+    @staticmethod
+    def chave(caminho_gramatica: str, metodo: str) -> bytes:
+        """Calcula a chave do cache: SHA-256 do conteúdo da gramática e do
+        método de construção das tabelas."""
+        with open(caminho_gramatica, 'rb') as f:
+            conteudo = f.read()
+        return hashlib.sha256(conteudo + b'\0' + metodo.encode()).digest()
+
+    @staticmethod
+    def caminho(chave: bytes, pasta: str = "tabelas") -> Path:
+        """Retorna o caminho do arquivo de cache de uma chave."""
+        return Path(pasta) / f"{chave.hex()}.lrt"
+
+    @staticmethod
+    def salvar(tabela: TabelaComprimida, chave: bytes, caminho: Path) -> None:
+        """Grava a tabela no arquivo de cache (de forma atômica: escreve num
+        arquivo temporário e o renomeia, para leitores concorrentes nunca
+        verem um arquivo pela metade)."""
+        nomes = json.dumps({
+            "terminais": tabela.terminais,
+            "nao_terminais": tabela.nao_terminais,
+            "producoes": [[cabeca, list(corpo)] for cabeca, corpo in tabela.producoes],
+        }).encode('utf-8')
+        vetores = [array('i', getattr(tabela, nome)) for nome in TabelaComprimida.VETORES]
+        if sys.byteorder == 'big':
+            for vetor in vetores:
+                vetor.byteswap()
+
+        cabecalho = CacheTabelas.CABECALHO.pack(
+            CacheTabelas.MAGICO, CacheTabelas.VERSAO, 0, chave,
+            tabela.n_estados, tabela.n_terminais, tabela.n_nao_terminais,
+            len(tabela.producoes), len(tabela.valor_acao), len(tabela.valor_desvio),
+            len(nomes), 0)
+
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        temporario = caminho.with_suffix(f".{os.getpid()}.tmp")
+        with open(temporario, 'wb') as f:
+            f.write(cabecalho)
+            for vetor in vetores:
+                vetor.tofile(f)
+            f.write(nomes)
+        os.replace(temporario, caminho)
+
+    @staticmethod
+    def carregar(caminho: Path, chave: bytes = None) -> TabelaComprimida | None:
+        """Carrega uma tabela do cache, mapeando o arquivo em memória.
+
+            Args:
+                caminho (Path): arquivo de cache.
+                chave (bytes, opcional): se dada, o hash gravado deve ser igual.
+
+            Returns:
+                A tabela, ou None se o arquivo não existir, for de outra versão
+                ou de outra gramática, ou estiver truncado ou corrompido.
+        """
+        try:
+            with open(caminho, 'rb') as f:
+                mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+        # Valida o arquivo inteiro antes de criar as visões dos vetores (com
+        # visões exportadas o mapa não pode mais ser fechado)
+        nomes = CacheTabelas._validar(mapa, chave)
+        if nomes is None:
+            mapa.close()
+            return None
+        (_, _, _, _, n_estados, _, n_nao_terminais, n_producoes,
+         tamanho_acao, tamanho_desvio, _, _) = CacheTabelas.CABECALHO.unpack_from(mapa)
+
+        visao = memoryview(mapa)
+        inicio = CacheTabelas.CABECALHO.size
+        vetores = []
+        for tamanho in CacheTabelas._tamanhos(n_estados, n_nao_terminais, n_producoes, tamanho_acao, tamanho_desvio):
+            fim = inicio + 4 * tamanho
+            if sys.byteorder == 'big':
+                vetor = array('i', visao[inicio:fim])
+                vetor.byteswap()
+            else:
+                vetor = visao[inicio:fim].cast('i')
+            vetores.append(vetor)
+            inicio = fim
+
+        producoes = [(cabeca, tuple(corpo)) for cabeca, corpo in nomes["producoes"]]
+        return TabelaComprimida(nomes["terminais"], nomes["nao_terminais"], producoes, n_estados, *vetores)
+
+    @staticmethod
+    def _tamanhos(n_estados: int, n_nao_terminais: int, n_producoes: int, tamanho_acao: int, tamanho_desvio: int) -> list[int]:
+        """Os tamanhos (em inteiros) dos vetores de TabelaComprimida.VETORES, nessa ordem."""
+        return [n_estados, n_estados, tamanho_acao, tamanho_acao,
+                n_nao_terminais, n_nao_terminais, tamanho_desvio, tamanho_desvio,
+                n_producoes, n_producoes]
+
+    @staticmethod
+    def _validar(mapa: mmap.mmap, chave: bytes | None) -> dict | None:
+        """Confere o cabeçalho e o tamanho do arquivo e decodifica os nomes.
+
+            Returns:
+                Os nomes (terminais, não terminais e produções), ou None se o
+                arquivo for de outra versão ou gramática, estiver truncado ou
+                corrompido (tratado como ausência no cache).
+        """
+        if len(mapa) < CacheTabelas.CABECALHO.size:
+            return None
+        (magico, versao, _, chave_gravada, n_estados, _, n_nao_terminais,
+         n_producoes, tamanho_acao, tamanho_desvio, tamanho_nomes, _) = CacheTabelas.CABECALHO.unpack_from(mapa)
+        if magico != CacheTabelas.MAGICO or versao != CacheTabelas.VERSAO:
+            return None
+        if chave is not None and chave_gravada != chave:
+            return None
+        inicio = CacheTabelas.CABECALHO.size + 4 * sum(CacheTabelas._tamanhos(
+            n_estados, n_nao_terminais, n_producoes, tamanho_acao, tamanho_desvio))
+        if len(mapa) != inicio + tamanho_nomes:
+            return None
+        try:
+            nomes = json.loads(mapa[inicio:].decode('utf-8'))
+            if not all(isinstance(nomes.get(campo), list) for campo in ("terminais", "nao_terminais", "producoes")):
+                return None
+        except (UnicodeDecodeError, ValueError, AttributeError):
+            return None
+        return nomes
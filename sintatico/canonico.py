@@ -1,66 +1,289 @@
-from gramatica import Gramatica
-from item import Item
-from collections import deque
+from sintatico.gramatica import Gramatica
+from sintatico.item import Item
+from sintatico.tabela import TabelaLR, SHIFT, REDUCE, ACEITAR
 
 class Canonico:
+    """Coleção canônica de conjuntos de itens LR(0).
 
-    def __init__(self):
-        # Armazena os itens de cada conjunto de itens {I0: S'->·S, S->·A, ...}
-        self.itens: dict[str, set[Item]] = {}
-        # Armazena desvios entre conjuntos de itens  {(I0, A): I2}
-        self.desvios: dict[tuple[str, str], str] = {}
+    Cada estado guarda apenas seu núcleo (itens do estado inicial ou com o
+    ponto depois do primeiro símbolo); o fechamento é obtido a partir do
+    fechamento de cada não terminal, calculado uma única vez.
+    """
+
+    def __init__(self, gramatica: Gramatica):
+        # Gramática estendida (S' -> S é a produção 0)
+        self.gramatica = gramatica
+        # Núcleo de cada estado (itens codificados como inteiros) [I0, I1, ...]
+        self.nucleos: list[frozenset[int]] = []
+        # Índice núcleo -> estado (evita estados repetidos)
+        self.indice: dict[frozenset[int], int] = {}
+        # Armazena desvios entre conjuntos de itens  {(0, 'A'): 2} (GOTO memoizado)
+        self.desvios: dict[tuple[int, str], int] = {}
+        # Fechamento de cada não terminal: itens A -> ·α e os que eles implicam
+        self.fechos_nao_terminais: dict[str, frozenset[int]] = {}
+        # Lookaheads LALR(1) de cada redução {(estado, produção): bits dos terminais}
+        self.lookaheads: dict[tuple[int, int], int] = {}
     
     @classmethod
     def colecao_canonica(cls, gram: Gramatica) -> "Canonico":
         """Gera coleção de itens canônicos (I0, I1, I2...)"""
-        g_ext = gram.extender()
-        
-        itens: dict[str, set[Item]] = {}
+        colecao = cls(gram.extender())
+        g_ext = colecao.gramatica
 
-        simbolo_inicial = g_ext.simbolo_inicial
-        corpo_inicial = list(g_ext.producoes[simbolo_inicial])[0]
-        item_inicial = Item(simbolo_inicial, corpo_inicial, 0)
-        itens["I0"] = Canonico.closure({item_inicial})
-        fila = deque()
-        pass # TODO: terminar
+        # S' -> ·S (a produção S' -> S é sempre a de índice 0)
+        colecao.adicionar_estado(frozenset([g_ext.item(0, 0)]))
+        atual = 0
+        while atual < len(colecao.nucleos):
+            for simbolo, nucleo in colecao.avancos(atual).items():
+                colecao.desvios[(atual, simbolo)] = colecao.adicionar_estado(nucleo)
+            atual += 1
+        return colecao
+
+    def adicionar_estado(self, nucleo: frozenset[int]) -> int:
+        """Retorna o estado com o núcleo dado, criando-o se ainda não existir."""
+        estado = self.indice.get(nucleo)
+        if estado is None:
+            estado = len(self.nucleos)
+            self.indice[nucleo] = estado
+            self.nucleos.append(nucleo)
+        return estado
+
+    def fecho_nao_terminal(self, nao_terminal: str) -> frozenset[int]:
+        """Retorna CLOSURE({A -> ·α | A -> α ∈ P}), calculado uma única vez."""
+        fecho = self.fechos_nao_terminais.get(nao_terminal)
+        if fecho is None:
+            g = self.gramatica
+            fecho = Canonico.closure({g.item(p, 0) for p in g.producoes_de[nao_terminal]}, g)
+            self.fechos_nao_terminais[nao_terminal] = fecho
+        return fecho
+
+    def itens(self, estado: int) -> frozenset[int]:
+        """Retorna todos os itens (núcleo e fechamento) de um estado."""
+        nucleo = self.nucleos[estado]
+        simbolo_do_item = self.gramatica.simbolo_do_item
+        producoes_de = self.gramatica.producoes_de
+        j = set(nucleo)
+        for simbolo in {simbolo_do_item[item] for item in nucleo}:
+            if simbolo in producoes_de:
+                j.update(self.fecho_nao_terminal(simbolo))
+        return frozenset(j)
+
+    def avancos(self, estado: int) -> dict[str, frozenset[int]]:
+        """Calcula, para cada símbolo X, o núcleo de GOTO(estado, X)."""
+        simbolo_do_item = self.gramatica.simbolo_do_item
+        grupos: dict[str, list[int]] = {}
+        for item in self.itens(estado):
+            simbolo = simbolo_do_item[item]
+            if simbolo is not None:
+                grupos.setdefault(simbolo, []).append(item + 1)
+        return {simbolo: frozenset(itens) for simbolo, itens in grupos.items()}
 
-    
     @staticmethod
-    def closure(i: set[Item], producoes: dict[str, set[list[str]]]):
+    def closure(i: set[int], gram: Gramatica) -> frozenset[int]:
         """Implementa CLOSURE(I)"""
         j = set(i)
         pilha = list(i)
         while len(pilha) != 0:
             item_atual = pilha.pop()
-            elemento = item_atual.elemento_do_ponto()
-            for corpo in producoes.get(elemento, []):
-                novo_item = Item(elemento, corpo, 0)
+            elemento = gram.simbolo_do_item[item_atual]
+            for producao in gram.producoes_de.get(elemento, ()):
+                novo_item = gram.item(producao, 0)
                 if novo_item not in j:
                     j.add(novo_item)
                     pilha.append(novo_item)
-        return j
+        return frozenset(j)
 
     @staticmethod
-    def go_to(i: set[Item], producoes: dict[str, set[list[str]]], elemento: str):
+    def go_to(i: frozenset[int], gram: Gramatica, elemento: str) -> frozenset[int]:
         """IMPLEMENTA GOTO(Y)"""
-        j = {item.avancar_ponto() for item in i if item.elemento_do_ponto() == elemento}
-        return Canonico.closure(j, producoes)
-
-    def gerar_tabela():
-        """Gera tabela de shifts, reduces e desvios baseados na coleção de itens
-        e desvios."""
-        pass
-
-g = Gramatica.de_arquivo("entradas/gramaticas/exemplo.txt")
-ext = g.extender()
-producoes = ext.producoes
-simbolo_inicial = ext.simbolo_inicial
-corpo_inicial = ext.producoes[simbolo_inicial][0]
-item_inicial = Item(simbolo_inicial, corpo_inicial, 0)
-i0 = Canonico.closure({item_inicial}, producoes)
-for item in i0:
-    print(f"{item.cabeca}, {item.corpo}, {item.ponto_pos}")
-print("AGORA GOTO")
-i1 = Canonico.go_to(i0, producoes, 'E')
-for item in i1:
-    print(f"{item.cabeca}, {item.corpo}, {item.ponto_pos}")
\ No newline at end of file
+        simbolo_do_item = gram.simbolo_do_item
+        # Avançar o ponto de um item codificado é somar 1 ao seu id
+        j = {item + 1 for item in i if simbolo_do_item[item] == elemento}
+        return Canonico.closure(j, gram)
+
+    def gerar_tabela(self) -> TabelaLR:
+        """Gera tabela SLR de shifts, reduces e desvios baseados na coleção de
+        itens e desvios (reduções nos terminais de FOLLOW da cabeça)."""
+        g = self.gramatica
+        tabela = TabelaLR(g, len(self.nucleos))
+        terminais = set(g.terminais)
+
+        # Shifts e desvios vêm diretamente do GOTO memoizado
+        for (estado, simbolo), destino in self.desvios.items():
+            if simbolo in terminais:
+                tabela.adicionar_acao(estado, simbolo, (SHIFT, destino))
+            else:
+                tabela.desvio[(estado, simbolo)] = destino
+
+        # Reduções: itens completos (ponto no fim)
+        for estado in range(len(self.nucleos)):
+            for item in self.itens(estado):
+                if g.simbolo_do_item[item] is not None:
+                    continue
+                producao = g.producao_do_item(item)
+                if producao == 0:
+                    tabela.adicionar_acao(estado, '$', (ACEITAR, 0))
+                    continue
+                cabeca = g.tabela_producoes[producao][0]
+                for terminal in g.terminais_dos_bits(g.follow_bits(cabeca)):
+                    tabela.adicionar_acao(estado, terminal, (REDUCE, producao))
+        return tabela
+
+    @staticmethod
+    def _digraph(nos: list[tuple[int, str]], relacao: dict[tuple[int, str], list[tuple[int, str]]],
+                 iniciais: dict[tuple[int, str], int]) -> dict[tuple[int, str], int]:
+        """Algoritmo Digraph (DeRemer e Pennello): calcula F(x) = F'(x) ∪
+            ⋃{F(y) | x R y} em tempo linear, tratando cada componente
+            fortemente conexa de R de uma vez (versão iterativa do Tarjan).
+
+            Args:
+                nos (list[tuple[int, str]]): os nós do grafo, as transições
+                    (estado, não terminal).
+                relacao (dict[tuple[int, str], list[tuple[int, str]]]):
+                    x -> [y, ...] (x R y); nós fora de `nos` são ignorados.
+                iniciais (dict[tuple[int, str], int]): F'(x), em bits.
+
+            Returns:
+                dict[tuple[int, str], int]: F(x) para cada nó.
+        """
+        infinito = len(iniciais) + 1
+        resultado = dict(iniciais)
+        profundidade = dict.fromkeys(nos, 0)
+        pilha: list[tuple[int, str]] = []
+        for raiz in nos:
+            if profundidade[raiz]:
+                continue
+            pilha.append(raiz)
+            profundidade[raiz] = len(pilha)
+            trabalho = [(raiz, len(pilha), iter(relacao.get(raiz, ())))]
+            while trabalho:
+                no, nivel, vizinhos = trabalho[-1]
+                for vizinho in vizinhos:
+                    if vizinho not in profundidade:
+                        continue
+                    if profundidade[vizinho] == 0:
+                        pilha.append(vizinho)
+                        profundidade[vizinho] = len(pilha)
+                        trabalho.append((vizinho, len(pilha), iter(relacao.get(vizinho, ()))))
+                        break
+                    profundidade[no] = min(profundidade[no], profundidade[vizinho])
+                    resultado[no] |= resultado[vizinho]
+                else:
+                    trabalho.pop()
+                    if profundidade[no] == nivel:
+                        # Raiz de uma componente: todos os membros ficam com o mesmo conjunto
+                        while True:
+                            membro = pilha.pop()
+                            profundidade[membro] = infinito
+                            resultado[membro] = resultado[no]
+                            if membro == no:
+                                break
+                    if trabalho:
+                        pai = trabalho[-1][0]
+                        profundidade[pai] = min(profundidade[pai], profundidade[no])
+                        resultado[pai] |= resultado[no]
+        return resultado
+
+    def calcular_lookaheads(self) -> None:
+        """Calcula os lookaheads LALR(1) de cada redução pelo método de
+            DeRemer e Pennello, sobre as transições (p, A) por não terminais:
+
+            - DR(p, A): terminais lidos logo após a transição;
+            - (p, A) reads (r, C): r = GOTO(p, A) e C é anulável;
+            - (p, A) includes (p', B): B -> βAγ, γ anulável e p' --β--> p;
+            - (q, A -> ω) lookback (p, A): p --ω--> q.
+
+            Read = DR ∪ reads*, Follow = Read ∪ includes* (ambos pelo
+            algoritmo Digraph) e LA(q, A -> ω) = ∪ Follow(p, A) por lookback.
+        """
+        g = self.gramatica
+        producoes_de = g.producoes_de
+        indice_terminal = g.indice_terminal
+
+        # Transições de cada estado, separadas por terminais e não terminais
+        terminais_de: dict[int, int] = {}
+        nao_terminais_de: dict[int, list[str]] = {}
+        for (estado, simbolo), destino in self.desvios.items():
+            if simbolo in producoes_de:
+                nao_terminais_de.setdefault(estado, []).append(simbolo)
+            elif simbolo in indice_terminal:
+                terminais_de[estado] = terminais_de.get(estado, 0) | 1 << indice_terminal[simbolo]
+
+        # DR e reads
+        transicoes = [(estado, simbolo) for (estado, simbolo) in self.desvios if simbolo in producoes_de]
+        diretos: dict[tuple[int, str], int] = {}
+        reads: dict[tuple[int, str], list[tuple[int, str]]] = {}
+        for transicao in transicoes:
+            destino = self.desvios[transicao]
+            diretos[transicao] = terminais_de.get(destino, 0)
+            reads[transicao] = [(destino, c) for c in nao_terminais_de.get(destino, ()) if g.anulavel(c)]
+        # O fim de entrada segue S em S' -> ·S
+        inicial = (0, g.tabela_producoes[0][1][0])
+        diretos[inicial] |= 1 << indice_terminal['$']
+        lidos = Canonico._digraph(transicoes, reads, diretos)
+
+        # includes e lookback: percorre cada produção a partir de cada transição
+        includes: dict[tuple[int, str], list[tuple[int, str]]] = {}
+        lookback: dict[tuple[int, int], list[tuple[int, str]]] = {}
+        for transicao in transicoes:
+            origem, cabeca = transicao
+            for producao in producoes_de[cabeca]:
+                corpo = g.tabela_producoes[producao][1]
+                estado = origem
+                for i, simbolo in enumerate(corpo):
+                    if simbolo in producoes_de and g.first_sequencia(corpo[i + 1:])[1]:
+                        includes.setdefault((estado, simbolo), []).append(transicao)
+                    estado = self.desvios[(estado, simbolo)]
+                lookback.setdefault((estado, producao), []).append(transicao)
+        seguintes = Canonico._digraph(transicoes, includes, lidos)
+
+        self.lookaheads = {}
+        for reducao, origens in lookback.items():
+            bits = 0
+            for transicao in origens:
+                bits |= seguintes[transicao]
+            self.lookaheads[reducao] = bits
+
+    def gerar_tabela_lalr(self) -> TabelaLR:
+        """Gera tabela LALR(1): mesmos estados e shifts/desvios da tabela SLR,
+        mas com reduções apenas nos lookaheads LALR(1) de cada item."""
+        if not self.lookaheads:
+            self.calcular_lookaheads()
+        g = self.gramatica
+        tabela = TabelaLR(g, len(self.nucleos))
+        terminais = set(g.terminais)
+
+        for (estado, simbolo), destino in self.desvios.items():
+            if simbolo in terminais:
+                tabela.adicionar_acao(estado, simbolo, (SHIFT, destino))
+            else:
+                tabela.desvio[(estado, simbolo)] = destino
+
+        # S' -> S· aceita no fim da entrada
+        tabela.adicionar_acao(self.desvios[(0, g.tabela_producoes[0][1][0])], '$', (ACEITAR, 0))
+        for (estado, producao), bits in self.lookaheads.items():
+            for terminal in g.terminais_dos_bits(bits):
+                tabela.adicionar_acao(estado, terminal, (REDUCE, producao))
+        return tabela
+
+def main():
+    g = Gramatica.de_arquivo("entradas/gramaticas/exemplo.txt")
+    colecao = Canonico.colecao_canonica(g)
+    ext = colecao.gramatica
+    for estado, nucleo in enumerate(colecao.nucleos):
+        print(f"I{estado}: {', '.join(str(Item.de_id(ext, item)) for item in sorted(nucleo))}")
+    print()
+    tabela = colecao.gerar_tabela()
+    print(tabela.formatar())
+    print(f"Conflitos: {tabela.conflitos}")
+
+    # Gramática que não é SLR, mas é LALR(1)
+    g = Gramatica.de_arquivo("entradas/gramaticas/atribuicao.txt")
+    colecao = Canonico.colecao_canonica(g)
+    print(f"Conflitos SLR: {colecao.gerar_tabela().conflitos}")
+    tabela = colecao.gerar_tabela_lalr()
+    print(tabela.formatar())
+    print(f"Conflitos LALR: {tabela.conflitos}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Geração de um módulo Python autônomo com o analisador LR de uma gramática.
+
+O módulo gerado contém as tabelas comprimidas (ver TabelaComprimida) como
+tuplas constantes e um laço de análise especializado para elas; não importa
+nada do pacote sintatico (nem da biblioteca padrão), então é importado em
+milissegundos (as tuplas vêm prontas do .pyc, compilado junto com o
+módulo) e pode ser copiado para projetos que só precisam reconhecer a
+linguagem.
+
+Em relação a AnalisadorSintatico.analisar, o laço gerado:
+- despacha as reduções por uma lista de saltos pré-calculada, indexada
+  pelo próprio código da ação: REDUCOES[-codigo] dá o tamanho do corpo e a
+  base e o destino padrão do desvio da cabeça (None é aceitar), sem
+  consultar cabecas e base_desvio a cada redução;
+- guarda a pilha de estados numa lista e as tabelas em tuplas (sem
+  conversões de array para int a cada acesso).
+
+Uso: python3 -m sintatico.gerador <gramatica.txt> <saida.py> [--metodo slr|lalr]
+"""
+
+import py_compile
+from abc import ABC
+from argparse import ArgumentParser
+from pathlib import Path
+from sintatico.analisador_sintatico import AnalisadorSintatico
+from sintatico.tabela import TabelaComprimida
+
+_DRIVER = '''
+def analisar(tokens):
+    """Analisa uma sequência de tokens (lexema, padrão).
+
+        Returns:
+            (bool, int): se a entrada foi aceita e, se não foi, o índice do
+            token onde o erro foi detectado (o número de tokens, se o erro
+            for no fim da entrada).
+    """
+    base_acao = BASE_ACAO
+    padrao_acao = PADRAO_ACAO
+    valor_acao = VALOR_ACAO
+    verif_acao = VERIF_ACAO
+    valor_desvio = VALOR_DESVIO
+    verif_desvio = VERIF_DESVIO
+    reducoes = REDUCOES
+    terminais = TERMINAIS
+    fim = FIM
+
+    pilha = [0] * 256
+    topo = 0
+    estado = 0
+
+    fluxo = iter(tokens)
+    posicao = 0
+    token = next(fluxo, None)
+    if token is None:
+        terminal = fim
+    else:
+        terminal = terminais.get(token[1])
+        if terminal is None:
+            terminal = terminais.get(token[0], -1)
+
+    while True:
+        if terminal < 0:
+            return False, posicao
+        base = base_acao[estado]
+        i = base + terminal
+        codigo = valor_acao[i] if verif_acao[i] == base else padrao_acao[estado]
+        if codigo > 0:
+            estado = codigo - 1
+            posicao += 1
+            token = next(fluxo, None)
+            if token is None:
+                terminal = fim
+            else:
+                terminal = terminais.get(token[1])
+                if terminal is None:
+                    terminal = terminais.get(token[0], -1)
+        elif codigo < 0:
+            reducao = reducoes[-codigo]
+            if reducao is None:
+                return True, None
+            tamanho, base, padrao = reducao
+            topo -= tamanho
+            i = base + pilha[topo]
+            estado = valor_desvio[i] if verif_desvio[i] == base else padrao
+        else:
+            return False, posicao
+        # Empilha o estado do shift ou do desvio (a pilha cresce dobrando)
+        topo += 1
+        if topo == len(pilha):
+            pilha.extend(pilha)
+        pilha[topo] = estado
+'''
+
+class GeradorAnalisador(ABC):
+    """Classe utilitária abstrata (não instanciável) que gera o código
+    fonte do módulo analisador de uma TabelaComprimida."""
+
+    # Largura máxima das linhas das constantes no código gerado
+    LARGURA = 100
+
+    @staticmethod
+    def gerar(tabela: TabelaComprimida, origem: str = "") -> str:
+        """Gera o código fonte do módulo analisador.
+
+            Args:
+                tabela (TabelaComprimida): as tabelas da gramática.
+                origem (str): descrição da gramática (vai no cabeçalho).
+
+            Returns:
+                str: o código do módulo, com as constantes e a função
+                analisar(tokens) -> (bool, int).
+        """
+        # Lista de saltos das reduções: o índice é o próprio -codigo
+        # (a produção mais um); a produção 0, S' -> S, é aceitar
+        reducoes = [None, None]
+        for producao in range(1, len(tabela.producoes)):
+            cabeca = tabela.cabecas[producao]
+            reducoes.append((tabela.tamanhos[producao], tabela.base_desvio[cabeca],
+                             tabela.padrao_desvio[cabeca]))
+
+        partes = [
+            f'"""\nAnalisador LR gerado por sintatico/gerador.py{f" ({origem})" if origem else ""}.\n'
+            f'Não edite: gere novamente a partir da gramática.\n"""\n',
+            GeradorAnalisador._constante("TERMINAIS", {t: i for i, t in enumerate(tabela.terminais)}),
+            GeradorAnalisador._constante("NAO_TERMINAIS", tuple(tabela.nao_terminais)),
+            GeradorAnalisador._constante("PRODUCOES", tuple((cabeca, tuple(corpo)) for cabeca, corpo in tabela.producoes)),
+            f"FIM = {tabela.indice_terminal['$']}\n",
+            "# ACTION (comb vector): 0 é erro, v > 0 é shift para o estado v - 1 e\n"
+            "# v < 0 é reduce pela produção -v - 1 (ver REDUCOES)",
+        ]
+        for nome in ('base_acao', 'padrao_acao', 'valor_acao', 'verif_acao', 'valor_desvio', 'verif_desvio'):
+            partes.append(GeradorAnalisador._constante(nome.upper(), tuple(getattr(tabela, nome))))
+        partes.append("# REDUCOES[-v]: (tamanho do corpo, base e destino padrão do desvio da cabeça)")
+        partes.append(GeradorAnalisador._constante("REDUCOES", tuple(reducoes)))
+        partes.append(_DRIVER)
+        return "\n".join(partes)
+
+    @staticmethod
+    def _constante(nome: str, valor) -> str:
+        """Escreve `nome = valor`, quebrando tuplas e dicionários longos em
+            várias linhas."""
+        linha = f"{nome} = {valor!r}\n"
+        if len(linha) <= GeradorAnalisador.LARGURA:
+            return linha
+        if isinstance(valor, dict):
+            abre, fecha = "{", "}"
+            itens = [f"{chave!r}: {v!r}," for chave, v in valor.items()]
+        else:
+            abre, fecha = "(", ")"
+            itens = [f"{v!r}," for v in valor]
+        linhas = [f"{nome} = {abre}"]
+        atual = "   "
+        for item in itens:
+            if len(atual) + 1 + len(item) > GeradorAnalisador.LARGURA:
+                linhas.append(atual)
+                atual = "   "
+            atual += " " + item
+        linhas.append(atual)
+        linhas.append(fecha)
+        return "\n".join(linhas) + "\n"
+
+    @staticmethod
+    def salvar(tabela: TabelaComprimida, caminho: str, origem: str = "") -> None:
+        """Gera o módulo analisador, grava-o em `caminho` e já o compila
+            para bytecode (.pyc), para a primeira importação também ser rápida."""
+        Path(caminho).write_text(GeradorAnalisador.gerar(tabela, origem), encoding='utf-8')
+        py_compile.compile(caminho, doraise=True)
+
+def main(argumentos: list[str] | None = None):
+    parser = ArgumentParser(prog="python3 -m sintatico.gerador", description="Gera um módulo Python autônomo com o analisador LR de uma gramática.")
+    parser.add_argument("gramatica", help="arquivo da gramática")
+    parser.add_argument("saida", help="arquivo .py a gerar")
+    parser.add_argument("--metodo", choices=("slr", "lalr"), default="slr", help="método de construção das tabelas")
+    args = parser.parse_args(argumentos)
+
+    analisador = AnalisadorSintatico()
+    tabela = analisador.gerar_tabela(args.gramatica, args.metodo)
+    if tabela.conflitos:
+        print(f"Aviso: {len(tabela.conflitos)} conflito(s) na tabela {args.metodo.upper()}")
+    GeradorAnalisador.salvar(analisador.tabela, args.saida, f"{Path(args.gramatica).name}, {args.metodo}")
+    print(f"Analisador gravado em {args.saida}")
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,3 @@
-from functools import lru_cache
-
 class Gramatica:
     """Uma gramática capaz de gerar palavras de uma linguagem formal."""
     def __init__(self, nao_terminais: set[str], terminais: set[str], producoes: dict[str, set[list[str]]], simbolo_inicial: str):
@@ -15,25 +13,251 @@ class Gramatica:
         self.terminais = terminais
         self.producoes = producoes
         self.simbolo_inicial = simbolo_inicial
-        
+        # Índice de cada terminal (e do fim de entrada '$') nos conjuntos em bits
+        self.terminais_com_fim: list[str] = list(terminais) + ['$']
+        self.indice_terminal: dict[str, int] = {t: i for i, t in enumerate(self.terminais_com_fim)}
+        self._gerar_tabela_producoes()
+
+    def terminais_dos_bits(self, bits: int) -> list[str]:
+        """Converte um conjunto de terminais em bits (bit i = terminal de
+        índice i) para a lista dos terminais correspondentes."""
+        return [t for i, t in enumerate(self.terminais_com_fim) if bits >> i & 1]
+
+    def _gerar_tabela_producoes(self) -> None:
+        """Numera as produções e prepara a codificação dos itens LR(0).
+
+            Cada produção recebe um índice (na ordem do dicionário de
+            produções) e é guardada como (cabeça, corpo), com o corpo vazio
+            para produções '&'. Um item LR(0) é representado pelo inteiro
+            indice_producao * largura_item + posição_do_ponto, e
+            simbolo_do_item guarda, para cada id, o símbolo após o ponto
+            (None se o ponto estiver no fim).
+        """
+        self.tabela_producoes: list[tuple[str, tuple[str, ...]]] = []
+        self.producoes_de: dict[str, list[int]] = {}
+        for cabeca, corpos in self.producoes.items():
+            indices = self.producoes_de.setdefault(cabeca, [])
+            for corpo in corpos:
+                corpo = tuple(simbolo for simbolo in corpo if simbolo != '&')
+                indices.append(len(self.tabela_producoes))
+                self.tabela_producoes.append((cabeca, corpo))
+
+        self.largura_item = max((len(corpo) for _, corpo in self.tabela_producoes), default=0) + 1
+        self.simbolo_do_item: list[str | None] = []
+        for _, corpo in self.tabela_producoes:
+            self.simbolo_do_item.extend(corpo)
+            self.simbolo_do_item.extend([None] * (self.largura_item - len(corpo)))
+
+    def item(self, producao: int, ponto: int = 0) -> int:
+        """Codifica o item LR(0) da produção dada com o ponto na posição dada."""
+        return producao * self.largura_item + ponto
+
+    def producao_do_item(self, item: int) -> int:
+        """Retorna o índice da produção de um item codificado."""
+        return item // self.largura_item
+
+    def ponto_do_item(self, item: int) -> int:
+        """Retorna a posição do ponto de um item codificado."""
+        return item % self.largura_item
+
+    def elemento_do_ponto(self, item: int) -> str | None:
+        """Retorna o símbolo após o ponto (None se o ponto estiver no fim)."""
+        return self.simbolo_do_item[item]
+
+    def avancar_ponto(self, item: int) -> int | None:
+        """Retorna o item com o ponto avançado uma posição (None se já estiver
+        no fim)."""
+        if self.simbolo_do_item[item] is None:
+            return None
+        return item + 1
     
     @classmethod
     def de_arquivo(cls, caminho_do_arquivo):
         """Método de gerar temporário (eventualmente substituir)."""
         with open(caminho_do_arquivo, 'r') as f:
-            dados = f.read()
-        dados = dados.split('\n')
+            return cls.de_texto(f.read())
+
+    @classmethod
+    def de_texto(cls, dados: str):
+        """Cria a gramática a partir do texto, no mesmo formato dos arquivos."""
+        dados = [linha for linha in dados.split('\n') if linha.strip()]
         nao_terminais: list[str] = dados[0].split()
         terminais: list[str] = dados[1].split()
-        simbolo_inicial: str = dados[2]
+        simbolo_inicial: str = dados[2].strip()
+        simbolos = set(nao_terminais) | set(terminais) | {'&'}
         producoes: dict[str, list[str]] = {}
         for linha in dados[3:]:
             linha = linha.split("->")
-            producoes[linha[0].strip()] = [x.strip().split() for x in linha[1].split("|")]
+            producoes[linha[0].strip()] = [cls.separar_simbolos(x, simbolos) for x in linha[1].split("|")]
         
         return cls(nao_terminais, terminais, producoes, simbolo_inicial)
+
+    @staticmethod
+    def separar_simbolos(corpo: str, simbolos: set[str]) -> list[str]:
+        """Separa o corpo de uma produção em símbolos. Partes separadas por
+            espaço que não são símbolos conhecidos (ex: 'TG' ou '(E)') são
+            quebradas pelo maior símbolo conhecido que casa a cada posição.
+
+            Args:
+                corpo(str): corpo da produção, como escrito no arquivo.
+                simbolos(set[str]): terminais, não terminais e '&'.
+
+            Returns:
+                a lista de símbolos do corpo.
+        """
+        resultado = []
+        maior = max((len(s) for s in simbolos), default=1)
+        for parte in corpo.split():
+            i = 0
+            while i < len(parte):
+                for tamanho in range(min(maior, len(parte) - i), 0, -1):
+                    if parte[i:i + tamanho] in simbolos:
+                        break
+                else:
+                    # Símbolo desconhecido: mantém o restante da parte inteiro
+                    tamanho = len(parte) - i
+                resultado.append(parte[i:i + tamanho])
+                i += tamanho
+        return resultado
     
-    @lru_cache
+    def _calcular_conjuntos(self) -> None:
+        """Calcula, de uma só vez, os símbolos anuláveis e os conjuntos FIRST e
+            FOLLOW de todos os não terminais, como conjuntos de terminais em
+            bits (bit i = terminal de índice i em terminais_com_fim).
+
+            Cada etapa é um ponto fixo com lista de trabalho: um símbolo só
+            volta à lista quando seu conjunto ganha terminais novos, então
+            gramáticas recursivas (à esquerda ou mutuamente) não causam
+            recursão e o custo é proporcional ao tamanho da gramática.
+        """
+        producoes = self.tabela_producoes
+        indice_terminal = self.indice_terminal
+
+        # 1. Anuláveis: conta, por produção, quantos símbolos ainda não são anuláveis
+        restantes = [len(corpo) for _, corpo in producoes]
+        ocorrencias: dict[str, list[int]] = {}
+        anulaveis: set[str] = set()
+        pilha: list[str] = []
+        for indice, (cabeca, corpo) in enumerate(producoes):
+            for simbolo in corpo:
+                ocorrencias.setdefault(simbolo, []).append(indice)
+            if not corpo and cabeca not in anulaveis:
+                anulaveis.add(cabeca)
+                pilha.append(cabeca)
+        while pilha:
+            simbolo = pilha.pop()
+            for indice in ocorrencias.get(simbolo, ()):
+                restantes[indice] -= 1
+                cabeca = producoes[indice][0]
+                if restantes[indice] == 0 and cabeca not in anulaveis:
+                    anulaveis.add(cabeca)
+                    pilha.append(cabeca)
+
+        # 2. FIRST: FIRST(A) recebe FIRST(Xi) enquanto X1..Xi-1 forem anuláveis
+        first = {cabeca: 0 for cabeca in self.producoes_de}
+        dependentes: dict[str, set[str]] = {}
+        for cabeca, corpo in producoes:
+            for simbolo in corpo:
+                if simbolo in first:
+                    dependentes.setdefault(simbolo, set()).add(cabeca)
+                    if simbolo not in anulaveis:
+                        break
+                else:
+                    if simbolo in indice_terminal:
+                        first[cabeca] |= 1 << indice_terminal[simbolo]
+                    break
+        Gramatica._propagar(first, dependentes)
+
+        # 3. FOLLOW: FOLLOW(Xi) recebe FIRST(Xi+1..Xn), e FOLLOW(A) se o resto for anulável
+        follow = {cabeca: 0 for cabeca in self.producoes_de}
+        follow[self.simbolo_inicial] = 1 << indice_terminal['$']
+        dependentes = {}
+        for cabeca, corpo in producoes:
+            bits = 0
+            anulavel = True
+            for simbolo in reversed(corpo):
+                if simbolo in first:
+                    follow[simbolo] |= bits
+                    if anulavel and simbolo != cabeca:
+                        dependentes.setdefault(cabeca, set()).add(simbolo)
+                    if simbolo in anulaveis:
+                        bits |= first[simbolo]
+                    else:
+                        bits = first[simbolo]
+                        anulavel = False
+                else:
+                    bits = 1 << indice_terminal[simbolo] if simbolo in indice_terminal else 0
+                    anulavel = False
+        Gramatica._propagar(follow, dependentes)
+
+        self._anulaveis = anulaveis
+        self._first_bits = first
+        self._follow_bits = follow
+        self._first_sequencias: dict[tuple[str, ...], tuple[int, bool]] = {}
+
+    @staticmethod
+    def _propagar(conjuntos: dict[str, int], dependentes: dict[str, set[str]]) -> None:
+        """Propaga conjuntos em bits pelas arestas X -> dependentes(X) até um
+        ponto fixo (conjuntos[D] ⊇ conjuntos[X] para toda aresta)."""
+        pilha = [simbolo for simbolo, bits in conjuntos.items() if bits and simbolo in dependentes]
+        while pilha:
+            simbolo = pilha.pop()
+            bits = conjuntos[simbolo]
+            for dependente in dependentes.get(simbolo, ()):
+                antigos = conjuntos[dependente]
+                if bits & ~antigos:
+                    conjuntos[dependente] = antigos | bits
+                    pilha.append(dependente)
+
+    def _conjuntos(self) -> None:
+        """Garante que FIRST, FOLLOW e anuláveis já foram calculados."""
+        if not hasattr(self, '_first_bits'):
+            self._calcular_conjuntos()
+
+    def anulavel(self, simbolo: str) -> bool:
+        """Verifica se o símbolo deriva a palavra vazia."""
+        self._conjuntos()
+        return simbolo == '&' or simbolo in self._anulaveis
+
+    def first_bits(self, simbolo: str) -> int:
+        """Retorna FIRST(simbolo) (sem '&') como conjunto de terminais em bits."""
+        self._conjuntos()
+        if simbolo in self._first_bits:
+            return self._first_bits[simbolo]
+        if simbolo in self.indice_terminal:
+            return 1 << self.indice_terminal[simbolo]
+        return 0
+
+    def follow_bits(self, simbolo: str) -> int:
+        """Retorna FOLLOW(simbolo) como conjunto de terminais em bits."""
+        self._conjuntos()
+        return self._follow_bits.get(simbolo, 0)
+
+    def first_sequencia(self, simbolos: tuple[str, ...]) -> tuple[int, bool]:
+        """Calcula FIRST de uma sequência de símbolos (em bits, sem '&') e se
+            a sequência é anulável. Os resultados ficam guardados por
+            sequência (usado no fechamento LR(1)).
+
+            Args:
+                simbolos(tuple[str, ...]): a sequência de símbolos.
+
+            Returns:
+                (int, bool): os terminais em bits e se a sequência é anulável.
+        """
+        self._conjuntos()
+        resultado = self._first_sequencias.get(simbolos)
+        if resultado is None:
+            bits = 0
+            anulavel = True
+            for simbolo in simbolos:
+                bits |= self.first_bits(simbolo)
+                if not self.anulavel(simbolo):
+                    anulavel = False
+                    break
+            resultado = (bits, anulavel)
+            self._first_sequencias[simbolos] = resultado
+        return resultado
+
     def first(self, simbolo: str) -> set:
         """Função que retorna o conjunto de terminais que podem aparecer no
             início de uma derivação por um dado símbolo. Caso o símbolo seja um
@@ -48,51 +272,31 @@ class Gramatica:
         # Caso o símbolo seja terminao ou vazio, retorna ele mesmo
         if simbolo in self.terminais or simbolo == '&':
             return set([simbolo])
-        conjunto = set()
-        for producao in self.producoes[simbolo]:
-            i = 0
-            while i < len(producao):
-                novo_simbolo = producao[i]
-                conjunto.update(self.first(novo_simbolo) - {'&'})
-                # Se o símbolo for anulável, também precisamos checar o próximo
-                if (novo_simbolo in self.nao_terminais and ['&'] in self.producoes[novo_simbolo]) or novo_simbolo == '&':
-                    # Se o último for anulável, adiciona & ao first
-                    if i == len(producao) - 1:
-                        conjunto.add('&')
-                    i+=1
-                else:
-                    break
-
+        conjunto = set(self.terminais_dos_bits(self.first_bits(simbolo)))
+        if self.anulavel(simbolo):
+            conjunto.add('&')
         return conjunto
 
-    @lru_cache   
-    def follow(self, simbolo: str):
-        conjunto: set[str] = set()
-        if simbolo == self.simbolo_inicial:
-            conjunto.add('$')
-        for cabeca, producoes in self.producoes.items():
-            for producao in producoes:
-                # Cria lista com índice de todas as ocorrências do símbolo
-                indices = [i for i, x in enumerate(producao) if x == simbolo]
-                while len(indices) != 0:
-                    indice = indices.pop()
-                    if indice == len(producao) - 1:
-                        if simbolo != cabeca:
-                            conjunto.update(self.follow(cabeca))
-                    else:
-                        proximo = producao[indice+1]
-                        conjunto.update(self.first(proximo) - {'&'})
-                        if (proximo in self.nao_terminais and ['&'] in self.producoes[proximo]) or proximo == '&':
-                            indices.append(indice+1)
-        
-        return conjunto
+    def follow(self, simbolo: str) -> set:
+        """Função que retorna o conjunto de terminais (e '$') que podem
+            aparecer imediatamente após um não terminal em alguma forma
+            sentencial.
+
+            Args:
+                simbolo(str): não terminal a ser avaliado.
+
+            Returns:
+                o conjunto de símbolos do FOLLOW
+        """
+        return set(self.terminais_dos_bits(self.follow_bits(simbolo)))
     
     def extender(self):
         """Gera uma nova gramática extendida a partir desta."""
         nao_terminais = list(self.nao_terminais)
         nao_terminais.append("S'")
+        # A produção S' -> S fica em primeiro (índice 0 na tabela de produções)
         nova_prod = {"S'": [[self.simbolo_inicial]]}
-        producoes = self.producoes | nova_prod
+        producoes = nova_prod | self.producoes
         return Gramatica(nao_terminais, self.terminais, producoes, "S'")
                 
 def main():
@@ -1,27 +1,58 @@
 class Item:
+    """Item LR(0): uma produção com um ponto marcando o quanto dela já foi
+    reconhecido (ex: E -> E · + T).
+
+    A construção da coleção canônica trabalha apenas com itens codificados
+    como inteiros (ver Gramatica.item). Esta classe serve para converter
+    esses ids de/para uma forma legível (exibição e depuração).
+    """
+
+    __slots__ = ('cabeca', 'corpo', 'ponto_pos', '_hash')
+
     def __init__(self, cabeca: str, corpo: list[str], ponto_pos: int):
         """"""
         self.cabeca = cabeca
         self.corpo = tuple(corpo) # Linhas são unhashable, então usamos tuplas
         self.ponto_pos = ponto_pos
+        # O hash é calculado uma única vez (itens são imutáveis)
+        self._hash = hash((self.cabeca, self.corpo, self.ponto_pos))
+
+    @classmethod
+    def de_id(cls, gramatica, item: int) -> "Item":
+        """Decodifica um item inteiro da gramática dada."""
+        cabeca, corpo = gramatica.tabela_producoes[gramatica.producao_do_item(item)]
+        return cls(cabeca, corpo, gramatica.ponto_do_item(item))
+
+    def para_id(self, gramatica) -> int:
+        """Codifica o item como inteiro, segundo a tabela de produções da
+        gramática dada."""
+        for producao in gramatica.producoes_de[self.cabeca]:
+            if gramatica.tabela_producoes[producao][1] == self.corpo:
+                return gramatica.item(producao, self.ponto_pos)
+        raise ValueError(f"Produção {self.cabeca} -> {' '.join(self.corpo)} não pertence à gramática")
 
     # Dunder methods hash e eq (para linhas como "if item in conjunto" funcionarem)
     
     def __hash__(self):
         """Define um hash para a classe. (Função meramente para fazer linhas
         como 'if item in conjunto' funcionarem, não se preocupe com isso.)"""
-        return hash((self.cabeca, self.corpo, self.ponto_pos))
+        return self._hash
     
     def __eq__(self, item: "Item"):
         """Define os requisitos para 2 itens serem iguais. (Função meramente 
         para fazer linhas como 'if item in conjunto' funcionarem, não se 
         preocupe com isso.)"""
-        if not isinstance(item, Item):
+        if self is item:
+            return True
+        if not isinstance(item, Item) or self._hash != item._hash:
             return False
-        mesma_cabeca = (self.cabeca == item.cabeca)
-        mesmo_corpo = (self.corpo == item.corpo)
-        mesma_pos = (self.ponto_pos == item.ponto_pos)
-        return mesma_cabeca and mesmo_corpo and mesma_pos
+        return (self.ponto_pos == item.ponto_pos and self.cabeca == item.cabeca
+                and self.corpo == item.corpo)
+
+    def __repr__(self):
+        simbolos = list(self.corpo)
+        simbolos.insert(self.ponto_pos, '·')
+        return f"{self.cabeca} -> {' '.join(simbolos)}"
     
     def avancar_ponto(self):
         if self.ponto_pos == len(self.corpo):
@@ -46,4 +77,4 @@ def main():
     print(novo)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,194 @@
+from array import array
+from collections.abc import Iterable
+from sintatico.gramatica import Gramatica
+
+class TabelaLL1:
+    """Tabela de análise preditiva LL(1), em um vetor de inteiros.
+
+    tabela[nao_terminal * n_terminais + terminal] é o índice da produção a
+    expandir (na tabela de produções da gramática), ou -1 se for erro. Os
+    corpos são guardados já invertidos e codificados como inteiros, prontos
+    para serem empilhados: um terminal é o seu índice (0..n_terminais-1) e um
+    não terminal é n_terminais + 1 + seu índice (n_terminais fica para
+    símbolos desconhecidos, que nunca casam com a entrada).
+    """
+
+    __slots__ = ('gramatica', 'terminais', 'nao_terminais', 'indice_terminal',
+                 'indice_nao_terminal', 'n_terminais', 'tabela', 'corpos', 'conflitos')
+
+    def __init__(self, gramatica: Gramatica):
+        """Gera a tabela: a produção A -> α vai para M[A, a] para cada a em
+            FIRST(α) e, se α for anulável, para cada a em FOLLOW(A) ('$'
+            incluso).
+
+            Em conflitos, fica a produção de menor índice (o resultado não
+            depende da ordem das produções no dicionário).
+        """
+        self.gramatica = gramatica
+        self.terminais: list[str] = gramatica.terminais_com_fim
+        self.nao_terminais: list[str] = list(gramatica.producoes_de)
+        self.indice_terminal: dict[str, int] = gramatica.indice_terminal
+        self.indice_nao_terminal = {nt: i for i, nt in enumerate(self.nao_terminais)}
+        self.n_terminais = len(self.terminais)
+        # Conflitos encontrados: (não terminal, terminal, produção mantida, produção descartada)
+        self.conflitos: list[tuple[str, str, int, int]] = []
+
+        n_terminais = self.n_terminais
+        self.tabela = array('i', [-1]) * (len(self.nao_terminais) * n_terminais)
+        self.corpos: list[tuple[int, ...]] = []
+        for producao, (cabeca, corpo) in enumerate(gramatica.tabela_producoes):
+            self.corpos.append(tuple(self.codificar(simbolo) for simbolo in reversed(corpo)))
+            bits, anulavel = gramatica.first_sequencia(corpo)
+            if anulavel:
+                bits |= gramatica.follow_bits(cabeca)
+            linha = self.indice_nao_terminal[cabeca] * n_terminais
+            terminal = 0
+            while bits:
+                if bits & 1:
+                    self.adicionar(linha + terminal, producao)
+                bits >>= 1
+                terminal += 1
+
+    def codificar(self, simbolo: str) -> int:
+        """Código inteiro de um símbolo na pilha do analisador."""
+        if simbolo in self.indice_terminal:
+            return self.indice_terminal[simbolo]
+        if simbolo in self.indice_nao_terminal:
+            return self.n_terminais + 1 + self.indice_nao_terminal[simbolo]
+        return self.n_terminais
+
+    def adicionar(self, celula: int, producao: int) -> None:
+        """Coloca a produção na célula, registrando conflitos."""
+        atual = self.tabela[celula]
+        if atual < 0 or atual == producao:
+            self.tabela[celula] = producao
+            return
+        mantida, descartada = min(atual, producao), max(atual, producao)
+        self.tabela[celula] = mantida
+        nao_terminal = self.nao_terminais[celula // self.n_terminais]
+        self.conflitos.append((nao_terminal, self.terminais[celula % self.n_terminais], mantida, descartada))
+
+    def producao(self, nao_terminal: str, terminal: str) -> int | None:
+        """Produção em M[nao_terminal, terminal] (None se for erro)."""
+        producao = self.tabela[self.indice_nao_terminal[nao_terminal] * self.n_terminais + self.indice_terminal[terminal]]
+        return None if producao < 0 else producao
+
+    def formatar(self) -> str:
+        """Gera uma representação em texto da tabela (células com o índice
+            da produção) e da lista de produções.
+
+        Returns:
+            str: A tabela formatada como string.
+        """
+        texto = f"{'':<8} "
+        for terminal in self.terminais:
+            texto += f"{terminal:<6} "
+        texto += "\n" + "-" * (9 + 7 * len(self.terminais)) + "\n"
+        for nao_terminal in self.nao_terminais:
+            texto += f"{nao_terminal:<8} "
+            for terminal in self.terminais:
+                producao = self.producao(nao_terminal, terminal)
+                texto += f"{'' if producao is None else producao:<6} "
+            texto += "\n"
+        texto += "\n"
+        for indice, (cabeca, corpo) in enumerate(self.gramatica.tabela_producoes):
+            texto += f"{indice}: {cabeca} -> {' '.join(corpo) or '&'}\n"
+        return texto
+
+class AnalisadorLL1:
+    """Analisador preditivo LL(1) não recursivo, dirigido por tabela.
+
+    Não constrói a coleção canônica LR: basta FIRST e FOLLOW. Consome os
+    tokens (lexema, padrão) como o AnalisadorSintatico, com a mesma regra
+    para escolher o terminal (o padrão, se for um terminal da gramática;
+    senão, o lexema).
+    """
+
+    def __init__(self):
+        self.tabela: TabelaLL1 = None
+
+    def gerar_tabela(self, caminho_gramatica: str) -> TabelaLL1:
+        """Gera a tabela LL(1) da gramática e prepara o analisador.
+
+            Returns:
+                TabelaLL1: a tabela gerada (com eventuais conflitos, caso a
+                gramática não seja LL(1)).
+        """
+        self.tabela = TabelaLL1(Gramatica.de_arquivo(caminho_gramatica))
+        return self.tabela
+
+    def analisar(self, tokens: Iterable[tuple[str, str]]) -> tuple[bool, int]:
+        """Analisa uma sequência de tokens com a tabela gerada.
+
+            Args:
+                tokens (Iterable[tuple[str, str]]): tokens (lexema, padrão).
+
+            Returns:
+                (bool, int): se a entrada foi aceita e, se não foi, o índice do
+                token onde o erro foi detectado (o número de tokens, se o erro
+                for no fim da entrada).
+        """
+        tabela = self.tabela
+        celulas = tabela.tabela
+        corpos = tabela.corpos
+        indice_terminal = tabela.indice_terminal
+        n_terminais = tabela.n_terminais
+        primeiro_nao_terminal = n_terminais + 1
+        fim = indice_terminal['$']
+
+        # A pilha começa com $ e o símbolo inicial (topo no fim da lista)
+        pilha = [fim, tabela.codificar(tabela.gramatica.simbolo_inicial)]
+        fluxo = iter(tokens)
+        posicao = 0
+        token = next(fluxo, None)
+        if token is None:
+            terminal = fim
+        else:
+            terminal = indice_terminal.get(token[1])
+            if terminal is None:
+                terminal = indice_terminal.get(token[0], -1)
+
+        while True:
+            if terminal < 0:
+                return False, posicao
+            topo = pilha.pop()
+            if topo >= primeiro_nao_terminal:
+                # Expande o não terminal pela produção da tabela
+                producao = celulas[(topo - primeiro_nao_terminal) * n_terminais + terminal]
+                if producao < 0:
+                    return False, posicao
+                pilha.extend(corpos[producao])
+            elif topo == terminal:
+                if terminal == fim:
+                    return True, None
+                posicao += 1
+                token = next(fluxo, None)
+                if token is None:
+                    terminal = fim
+                else:
+                    terminal = indice_terminal.get(token[1])
+                    if terminal is None:
+                        terminal = indice_terminal.get(token[0], -1)
+            else:
+                return False, posicao
+
+def main():
+    analisador = AnalisadorLL1()
+    tabela = analisador.gerar_tabela("entradas/gramaticas/aritmetica.txt")
+    print(tabela.formatar())
+    print(f"Conflitos: {len(tabela.conflitos)}")
+    entradas = [
+        [('i', 'id'), ('+', 'operador'), ('i', 'id'), ('*', 'operador'), ('i', 'id')],
+        [('(', 'abre'), ('i', 'id'), ('+', 'operador'), ('i', 'id'), (')', 'fecha')],
+        [('i', 'id'), ('+', 'operador'), ('*', 'operador')],
+    ]
+    for tokens in entradas:
+        aceito, posicao = analisador.analisar(tokens)
+        texto = ' '.join(lexema for lexema, _ in tokens)
+        print(f"'{texto}' é aceita? {'Sim' if aceito else f'Não (erro no token {posicao})'}")
+
+    tabela = analisador.gerar_tabela("entradas/gramaticas/exemplo.txt")
+    print(f"exemplo.txt (recursiva à esquerda): {len(tabela.conflitos)} conflitos LL(1)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+from array import array
+from sintatico.gramatica import Gramatica
+
+# Tipos de ação da tabela ACTION
+SHIFT = 's'
+REDUCE = 'r'
+ACEITAR = 'a'
+
+class TabelaLR:
+    """Tabelas ACTION/GOTO de um analisador LR (SLR ou LALR).
+
+    As ações são tuplas (tipo, valor): (SHIFT, estado), (REDUCE, produção)
+    ou (ACEITAR, 0). Os estados são inteiros (I0, I1, ... na saída) e as
+    produções são índices na tabela de produções da gramática estendida.
+    """
+
+    __slots__ = ('gramatica', 'n_estados', 'terminais', 'acao', 'desvio', 'conflitos')
+
+    def __init__(self, gramatica: Gramatica, n_estados: int):
+        """Inicializa tabelas vazias.
+
+            Args:
+                gramatica (Gramatica): gramática estendida (S' -> S na produção 0).
+                n_estados (int): número de estados da coleção canônica.
+        """
+        self.gramatica = gramatica
+        self.n_estados = n_estados
+        self.terminais: list[str] = gramatica.terminais_com_fim
+        self.acao: dict[tuple[int, str], tuple[str, int]] = {}
+        self.desvio: dict[tuple[int, str], int] = {}
+        # Conflitos encontrados: (estado, terminal, ação mantida, ação descartada)
+        self.conflitos: list[tuple[int, str, tuple[str, int], tuple[str, int]]] = []
+
+    def adicionar_acao(self, estado: int, terminal: str, acao: tuple[str, int]) -> None:
+        """Adiciona uma ação à tabela ACTION, registrando conflitos.
+
+            Em conflitos shift/reduce, o shift é mantido; em conflitos
+            reduce/reduce, é mantida a produção de menor índice (mesma
+            convenção do yacc). Aceitar conta como reduzir pela produção 0.
+            O resultado não depende da ordem em que as ações são adicionadas.
+        """
+        chave = (estado, terminal)
+        atual = self.acao.get(chave)
+        if atual is None:
+            self.acao[chave] = acao
+            return
+        if atual == acao:
+            return
+        if TabelaLR._prioridade(atual) < TabelaLR._prioridade(acao):
+            mantida, descartada = atual, acao
+        else:
+            mantida, descartada = acao, atual
+        self.acao[chave] = mantida
+        self.conflitos.append((estado, terminal, mantida, descartada))
+
+    def achatar(self) -> "TabelaPlana":
+        """Converte as tabelas para vetores de inteiros indexados por estado e
+        símbolo (ver TabelaPlana)."""
+        return TabelaPlana.de_tabela(self)
+
+    @staticmethod
+    def _prioridade(acao: tuple[str, int]) -> tuple[int, int]:
+        """Ordem de preferência das ações em conflito (menor é preferida)."""
+        if acao[0] == SHIFT:
+            return (0, 0)
+        return (1, acao[1])
+
+    def formatar(self) -> str:
+        """Gera uma representação em texto das tabelas ACTION e GOTO.
+
+        Returns:
+            str: As tabelas formatadas como string.
+        """
+        nao_terminais = [nt for nt in self.gramatica.nao_terminais if nt != "S'"]
+        tabela = f"{'Estado':<8} "
+        for simbolo in self.terminais + nao_terminais:
+            tabela += f"{simbolo:<6} "
+        tabela += "\n" + "-" * (9 + 7 * (len(self.terminais) + len(nao_terminais))) + "\n"
+        for estado in range(self.n_estados):
+            tabela += f"{'I' + str(estado):<8} "
+            for terminal in self.terminais:
+                acao = self.acao.get((estado, terminal))
+                if acao is None:
+                    texto = ""
+                elif acao[0] == ACEITAR:
+                    texto = "acc"
+                else:
+                    texto = f"{acao[0]}{acao[1]}"
+                tabela += f"{texto:<6} "
+            for nao_terminal in nao_terminais:
+                destino = self.desvio.get((estado, nao_terminal))
+                tabela += f"{'' if destino is None else destino:<6} "
+            tabela += "\n"
+        return tabela
+
+
+class TabelaPlana:
+    """Tabelas ACTION/GOTO achatadas em vetores de inteiros, para o laço do
+    analisador não precisar de dicionários nem tuplas.
+
+    - acao[estado * n_terminais + terminal]: 0 é erro, v > 0 é shift para o
+      estado v - 1 e v < 0 é reduce pela produção -v - 1 (a produção 0,
+      S' -> S, representa aceitar).
+    - desvio[estado * n_nao_terminais + nao_terminal]: estado destino, ou -1.
+    - cabecas[p] e tamanhos[p]: não terminal da cabeça e tamanho do corpo da
+      produção p (producoes[p] guarda a produção em si).
+    """
+
+    __slots__ = ('terminais', 'nao_terminais', 'producoes', 'indice_terminal',
+                 'indice_nao_terminal', 'n_estados', 'n_terminais', 'n_nao_terminais',
+                 'acao', 'desvio', 'cabecas', 'tamanhos')
+
+    def __init__(self, terminais: list[str], nao_terminais: list[str], producoes: list[tuple[str, tuple[str, ...]]], n_estados: int, acao, desvio, cabecas, tamanhos):
+        """Inicializa a tabela a partir dos vetores já montados (array('i') ou
+        memoryview de inteiros, como os lidos do cache em disco).
+
+            Args:
+                terminais (list[str]): terminais, com '$' por último.
+                nao_terminais (list[str]): não terminais (S' primeiro).
+                producoes (list[tuple[str, tuple[str, ...]]]): tabela de produções.
+                n_estados (int): número de estados.
+                acao, desvio, cabecas, tamanhos: os vetores descritos acima.
+        """
+        self.terminais = terminais
+        self.nao_terminais = nao_terminais
+        self.producoes = producoes
+        self.indice_terminal = {t: i for i, t in enumerate(terminais)}
+        self.indice_nao_terminal = {nt: i for i, nt in enumerate(nao_terminais)}
+        self.n_estados = n_estados
+        self.n_terminais = len(terminais)
+        self.n_nao_terminais = len(nao_terminais)
+        self.acao = acao
+        self.desvio = desvio
+        self.cabecas = cabecas
+        self.tamanhos = tamanhos
+
+    @classmethod
+    def de_tabela(cls, tabela: TabelaLR) -> "TabelaPlana":
+        """Achata as tabelas (em dicionários) de uma TabelaLR."""
+        g = tabela.gramatica
+        terminais = list(tabela.terminais)
+        nao_terminais = list(g.producoes_de)
+        indice_terminal = {t: i for i, t in enumerate(terminais)}
+        indice_nao_terminal = {nt: i for i, nt in enumerate(nao_terminais)}
+        n_terminais = len(terminais)
+        n_nao_terminais = len(nao_terminais)
+
+        acao = array('i', bytes(4 * tabela.n_estados * n_terminais))
+        for (estado, terminal), (tipo, valor) in tabela.acao.items():
+            if tipo == SHIFT:
+                codigo = valor + 1
+            elif tipo == REDUCE:
+                codigo = -valor - 1
+            else:
+                codigo = -1 # Aceitar = reduzir por S' -> S
+            acao[estado * n_terminais + indice_terminal[terminal]] = codigo
+
+        desvio = array('i', [-1]) * (tabela.n_estados * n_nao_terminais)
+        for (estado, nao_terminal), destino in tabela.desvio.items():
+            desvio[estado * n_nao_terminais + indice_nao_terminal[nao_terminal]] = destino
+
+        cabecas = array('i', (indice_nao_terminal[cabeca] for cabeca, _ in g.tabela_producoes))
+        tamanhos = array('i', (len(corpo) for _, corpo in g.tabela_producoes))
+        return cls(terminais, nao_terminais, list(g.tabela_producoes), tabela.n_estados,
+                   acao, desvio, cabecas, tamanhos)
+
+    def comprimir(self) -> "TabelaComprimida":
+        """Comprime as tabelas por deslocamento de linhas (ver TabelaComprimida)."""
+        return TabelaComprimida.de_tabela_plana(self)
+
+
+class TabelaComprimida:
+    """Tabelas ACTION/GOTO comprimidas por deslocamento de linhas (comb vector).
+
+    ACTION: cada estado tem uma redução padrão (a mais frequente da linha),
+    usada em toda entrada que não está na linha. As entradas restantes de
+    cada linha são encaixadas num único vetor a partir de um deslocamento
+    (base) próprio da linha, sem colidir com as das outras linhas; linhas
+    idênticas compartilham a mesma base. O vetor de verificação guarda a
+    base da linha dona de cada posição:
+
+        i = base_acao[estado] + terminal
+        codigo = valor_acao[i] if verif_acao[i] == base_acao[estado] else padrao_acao[estado]
+
+    GOTO é comprimida da mesma forma, mas por coluna (não terminal), com o
+    destino mais frequente de cada não terminal como padrão. Os códigos são
+    os mesmos da TabelaPlana.
+
+    Reduções padrão nunca consomem a entrada, então um token inválido
+    ainda é detectado antes de ser empilhado (apenas algumas reduções a
+    mais podem ser feitas antes do erro). Aceitar nunca é usado como padrão.
+    """
+
+    __slots__ = ('terminais', 'nao_terminais', 'producoes', 'indice_terminal',
+                 'indice_nao_terminal', 'n_estados', 'n_terminais', 'n_nao_terminais',
+                 'base_acao', 'padrao_acao', 'valor_acao', 'verif_acao',
+                 'base_desvio', 'padrao_desvio', 'valor_desvio', 'verif_desvio',
+                 'cabecas', 'tamanhos')
+
+    # Ordem dos vetores (usada também pelo cache em disco)
+    VETORES = ('base_acao', 'padrao_acao', 'valor_acao', 'verif_acao',
+               'base_desvio', 'padrao_desvio', 'valor_desvio', 'verif_desvio',
+               'cabecas', 'tamanhos')
+
+    def __init__(self, terminais: list[str], nao_terminais: list[str], producoes: list[tuple[str, tuple[str, ...]]], n_estados: int, *vetores):
+        """Inicializa a tabela a partir dos vetores já montados (na ordem de
+        TabelaComprimida.VETORES), como array('i') ou memoryview de inteiros."""
+        self.terminais = terminais
+        self.nao_terminais = nao_terminais
+        self.producoes = producoes
+        self.indice_terminal = {t: i for i, t in enumerate(terminais)}
+        self.indice_nao_terminal = {nt: i for i, nt in enumerate(nao_terminais)}
+        self.n_estados = n_estados
+        self.n_terminais = len(terminais)
+        self.n_nao_terminais = len(nao_terminais)
+        for nome, vetor in zip(TabelaComprimida.VETORES, vetores):
+            setattr(self, nome, vetor)
+
+    @classmethod
+    def de_tabela_plana(cls, tabela: TabelaPlana) -> "TabelaComprimida":
+        """Comprime uma TabelaPlana."""
+        n_terminais = tabela.n_terminais
+        n_nao_terminais = tabela.n_nao_terminais
+        n_estados = tabela.n_estados
+
+        # ACTION: redução padrão por estado e entradas restantes de cada linha
+        padrao_acao = array('i', bytes(4 * n_estados))
+        linhas = []
+        for estado in range(n_estados):
+            linha = tabela.acao[estado * n_terminais:(estado + 1) * n_terminais]
+            contagem: dict[int, int] = {}
+            for codigo in linha:
+                if codigo < -1: # Reduções (exceto aceitar)
+                    contagem[codigo] = contagem.get(codigo, 0) + 1
+            padrao = max(contagem, key=lambda c: (contagem[c], c)) if contagem else 0
+            padrao_acao[estado] = padrao
+            linhas.append(tuple((t, c) for t, c in enumerate(linha) if c != 0 and c != padrao))
+        base_acao, valor_acao, verif_acao = cls._empacotar(linhas, n_terminais)
+
+        # GOTO: destino padrão por não terminal e entradas restantes de cada coluna
+        padrao_desvio = array('i', [-1]) * n_nao_terminais
+        colunas = []
+        for nao_terminal in range(n_nao_terminais):
+            coluna = tabela.desvio[nao_terminal::n_nao_terminais]
+            contagem = {}
+            for destino in coluna:
+                if destino >= 0:
+                    contagem[destino] = contagem.get(destino, 0) + 1
+            padrao = max(contagem, key=lambda d: (contagem[d], -d)) if contagem else -1
+            padrao_desvio[nao_terminal] = padrao
+            colunas.append(tuple((e, d) for e, d in enumerate(coluna) if d >= 0 and d != padrao))
+        base_desvio, valor_desvio, verif_desvio = cls._empacotar(colunas, n_estados)
+
+        return cls(tabela.terminais, tabela.nao_terminais, tabela.producoes, n_estados,
+                   base_acao, padrao_acao, valor_acao, verif_acao,
+                   base_desvio, padrao_desvio, valor_desvio, verif_desvio,
+                   array('i', tabela.cabecas), array('i', tabela.tamanhos))
+
+    @staticmethod
+    def _empacotar(linhas: list[tuple[tuple[int, int], ...]], largura: int) -> tuple[array, array, array]:
+        """Encaixa as linhas esparsas num único vetor (first fit), com uma
+            base distinta para cada linha diferente. Linhas mais cheias são
+            encaixadas primeiro.
+
+            Args:
+                linhas: para cada linha, as entradas (coluna, valor).
+                largura: número de colunas (o vetor é estendido para que
+                    base + coluna nunca saia dos limites).
+
+            Returns:
+                (base, valor, verif): base de cada linha e os vetores de
+                valores e de verificação (-1 nas posições livres).
+        """
+        base = array('i', bytes(4 * len(linhas)))
+        ocupado = bytearray()
+        bases_usadas: set[int] = set()
+        bases_das_linhas: dict[tuple[tuple[int, int], ...], int] = {}
+        valores: dict[int, tuple[int, int]] = {}
+        primeiro_livre = 0
+        ordem = sorted(range(len(linhas)), key=lambda i: -len(linhas[i]))
+        for indice in ordem:
+            linha = linhas[indice]
+            if linha in bases_das_linhas:
+                base[indice] = bases_das_linhas[linha]
+                continue
+            menor_coluna = linha[0][0] if linha else 0
+            candidata = max(0, primeiro_livre - menor_coluna)
+            while True:
+                if candidata not in bases_usadas and all(
+                        candidata + coluna >= len(ocupado) or not ocupado[candidata + coluna]
+                        for coluna, _ in linha):
+                    break
+                candidata += 1
+            bases_usadas.add(candidata)
+            bases_das_linhas[linha] = candidata
+            base[indice] = candidata
+            for coluna, valor in linha:
+                posicao = candidata + coluna
+                if posicao >= len(ocupado):
+                    ocupado.extend(bytes(posicao + 1 - len(ocupado)))
+                ocupado[posicao] = 1
+                valores[posicao] = (valor, candidata)
+            while primeiro_livre < len(ocupado) and ocupado[primeiro_livre]:
+                primeiro_livre += 1
+
+        tamanho = max(bases_usadas, default=0) + largura
+        valor = array('i', bytes(4 * tamanho))
+        verif = array('i', [-1]) * tamanho
+        for posicao, (v, dona) in valores.items():
+            valor[posicao] = v
+            verif[posicao] = dona
+        return base, valor, verif
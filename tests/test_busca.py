@@ -0,0 +1,21 @@
+import tempfile
+import unittest
+from lexico.busca import Buscador
+
+class TestBusca(unittest.TestCase):
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.pasta.cleanup()
+
+    def test_alternativa_opcional(self):
+        # Tree.prefixos numa alternância opcional: (..|..)? no início e no meio da ER
+        buscador = Buscador("x: (ab|cd)?e\ny: f(gh|ij)?k\n", self.pasta.name)
+        self.assertEqual(buscador.extrair_literais("x: (ab|cd)?e\n"), {"abe", "cde", "e"})
+        trechos = list(buscador.buscar("zabe cde e fk fijk fgk"))
+        self.assertEqual(trechos, [(1, 4, 'x'), (5, 8, 'x'), (9, 10, 'x'), (11, 13, 'y'), (14, 18, 'y')])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+from lexico.analisador_lexico import AnalisadorLexico
+from lexico.cache import CacheAutomatos
+from sintatico.analisador_sintatico import AnalisadorSintatico
+from sintatico.cache import CacheTabelas
+
+ERS = "num: [0-9]+\nid: [a-z]([a-z]|[0-9])*\nse: se\n"
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.pasta.cleanup()
+
+    def corrompidos(self, dados: bytes) -> list[bytes]:
+        # Arquivos truncados em vários pontos, com um byte a mais e com os nomes (JSON) inválidos
+        return [dados[:corte] for corte in (0, 10, 60, len(dados) // 2, len(dados) - 1)] + \
+               [dados + b"x", dados[:-3] + b"\xff\xfe\xfd"]
+
+    def test_automato_corrompido(self):
+        compilar = lambda: AnalisadorLexico(None, None).compilar(salvar_arquivos=False, texto_ers=ERS)
+        _, caminho = CacheAutomatos.obter(ERS, compilar, self.pasta.name)
+        chave = CacheAutomatos.chave(ERS)
+        dados = caminho.read_bytes()
+        for corrompido in self.corrompidos(dados):
+            caminho.write_bytes(corrompido)
+            self.assertIsNone(CacheAutomatos.carregar(caminho, chave))
+        # Na falta do arquivo válido, obter compila e grava de novo
+        tabela, _ = CacheAutomatos.obter(ERS, compilar, self.pasta.name)
+        self.assertEqual(caminho.read_bytes(), dados)
+        self.assertEqual(tabela.avaliar_palavra("x1"), (True, "id"))
+
+    def test_automato_com_indices_invalidos(self):
+        compilar = lambda: AnalisadorLexico(None, None).compilar(salvar_arquivos=False, texto_ers=ERS)
+        tabela, caminho = CacheAutomatos.obter(ERS, compilar, self.pasta.name)
+        chave = CacheAutomatos.chave(ERS)
+        dados = caminho.read_bytes()
+        inicio = CacheAutomatos.CABECALHO.size
+        transicoes = 4 * tabela.n_densos * tabela.n_classes
+        # Tamanhos plausíveis, mas um destino e um padrão fora dos limites
+        for posicao, valor in ((inicio, tabela.n_estados), (inicio + transicoes, len(tabela.padroes)),
+                               (inicio + transicoes, -2)):
+            corrompido = bytearray(dados)
+            corrompido[posicao:posicao + 4] = struct.pack('<i', valor)
+            caminho.write_bytes(corrompido)
+            self.assertIsNone(CacheAutomatos.carregar(caminho, chave))
+        tabela, _ = CacheAutomatos.obter(ERS, compilar, self.pasta.name)
+        self.assertEqual(caminho.read_bytes(), dados)
+
+    def test_tabela_corrompida(self):
+        gramatica = str(Path(__file__).parent.parent / "entradas" / "gramaticas" / "aritmetica.txt")
+        original = AnalisadorSintatico().carregar_tabela(gramatica, "lalr", self.pasta.name)
+        chave = CacheTabelas.chave(gramatica, "lalr")
+        caminho = CacheTabelas.caminho(chave, self.pasta.name)
+        dados = caminho.read_bytes()
+        for corrompido in self.corrompidos(dados):
+            caminho.write_bytes(corrompido)
+            self.assertIsNone(CacheTabelas.carregar(caminho, chave))
+        tabela = AnalisadorSintatico().carregar_tabela(gramatica, "lalr", self.pasta.name)
+        self.assertEqual(list(tabela.valor_acao), list(original.valor_acao))
+
+if __name__ == "__main__":
+    unittest.main()
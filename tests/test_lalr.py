@@ -0,0 +1,81 @@
+import itertools
+import unittest
+from sintatico.analisador_sintatico import AnalisadorSintatico
+from sintatico.canonico import Canonico
+from sintatico.gramatica import Gramatica
+from sintatico.tabela import REDUCE, SHIFT
+
+GRAMATICAS = ("aritmetica", "atribuicao", "exemplo", "parenteses")
+
+def caminho(nome: str) -> str:
+    return f"entradas/gramaticas/{nome}.txt"
+
+class TestLALR(unittest.TestCase):
+
+    def test_digraph(self):
+        # 0 -> 1 -> 2 -> 1 (ciclo 1-2) e 3 isolado: F(x) é a união de F' dos alcançáveis
+        nos = [(0, "A"), (1, "A"), (2, "A"), (3, "A")]
+        relacao = {nos[0]: [nos[1]], nos[1]: [nos[2]], nos[2]: [nos[1]]}
+        iniciais = {nos[0]: 0b0001, nos[1]: 0b0010, nos[2]: 0b0100, nos[3]: 0b1000}
+        resultado = Canonico._digraph(nos, relacao, iniciais)
+        self.assertEqual(resultado, {nos[0]: 0b0111, nos[1]: 0b0110, nos[2]: 0b0110, nos[3]: 0b1000})
+
+    def test_atribuicao_so_tem_conflito_slr(self):
+        # S -> L = R | R: o FOLLOW(R) do SLR inclui '=', então o estado de
+        # S -> L · = R, R -> L · tem shift/reduce em '=', que o LALR resolve
+        slr = AnalisadorSintatico().gerar_tabela(caminho("atribuicao"), "slr")
+        lalr = AnalisadorSintatico().gerar_tabela(caminho("atribuicao"), "lalr")
+        self.assertEqual(len(slr.conflitos), 1)
+        _, terminal, mantida, descartada = slr.conflitos[0]
+        self.assertEqual((terminal, mantida[0], descartada[0]), ("=", SHIFT, REDUCE))
+        self.assertEqual(lalr.conflitos, [])
+
+    def test_lalr_contido_no_slr(self):
+        # Mesmos estados, shifts e desvios; as reduções LALR são um
+        # subconjunto das SLR (os lookaheads estão contidos no FOLLOW)
+        for nome in GRAMATICAS:
+            with self.subTest(gramatica=nome):
+                colecao = Canonico.colecao_canonica(Gramatica.de_arquivo(caminho(nome)))
+                slr = colecao.gerar_tabela()
+                lalr = colecao.gerar_tabela_lalr()
+                self.assertEqual(lalr.desvio, slr.desvio)
+                self.assertEqual({c: a for c, a in lalr.acao.items() if a[0] == SHIFT},
+                                 {c: a for c, a in slr.acao.items() if a[0] == SHIFT})
+                for chave, acao in lalr.acao.items():
+                    if chave in slr.acao:
+                        self.assertEqual(slr.acao[chave], acao)
+                    else:
+                        # Só onde o SLR descartou a redução num conflito
+                        self.assertIn((*chave, slr.acao.get(chave), acao), [(e, t, m, d) for e, t, m, d in slr.conflitos])
+
+    def test_mesma_linguagem(self):
+        # Todas as sequências curtas de terminais: SLR e LALR aceitam as
+        # mesmas e acusam o erro no mesmo token
+        for nome in GRAMATICAS:
+            with self.subTest(gramatica=nome):
+                slr = AnalisadorSintatico()
+                slr.gerar_tabela(caminho(nome), "slr")
+                lalr = AnalisadorSintatico()
+                lalr.gerar_tabela(caminho(nome), "lalr")
+                terminais = [t for t in slr.tabela.terminais if t != "$"]
+                aceitas = 0
+                for tamanho in range(7):
+                    for sequencia in itertools.product(terminais, repeat=tamanho):
+                        tokens = [(t, t) for t in sequencia]
+                        resultado = lalr.analisar(tokens)
+                        self.assertEqual(resultado, slr.analisar(tokens), sequencia)
+                        aceitas += resultado[0]
+                self.assertGreater(aceitas, 0)
+
+    def test_atribuicao(self):
+        analisador = AnalisadorSintatico()
+        analisador.gerar_tabela(caminho("atribuicao"), "lalr")
+        tokens = lambda texto: [(t, t) for t in texto.split()]
+        self.assertEqual(analisador.analisar(tokens("* id = * * id")), (True, None))
+        self.assertEqual(analisador.analisar(tokens("id")), (True, None))
+        self.assertEqual(analisador.analisar(tokens("id = id = id")), (False, 3))
+        self.assertEqual(analisador.analisar(tokens("* = id")), (False, 1))
+        self.assertEqual(analisador.analisar(tokens("id =")), (False, 2))
+
+if __name__ == "__main__":
+    unittest.main()
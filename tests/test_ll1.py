@@ -0,0 +1,83 @@
+import itertools
+import tempfile
+import unittest
+from pathlib import Path
+from sintatico.analisador_sintatico import AnalisadorSintatico
+from sintatico.ll1 import AnalisadorLL1
+
+# exemplo.txt depois da remoção da recursão à esquerda
+ARITMETICA = "entradas/gramaticas/aritmetica.txt"
+
+def tokens(texto: str) -> list[tuple[str, str]]:
+    return [(t, t) for t in texto.split()]
+
+class TestLL1(unittest.TestCase):
+
+    def setUp(self):
+        self.analisador = AnalisadorLL1()
+        self.tabela = self.analisador.gerar_tabela(ARITMETICA)
+
+    def producao(self, cabeca: str, *corpo: str) -> int:
+        return self.tabela.gramatica.tabela_producoes.index((cabeca, corpo))
+
+    def test_tabela(self):
+        tabela = self.tabela
+        self.assertEqual(tabela.conflitos, [])
+        esperado = {
+            ("E", "("): self.producao("E", "T", "G"), ("E", "i"): self.producao("E", "T", "G"),
+            ("G", "+"): self.producao("G", "+", "T", "G"),
+            ("G", ")"): self.producao("G"), ("G", "$"): self.producao("G"),
+            ("T", "("): self.producao("T", "F", "U"), ("T", "i"): self.producao("T", "F", "U"),
+            ("U", "*"): self.producao("U", "*", "F", "U"),
+            ("U", "+"): self.producao("U"), ("U", ")"): self.producao("U"), ("U", "$"): self.producao("U"),
+            ("F", "("): self.producao("F", "(", "E", ")"), ("F", "i"): self.producao("F", "i"),
+        }
+        for nao_terminal in tabela.nao_terminais:
+            for terminal in tabela.terminais:
+                self.assertEqual(tabela.producao(nao_terminal, terminal), esperado.get((nao_terminal, terminal)),
+                                 (nao_terminal, terminal))
+
+    def test_conflito_mantem_a_menor_producao(self):
+        # exemplo.txt é recursiva à esquerda: E -> E + T e E -> T disputam
+        # as mesmas células (e T -> T * F e T -> F)
+        tabela = AnalisadorLL1().gerar_tabela("entradas/gramaticas/exemplo.txt")
+        self.assertEqual(sorted(tabela.conflitos),
+                         [("E", "(", 0, 1), ("E", "id", 0, 1), ("T", "(", 2, 3), ("T", "id", 2, 3)])
+        for nao_terminal, terminal, mantida, _ in tabela.conflitos:
+            self.assertEqual(tabela.producao(nao_terminal, terminal), mantida)
+
+        # S -> a | a b: fica S -> a, então "a b" é recusada no 'b'
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = Path(pasta) / "gramatica.txt"
+            caminho.write_text("S\na b\nS\nS->a|a b\n")
+            analisador = AnalisadorLL1()
+            tabela = analisador.gerar_tabela(str(caminho))
+        self.assertEqual(tabela.conflitos, [("S", "a", 0, 1)])
+        self.assertEqual(analisador.analisar(tokens("a")), (True, None))
+        self.assertEqual(analisador.analisar(tokens("a b")), (False, 1))
+
+    def test_aceita_e_posicao_do_erro(self):
+        analisar = self.analisador.analisar
+        self.assertEqual(analisar(tokens("i + i * i")), (True, None))
+        self.assertEqual(analisar(tokens("( i + i ) * i")), (True, None))
+        # O terminal vem do padrão quando ele é terminal da gramática
+        self.assertEqual(analisar([("x", "i"), ("+", "operador"), ("y", "i")]), (True, None))
+        self.assertEqual(analisar(tokens("")), (False, 0))
+        self.assertEqual(analisar(tokens("i i")), (False, 1))
+        self.assertEqual(analisar(tokens("i + *")), (False, 2))
+        self.assertEqual(analisar(tokens("( i")), (False, 2))
+        self.assertEqual(analisar(tokens("i ? i")), (False, 1))
+
+    def test_mesma_linguagem_do_lr(self):
+        # Todas as sequências curtas de terminais: mesmo resultado (aceita e
+        # posição do erro) do analisador LALR para a mesma gramática
+        lr = AnalisadorSintatico()
+        lr.gerar_tabela(ARITMETICA, "lalr")
+        terminais = [t for t in self.tabela.terminais if t != "$"]
+        for tamanho in range(7):
+            for sequencia in itertools.product(terminais, repeat=tamanho):
+                entrada = [(t, t) for t in sequencia]
+                self.assertEqual(self.analisador.analisar(entrada), lr.analisar(entrada), sequencia)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import tempfile
+import unittest
+from pathlib import Path
+from sintatico.analisador_sintatico import AnalisadorSintatico
+from sintatico.gerador import GeradorAnalisador
+
+# Produção vazia no fim: cada 'a' fica na pilha até a redução L -> &
+VAZIA = "L\na\nL\nL->a L|&\n"
+
+class TestSintatico(unittest.TestCase):
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.pasta.cleanup()
+
+    def analisador(self, texto: str, metodo: str = "slr") -> AnalisadorSintatico:
+        caminho = Path(self.pasta.name) / "gramatica.txt"
+        caminho.write_text(texto)
+        analisador = AnalisadorSintatico()
+        analisador.gerar_tabela(str(caminho), metodo)
+        return analisador
+
+    def test_reducao_vazia_com_pilha_cheia(self):
+        # A pilha começa com 1024 posições: com 1023 'a', o desvio de L -> &
+        # é empilhado exatamente na posição 1024
+        analisador = self.analisador(VAZIA)
+        for n in (1022, 1023, 1024, 3000):
+            self.assertEqual(analisador.analisar([("a", "a")] * n), (True, None))
+
+    def test_arvore_com_pilha_cheia(self):
+        analisador = self.analisador(VAZIA)
+        n = 1023
+        aceito, posicao, arvore = analisador.analisar_arvore([("a", "a")] * n)
+        self.assertEqual((aceito, posicao), (True, None))
+        # Uma folha por 'a' e n + 1 nós L, encadeados à direita até o L vazio
+        self.assertEqual(len(arvore), 2 * n + 1)
+        no = arvore.no()
+        for i in range(n):
+            self.assertEqual(no.nome, "L")
+            self.assertEqual((no.inicio, no.fim), (i, n))
+            folha, no = no.filhos
+            self.assertTrue(folha.folha)
+            self.assertEqual((folha.nome, folha.inicio), ("a", i))
+        self.assertEqual((no.nome, no.inicio, no.fim, list(no.filhos)), ("L", n, n, []))
+
+    def test_gerado_com_pilha_cheia(self):
+        # O módulo gerado começa com 256 posições na pilha
+        analisador = self.analisador(VAZIA)
+        modulo = {}
+        exec(GeradorAnalisador.gerar(analisador.tabela), modulo)
+        for n in (254, 255, 256, 3000):
+            tokens = [("a", "a")] * n
+            self.assertEqual(modulo["analisar"](tokens), (True, None))
+        self.assertEqual(modulo["analisar"]([("a", "a"), ("b", "b")]), (False, 1))
+
+if __name__ == "__main__":
+    unittest.main()
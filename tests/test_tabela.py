@@ -0,0 +1,89 @@
+import unittest
+from sintatico.benchmark import Benchmark
+from sintatico.canonico import Canonico
+from sintatico.gramatica import Gramatica
+from sintatico.tabela import ACEITAR, REDUCE, SHIFT, TabelaComprimida
+
+GRAMATICAS = ("aritmetica", "atribuicao", "exemplo", "parenteses")
+
+def acao_comprimida(tabela: TabelaComprimida, estado: int, terminal: int) -> int:
+    base = tabela.base_acao[estado]
+    i = base + terminal
+    return tabela.valor_acao[i] if tabela.verif_acao[i] == base else tabela.padrao_acao[estado]
+
+def desvio_comprimido(tabela: TabelaComprimida, estado: int, nao_terminal: int) -> int:
+    base = tabela.base_desvio[nao_terminal]
+    i = base + estado
+    return tabela.valor_desvio[i] if tabela.verif_desvio[i] == base else tabela.padrao_desvio[nao_terminal]
+
+class TestTabela(unittest.TestCase):
+
+    def tabelas(self):
+        for nome in GRAMATICAS:
+            colecao = Canonico.colecao_canonica(Gramatica.de_arquivo(f"entradas/gramaticas/{nome}.txt"))
+            yield f"{nome} slr", colecao.gerar_tabela()
+            yield f"{nome} lalr", colecao.gerar_tabela_lalr()
+        # Gramáticas maiores, com muitas linhas iguais e reduções padrão
+        for nome, gramatica in (("escada", Benchmark.escada(12)), ("alternativa", Benchmark.alternativa(12))):
+            yield nome, Canonico.colecao_canonica(gramatica).gerar_tabela_lalr()
+
+    def test_plana_igual_a_tabela_lr(self):
+        for nome, tabela in self.tabelas():
+            with self.subTest(tabela=nome):
+                plana = tabela.achatar()
+                for estado in range(tabela.n_estados):
+                    for t, terminal in enumerate(plana.terminais):
+                        acao = tabela.acao.get((estado, terminal))
+                        if acao is None:
+                            esperado = 0
+                        elif acao[0] == SHIFT:
+                            esperado = acao[1] + 1
+                        elif acao[0] == REDUCE:
+                            esperado = -acao[1] - 1
+                        else:
+                            self.assertEqual(acao, (ACEITAR, 0))
+                            esperado = -1
+                        self.assertEqual(plana.acao[estado * plana.n_terminais + t], esperado)
+                    for n, nao_terminal in enumerate(plana.nao_terminais):
+                        self.assertEqual(plana.desvio[estado * plana.n_nao_terminais + n],
+                                         tabela.desvio.get((estado, nao_terminal), -1))
+
+    def test_comprimida_igual_a_plana(self):
+        # Toda entrada definida é a mesma; um erro só pode virar a redução
+        # padrão do estado (nunca um shift nem aceitar), e desvios indefinidos
+        # nunca são consultados
+        for nome, tabela in self.tabelas():
+            with self.subTest(tabela=nome):
+                plana = tabela.achatar()
+                comprimida = plana.comprimir()
+                for estado in range(plana.n_estados):
+                    padrao = comprimida.padrao_acao[estado]
+                    self.assertLessEqual(padrao, 0)
+                    self.assertNotEqual(padrao, -1)
+                    for terminal in range(plana.n_terminais):
+                        esperado = plana.acao[estado * plana.n_terminais + terminal]
+                        obtido = acao_comprimida(comprimida, estado, terminal)
+                        if esperado == 0:
+                            self.assertIn(obtido, (0, padrao))
+                        else:
+                            self.assertEqual(obtido, esperado)
+                    for nao_terminal in range(plana.n_nao_terminais):
+                        esperado = plana.desvio[estado * plana.n_nao_terminais + nao_terminal]
+                        if esperado >= 0:
+                            self.assertEqual(desvio_comprimido(comprimida, estado, nao_terminal), esperado)
+
+    def test_linhas_iguais_compartilham_a_base(self):
+        for nome, tabela in self.tabelas():
+            with self.subTest(tabela=nome):
+                plana = tabela.achatar()
+                comprimida = plana.comprimir()
+                linhas = {}
+                for estado in range(plana.n_estados):
+                    linha = (tuple(plana.acao[estado * plana.n_terminais:(estado + 1) * plana.n_terminais]),
+                             comprimida.padrao_acao[estado])
+                    if linha in linhas:
+                        self.assertEqual(comprimida.base_acao[estado], comprimida.base_acao[linhas[linha]])
+                    linhas.setdefault(linha, estado)
+
+if __name__ == "__main__":
+    unittest.main()
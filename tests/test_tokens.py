@@ -0,0 +1,26 @@
+import pickle
+import unittest
+from lexico.analisador_lexico import AnalisadorLexico
+from lexico.tokens import BufferTokens
+
+class TestTokens(unittest.TestCase):
+
+    def test_tokenizar_buffer(self):
+        automato = AnalisadorLexico(None, None).compilar(salvar_arquivos=False, texto_ers="num: [0-9]+\nid: [a-z]+\n")
+        buffer = AnalisadorLexico.tokenizar_buffer(automato, "x 12\n  ab ?\n")
+        self.assertEqual(list(buffer), [("x", "id"), ("12", "num"), ("ab", "id"), ("?", "erro!")])
+        self.assertEqual([buffer.linha_coluna(i) for i in range(len(buffer))], [(1, 1), (1, 3), (2, 3), (2, 6)])
+        self.assertEqual(list(pickle.loads(pickle.dumps(buffer))), list(buffer))
+
+    def test_posicoes_acima_de_2_gib(self):
+        # As posições são de 64 bits: um texto maior que 2 GiB não estoura
+        # os vetores (aqui sem alocar o texto, só as posições)
+        buffer = BufferTokens("")
+        posicao = 5 << 30
+        buffer.tipo.append(buffer.id_tipo("id"))
+        buffer.inicio.append(posicao)
+        buffer.fim.append(posicao + 3)
+        self.assertEqual((buffer.inicio[0], buffer.fim[0]), (posicao, posicao + 3))
+
+if __name__ == "__main__":
+    unittest.main()